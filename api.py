@@ -0,0 +1,494 @@
+#!/usr/bin/python3
+"""Defines the HBnB HTTP JSON API.
+
+Usage: api.py [--host HOST] [--port PORT] [--workers N] [--verbose]
+
+Serves the stored objects read-only over HTTP/1.1, on 127.0.0.1:5000 by
+default:
+
+    GET /<collection>                   objects of a class, paginated
+    GET /<collection>/<id>              one object
+    GET /<collection>/<id>/<collection> objects linked to one object
+
+The collections are amenities, cities, places, reviews, states and users.
+A linked collection holds the objects whose <class>_id is the id, such as
+/states/<id>/cities, or those listed in <class>_ids, such as
+/places/<id>/amenities. Other query parameters filter on the attributes
+of the class, as in storage.find():
+/places?city_id=<id>&price_by_night__lt=100; other names are answered 400
+Bad Request. Pages hold limit objects (50 by default, at most 1000),
+starting offset objects in, or after the object of id after, which must
+be in the collection; "next" is the URL of the next page.
+
+Each answer has an ETag computed from the updated_at of the objects it
+holds and the size of the collection, and an object also has a
+Last-Modified header, so If-None-Match and If-Modified-Since requests
+are answered 304 Not Modified without serializing them. Collections have
+no Last-Modified: adding or deleting an object does not change the
+latest updated_at of a page. Connections are kept alive; a pool of threads answers
+their requests, while idle connections wait in a selector without
+holding a thread. Set HBNB_STORAGE_SHARED=1 to see what other processes
+save.
+"""
+import argparse
+import hashlib
+import http.server
+import json
+import queue
+import selectors
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from itertools import islice
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from models import storage
+from models.engine.schema import Schema
+
+COLLECTIONS = {
+    "amenities": "Amenity",
+    "cities": "City",
+    "places": "Place",
+    "reviews": "Review",
+    "states": "State",
+    "users": "User"
+}
+HIDDEN = {"User": ("password",)}  # Attributes never sent
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+class APIError(Exception):
+    """An error answered with an HTTP status.
+
+    Attributes:
+        status (int): The HTTP status.
+    """
+
+    def __init__(self, status, message):
+        """Initialize the error.
+
+        Args:
+            status (int): The HTTP status.
+            message (str): The description sent to the client.
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class API:
+    """Answers the requests of the API from the storage.
+
+    The storage is read under a lock; the objects found are serialized
+    outside of it.
+    """
+
+    __lock = threading.Lock()
+    __schema = None
+
+    def get(self, path, params):
+        """Find what a request designates.
+
+        Args:
+            path (str): The path of the URL.
+            params (list): The (name, value) pairs of the query string.
+        Returns:
+            tuple: The document to send, which holds the objects found as
+                they are, its ETag, and for one object its last
+                modification time, otherwise None.
+        Raises:
+            APIError: If the path or the parameters are invalid.
+        """
+        parts = [part for part in path.split("/") if part]
+        if not parts or len(parts) > 3 or parts[0] not in COLLECTIONS:
+            raise APIError(404, "Not found")
+        name = COLLECTIONS[parts[0]]
+        with API.__lock:
+            if len(parts) == 2:
+                obj = storage.get(name, parts[1])
+                if obj is None:
+                    raise APIError(404, "Not found")
+                return obj, etag([obj], 1), last_modified([obj])
+            if len(parts) == 3:
+                objects = self.__linked(name, parts[1], parts[2])
+                name = COLLECTIONS[parts[2]]
+            else:
+                objects = None
+            options, filters = self.__options(name, params)
+            if objects is None and not filters:
+                page, more = self.__stored_page(name, **options)
+                count = storage.count(name)
+            else:
+                if objects is None:
+                    objects = storage.find(name, **filters)
+                elif filters:
+                    raise APIError(400, "Linked collections take no filters")
+                page, more = self.__page(objects, **options)
+                count = len(objects)
+        document = {"count": count, "next": None, "items": page}
+        if more and page:
+            params = [(k, v) for k, v in params if k not in ("offset",
+                                                             "after")]
+            params.append(("after", page[-1].id))
+            document["next"] = "{}?{}".format(path, urlencode(params))
+        return document, etag(page, count), None
+
+    def __linked(self, name, id, collection):
+        """Return the objects of a collection linked to one object."""
+        if collection not in COLLECTIONS:
+            raise APIError(404, "Not found")
+        parent = storage.get(name, id)
+        if parent is None:
+            raise APIError(404, "Not found")
+        child = COLLECTIONS[collection]
+        attributes = storage.attributes().get(child, {})
+        foreign = "{}_id".format(name.lower())
+        if foreign in attributes:
+            return storage.find(child, **{foreign: id})
+        listed = getattr(parent, "{}_ids".format(child.lower()), None)
+        if type(listed) is not list:
+            raise APIError(404, "Not found")
+        objects = {}
+        for child_id in listed:
+            obj = storage.get(child, child_id)
+            if obj is not None:
+                objects["{}.{}".format(child, child_id)] = obj
+        return objects
+
+    def __options(self, name, params):
+        """Split the parameters into page options and typed filters."""
+        if API.__schema is None:
+            API.__schema = Schema(storage.classes(), storage.attributes())
+        attributes = storage.attributes()
+        known = dict(attributes["BaseModel"], **attributes.get(name, {}))
+        options = {"limit": PAGE_SIZE, "offset": 0, "after": None}
+        filters = {}
+        for key, value in params:
+            if key in ("limit", "offset"):
+                try:
+                    options[key] = int(value)
+                except ValueError:
+                    raise APIError(400, "Invalid {}".format(key))
+                if options[key] < 0 or options["limit"] > MAX_PAGE_SIZE:
+                    raise APIError(400, "Invalid {}".format(key))
+            elif key == "after":
+                options["after"] = value
+            else:
+                attr = key.rpartition("__")[0] if "__" in key[1:] else key
+                if attr not in known or attr in HIDDEN.get(name, ()):
+                    raise APIError(400, "Invalid filter {}".format(key))
+                try:
+                    filters[key] = API.__schema.convert(name, attr, value)
+                except (TypeError, ValueError):
+                    raise APIError(400, "Invalid value for {}".format(key))
+        return options, filters
+
+    @staticmethod
+    def __stored_page(name, limit, offset, after):
+        """Return one page of a whole collection and whether more follow.
+
+        Only the objects of the page are read from the storage.
+        """
+        try:
+            page = list(storage.page(name, limit + 1, offset, after).values())
+        except KeyError:
+            raise APIError(400, "Invalid after")
+        return page[:limit], len(page) > limit
+
+    @staticmethod
+    def __page(objects, limit, offset, after):
+        """Return the objects of one page and whether more follow."""
+        keys = iter(objects)
+        if after is not None:
+            for key in keys:
+                if key.partition(".")[2] == after:
+                    break
+            else:
+                raise APIError(400, "Invalid after")
+        page = [objects[key] for key in islice(keys, offset, offset + limit)]
+        return page, next(keys, None) is not None
+
+
+def etag(objects, count):
+    """Return the ETag of a list of objects.
+
+    It changes when an object of the list is replaced or updated through
+    save(), or when the count of the collection changes.
+    Args:
+        objects (list): The objects sent.
+        count (int): The number of objects of the whole collection.
+    Returns:
+        str: The quoted ETag.
+    """
+    digest = hashlib.blake2b(str(count).encode(), digest_size=12)
+    for obj in objects:
+        digest.update("|{}:{}".format(obj.id, obj.updated_at).encode())
+    return '"{}"'.format(digest.hexdigest())
+
+
+def last_modified(objects):
+    """Return the latest updated_at of objects in UTC, or None."""
+    stamps = [obj.updated_at for obj in objects
+              if hasattr(obj.updated_at, "astimezone")]
+    return max(stamps).astimezone(timezone.utc) if stamps else None
+
+
+def to_json(value):
+    """Return a document as JSON bytes, serializing the objects in it."""
+    def default(obj):
+        data = obj.to_dict()
+        for attr in HIDDEN.get(type(obj).__name__, ()):
+            data.pop(attr, None)
+        return data
+    return json.dumps(value, default=default).encode("utf-8")
+
+
+class APIHandler(http.server.BaseHTTPRequestHandler):
+    """Handles the HTTP requests of one connection."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "HBnBAPI/1.0"
+    timeout = 5  # Idle connections are closed after this
+    disable_nagle_algorithm = True  # Headers and body are sent apart
+
+    def handle(self):
+        """Answer the requests of the connection already received.
+
+        The connection stays open unless the client asked to close it;
+        the server waits for its next request without holding a thread.
+        """
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self.__received():
+            self.handle_one_request()
+
+    def __received(self):
+        """Return True if the next request has started to arrive."""
+        try:
+            self.connection.setblocking(False)
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def do_GET(self):
+        """Answer a GET request."""
+        self.__answer(True)
+
+    def do_HEAD(self):
+        """Answer a HEAD request with the headers of GET."""
+        self.__answer(False)
+
+    def __answer(self, with_body):
+        """Answer a request, with 304 if the client's copy is current."""
+        url = urlsplit(self.path)
+        try:
+            document, tag, modified = API().get(
+                url.path, parse_qsl(url.query, keep_blank_values=True))
+        except APIError as error:
+            self.__send(error.status, to_json({"error": str(error)}), {},
+                        with_body)
+            return
+        except Exception as error:
+            self.log_error("%s: %s: %s", self.path, type(error).__name__,
+                           error)
+            self.__send(500, to_json({"error": "Internal error"}), {},
+                        with_body)
+            return
+        headers = {"ETag": tag, "Cache-Control": "no-cache"}
+        if modified is not None:
+            headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+        if self.__current(tag, modified):
+            self.__send(304, None, headers, False)
+        else:
+            self.__send(200, to_json(document), headers, with_body)
+
+    def __current(self, tag, modified):
+        """Return True if the validators of the request still match."""
+        match = self.headers.get("If-None-Match")
+        if match is not None:
+            tags = [t.strip() for t in match.split(",")]
+            return "*" in tags or tag in tags or "W/" + tag in tags
+        since = self.headers.get("If-Modified-Since")
+        if since is None or modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return modified.replace(microsecond=0) <= since
+
+    def __send(self, status, body, headers, with_body):
+        """Send a response; bodies are JSON."""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if with_body and body is not None:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Log requests only if the server is verbose."""
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+
+class PooledHTTPServer(http.server.HTTPServer):
+    """HTTP server answering requests on a pool of threads.
+
+    Open connections wait for their next request in a selector, watched
+    by one thread: a connection is handed to the pool when a request
+    arrives on it, and comes back to the selector once answered. Those
+    idle for longer than the handler timeout are closed.
+
+    Attributes:
+        verbose (bool): Whether requests are logged to standard error.
+    """
+
+    def __init__(self, address, handler=APIHandler, workers=8, verbose=False):
+        """Bind the server.
+
+        Args:
+            address (tuple): The host and port to listen on.
+            handler (type): The request handler class.
+            workers (int): The number of threads, i.e. of requests
+                handled at the same time.
+            verbose (bool): Whether requests are logged.
+        """
+        super().__init__(address, handler)
+        self.verbose = verbose
+        self.__pool = ThreadPoolExecutor(workers, thread_name_prefix="api")
+        self.__parked = queue.SimpleQueue()  # Connections for the selector
+        self.__wakeup, self.__waker = socket.socketpair()
+        self.__closing = False
+        self.__poller = threading.Thread(target=self.__poll,
+                                         name="api poller", daemon=True)
+        self.__poller.start()
+
+    def process_request(self, request, client_address):
+        """Wait for the first request of a new connection."""
+        self.__park(request, client_address)
+
+    def __park(self, request, client_address):
+        """Hand a connection to the selector."""
+        self.__parked.put((request, client_address))
+        try:
+            self.__waker.send(b"\0")
+        except OSError:
+            pass  # Closed by server_close()
+
+    def __poll(self):
+        """Hand the connections with a request to the pool.
+
+        Connections closed by the client are closed here. The parked
+        connections are added to the selector, and those idle for longer
+        than the handler timeout are closed, once a second.
+        """
+        limit = self.RequestHandlerClass.timeout
+        swept = time.monotonic()
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.__wakeup, selectors.EVENT_READ)
+            while not self.__closing:
+                for key, events in selector.select(1):
+                    if key.fileobj is self.__wakeup:
+                        self.__wakeup.recv(4096)
+                        continue
+                    selector.unregister(key.fileobj)
+                    if self.__closed(key.fileobj):
+                        self.shutdown_request(key.fileobj)
+                    else:
+                        self.__pool.submit(self.__process, key.fileobj,
+                                           key.data[0])
+                now = time.monotonic()
+                while True:
+                    try:
+                        request, client_address = self.__parked.get_nowait()
+                    except queue.Empty:
+                        break
+                    selector.register(request, selectors.EVENT_READ,
+                                      (client_address, now))
+                if limit is None or now - swept < 1:
+                    continue
+                swept = now
+                for key in list(selector.get_map().values()):
+                    if key.data is not None and now - key.data[1] > limit:
+                        selector.unregister(key.fileobj)
+                        self.shutdown_request(key.fileobj)
+            for key in list(selector.get_map().values()):
+                if key.data is not None:
+                    self.shutdown_request(key.fileobj)
+
+    @staticmethod
+    def __closed(request):
+        """Return True if a readable connection was closed by the client."""
+        try:
+            return not request.recv(1, socket.MSG_PEEK)
+        except OSError:
+            return True
+
+    def __process(self, request, client_address):
+        """Answer the requests received on a connection, then park it."""
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+        else:
+            if not (getattr(handler, "close_connection", True) or
+                    self.__closing):
+                self.__park(request, client_address)
+                return
+        self.shutdown_request(request)
+
+    def server_close(self):
+        """Close the sockets and stop the threads once idle."""
+        super().server_close()
+        self.__closing = True
+        self.__waker.send(b"\0")
+        self.__poller.join()
+        self.__wakeup.close()
+        self.__waker.close()
+        self.__pool.shutdown(wait=False)
+
+
+def main(argv=None):
+    """Run the API server.
+
+    Args:
+        argv (list): The command line arguments, sys.argv[1:] if None.
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description="HBnB HTTP JSON API")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=5000,
+                        help="TCP port (default: 5000)")
+    parser.add_argument("--workers", type=int, default=8, metavar="N",
+                        help="requests handled at once (default: 8)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="log every request to standard error")
+    args = parser.parse_args(argv)
+    server = PooledHTTPServer((args.host, args.port), APIHandler,
+                              args.workers, args.verbose)
+    print("Serving on {}:{}".format(*server.server_address[:2]),
+          file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
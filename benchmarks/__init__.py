@@ -0,0 +1,7 @@
+#!/usr/bin/python3
+"""Benchmarks for the storage engine and the console.
+
+Run them from the repository root, e.g.:
+    python3 -m benchmarks.bench_hydrate
+Each benchmark works in a temporary directory and never touches file.json.
+"""
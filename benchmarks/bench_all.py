@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""Benchmark of the all command.
+
+Lists n Places to /dev/null by formatting every object into one list
+before printing it, as all used to, then with the streaming all command,
+and reports the time and the peak of traced memory of each.
+"""
+
+import os
+import sys
+import tracemalloc
+from contextlib import redirect_stdout
+from console import HBNBCommand
+from models import storage
+from models.base_model import BaseModel
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+
+def listed_at_once():
+    """Prints every Place the way all did before it streamed."""
+    print([str(obj) for obj in storage.all("Place").values()])
+
+
+def main(n=100000):
+    """Runs the benchmark on n Places."""
+    use_tempdir()
+    for obj in BaseModel.from_dicts(payloads(n)):
+        storage.new(obj)
+    keys = list(storage.all("Place"))  # Partition before measuring
+    middle = keys[n // 2].partition(".")[2]
+    console = HBNBCommand()
+    for label, count, func in (
+            ("all, one list", n, listed_at_once),
+            ("all, streamed", n, lambda: console.onecmd("all Place")),
+            ("all, streamed, compact", n,
+             lambda: console.onecmd("all Place compact")),
+            ("all, page of 100", 100, lambda: console.onecmd(
+                "Place.all(limit=100, offset={})".format(n // 2))),
+            ("all, page of 100 after an id", 100, lambda: console.onecmd(
+                "Place.all(limit=100, after={})".format(middle)))):
+        with open(os.devnull, "w") as null, redirect_stdout(null):
+            seconds, _ = timed(func)
+            tracemalloc.start()  # Tracing slows it down: a second run
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        report(label, count, seconds)
+        print("{:<40} {:>12,} bytes peak".format("", peak))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
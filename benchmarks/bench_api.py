@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""Benchmark of the HTTP JSON API.
+
+Stores n Places and runs api.py on them. c client threads then send m
+requests each on kept-alive connections, alternating one place and a
+page of 20 places of a city, first as plain GETs, then revalidating with
+If-None-Match, answered 304. A last run opens a connection per request.
+"""
+
+import http.client
+import os
+import subprocess
+import sys
+import threading
+from models import storage
+from models.base_model import BaseModel
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def client(address, paths, tags, keep_alive):
+    """Sends GETs for paths; fills tags with the ETag of each path."""
+    connection = http.client.HTTPConnection(*address)
+    for path in paths:
+        headers = {}
+        if path in tags:
+            headers["If-None-Match"] = tags[path]
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        assert response.status in (200, 304), response.status
+        tags[path] = response.headers["ETag"]
+        if not keep_alive:
+            connection.close()
+    connection.close()
+
+
+def load(address, paths, tags, keep_alive=True):
+    """Runs one client thread per list of paths."""
+    threads = [threading.Thread(target=client, args=(
+        address, client_paths, client_tags, keep_alive))
+        for client_paths, client_tags in zip(paths, tags)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def main(n=20000, c=8, m=500):
+    """Runs the benchmark on n Places with c clients of m requests."""
+    tmp = use_tempdir()
+    for obj in BaseModel.from_dicts(payloads(n)):
+        storage.new(obj)
+    storage.save()
+    places = list(storage.all("Place").values())
+    paths = [[("/places/" + places[(i * m + j) % n].id if j % 2 else
+               "/places?limit=20&city_id=" + places[i * m + j].city_id)
+              for j in range(m)] for i in range(c)]
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "api.py"), "--port", "0",
+         "--workers", str(c)], cwd=tmp, env=dict(os.environ, PYTHONPATH=ROOT),
+        stderr=subprocess.PIPE, text=True)
+    try:
+        host, port = server.stderr.readline().split()[-1].rsplit(":", 1)
+        address = (host, int(port))
+        tags = [{} for _ in range(c)]
+        seconds, _ = timed(load, address, paths, tags)
+        report("GET, {} clients".format(c), c * m, seconds, "requests")
+        seconds, _ = timed(load, address, paths, tags)
+        report("GET If-None-Match (304), {} clients".format(c), c * m,
+               seconds, "requests")
+        seconds, _ = timed(load, address, paths, [{} for _ in range(c)],
+                           False)
+        report("GET, connection per request", c * m, seconds, "requests")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
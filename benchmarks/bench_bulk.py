@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""Benchmark of the bulk console commands.
+
+Creates, reprices and destroys n Places with one command per object, in
+batch mode so that both sides save once, then with create_many,
+update_where and destroy_where.
+"""
+
+import io
+import sys
+from contextlib import redirect_stdout
+from console import HBNBCommand
+from models import storage
+from benchmarks.common import report, use_tempdir
+
+
+def run(lines):
+    """Runs command lines in batch mode; returns the elapsed seconds."""
+    with redirect_stdout(io.StringIO()) as output:
+        commands, errors, seconds = HBNBCommand().run_batch(lines)
+    assert errors == 0, output.getvalue()
+    return seconds
+
+
+def main(n=20000):
+    """Runs the benchmark on n Places."""
+    use_tempdir()
+    seconds = run(["create Place"] * n)
+    report("create, one per command", n, seconds)
+    ids = list(storage.all("Place"))
+    seconds = run(['Place.update("{}", {{"price_by_night": 95}})'.format(
+        key.partition(".")[2]) for key in ids])
+    report("update, one per command", n, seconds)
+    seconds = run(["destroy Place " + key.partition(".")[2] for key in ids])
+    report("destroy, one per command", n, seconds)
+    use_tempdir()
+    seconds = run(['Place.create_many({}, {{"name": "Loft"}})'.format(n)])
+    report("create_many", n, seconds)
+    seconds = run(['Place.update_where({"name": "Loft"}, '
+                   '{"price_by_night": 95})'])
+    report("update_where", n, seconds)
+    seconds = run(['Place.destroy_where({"price_by_night": 95})'])
+    report("destroy_where", n, seconds)
+    assert storage.count("Place") == 0
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""Benchmark of multi-predicate Place filters.
+
+Compares a Python loop over the Places with FileStorage.find() scanning
+the objects and find() narrowed by the column store (NumPy is used when
+it is installed), for broad and selective queries. Without NumPy, find()
+scans when the best range of the store holds most of the Places.
+"""
+
+import sys
+from models import storage
+from models.base_model import BaseModel
+from models.engine import columns
+from models.engine.file_storage import FileStorage
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+QUERIES = {
+    "price <= 120, guests >= 4": (
+        dict(price_by_night__le=120, max_guest__ge=4),
+        lambda obj: obj.price_by_night <= 120 and obj.max_guest >= 4),
+    "price <= 45, guests >= 8": (
+        dict(price_by_night__le=45, max_guest__ge=8),
+        lambda obj: obj.price_by_night <= 45 and obj.max_guest >= 8),
+    "price >= 60, guests >= 1": (
+        dict(price_by_night__ge=60, max_guest__ge=1),
+        lambda obj: obj.price_by_night >= 60 and obj.max_guest >= 1),
+}
+
+
+def scan(test):
+    """Filters the Places with a loop over the objects."""
+    return {key: obj for key, obj in storage.all("Place").items()
+            if test(obj)}
+
+
+def main(n=200000, rounds=20):
+    """Runs the benchmark on n Places."""
+    use_tempdir()
+    for obj in BaseModel.from_dicts(payloads(n)):
+        storage.new(obj)
+    storage.find("Place", max_guest=0)  # Build the column store
+    share = FileStorage._FileStorage__column_share
+    modes = (("find, scan", 0),
+             ("find, column store ({})".format(
+                 "numpy" if columns.numpy is not None else "array"), share))
+    for name, (filters, test) in QUERIES.items():
+        print(name)
+        seconds, expected = timed(
+            lambda: [scan(test) for _ in range(rounds)])
+        report("  python loop", n * rounds, seconds, "rows")
+        for label, column_share in modes:
+            FileStorage._FileStorage__column_share = column_share
+            seconds, found = timed(lambda: [
+                storage.find("Place", **filters) for _ in range(rounds)])
+            report("  " + label, n * rounds, seconds, "rows")
+            assert expected[0] == found[0]
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""Benchmark of the compression of the storage file.
+
+Saves n Places in each format, uncompressed and with each codec, and
+reports the size of the file and the throughput of save() and reload().
+"""
+
+import os
+import sys
+from models import storage
+from models.base_model import BaseModel
+from models.engine.compression import CODECS
+from models.engine.file_storage import FileStorage
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+
+def main(n=50000, level=None):
+    """Runs the benchmark on n Places at a compression level."""
+    objects = list(BaseModel.from_dicts(payloads(n)))
+    FileStorage._FileStorage__compression_level = level
+    for name in ("json", "binary"):
+        FileStorage._FileStorage__format = name
+        for codec in (None,) + CODECS:
+            use_tempdir()
+            FileStorage._FileStorage__compression = codec
+            for obj in objects:
+                storage.new(obj)
+            label = "{}, {}".format(name, codec or "uncompressed")
+            seconds, _ = timed(storage.save)
+            report("save, " + label, n, seconds)
+            FileStorage._FileStorage__objects = {}
+            seconds, _ = timed(storage.reload)
+            assert storage.count() == n
+            report("reload, " + label, n, seconds)
+            size = os.path.getsize(FileStorage._FileStorage__file_path)
+            print("{:<40} {:>12,} bytes".format("", size))
+    FileStorage._FileStorage__format = "json"
+    FileStorage._FileStorage__compression = None
+    FileStorage._FileStorage__compression_level = None
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""Benchmark of the console in interactive and batch mode.
+
+Runs the same script of creates, updates and shows over a store of n
+Places, saving after every change as an interactive session does, then
+once at the end as console.py --batch does.
+"""
+
+import io
+import sys
+from contextlib import redirect_stdout
+from console import HBNBCommand
+from models import storage
+from models.base_model import BaseModel
+from benchmarks.common import payloads, report, use_tempdir
+
+
+def script(ids, count):
+    """Returns count command lines over the Places of ids."""
+    lines = []
+    for i in range(count):
+        uid = ids[i % len(ids)]
+        lines.append(("create Place",
+                      'Place.update("{}", {{"name": "Renamed {}", '
+                      '"number_rooms": {}}})'.format(uid, i, i % 6),
+                      "show Place {}".format(uid))[i % 3])
+    return lines
+
+
+def main(n=10000, count=3000):
+    """Runs count commands over a store of n Places."""
+    objects = list(BaseModel.from_dicts(payloads(n)))
+    lines = script([obj.id for obj in objects], count)
+    for label, commit_every in (("interactive", 1), ("batch", 0)):
+        use_tempdir()
+        for obj in objects:
+            storage.new(obj)
+        storage.save()
+        with redirect_stdout(io.StringIO()):
+            commands, errors, seconds = HBNBCommand().run_batch(
+                lines, commit_every)
+        assert errors == 0
+        report("{} mode".format(label), commands, seconds, "commands")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
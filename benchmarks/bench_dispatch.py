@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""Microbenchmark of the console command dispatch.
+
+Runs each form of the show, count and update commands many times on a
+store of a few Places, without saving, so that parsing and dispatch are
+what is measured.
+"""
+
+import os
+import sys
+from contextlib import redirect_stdout
+from console import HBNBCommand
+from models.place import Place
+from benchmarks.common import report, timed, use_tempdir
+
+
+def main(count=20000):
+    """Runs count commands of each form."""
+    use_tempdir()
+    uid = Place().id
+    console = HBNBCommand()
+    console.commit_every = 0
+    forms = (
+        "show Place {}".format(uid),
+        'Place.show("{}")'.format(uid),
+        "count Place",
+        "Place.count()",
+        'update Place {} name "Loft"'.format(uid),
+        'Place.update("{}", "name", "Loft")'.format(uid),
+        'Place.update("{}", {{"name": "Loft", "max_guest": 4}})'.format(uid),
+        "destroy Place nope",
+        'Place.destroy("nope")',
+    )
+    onecmd = console.onecmd
+    with open(os.devnull, "w") as null, redirect_stdout(null):
+        for line in forms:
+            seconds, _ = timed(lambda: [onecmd(line) for _ in range(count)])
+            with redirect_stdout(sys.__stdout__):
+                report(line.replace(uid, "<id>"), count, seconds, "commands")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""Benchmark of the JSON file engine against the SQLite engine.
+
+Measures per-object saves (what the console does on create/update), one
+bulk save, reload, lookups by id, counts and foreign key queries.
+"""
+
+import os
+import random
+import sys
+from models.base_model import BaseModel
+from models.engine.db_storage import DBStorage
+from models.engine.file_storage import FileStorage
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+
+def run(storage, n, saves):
+    """Runs every measure against one engine."""
+    dicts = payloads(n)
+    objs = list(BaseModel.from_dicts(dicts[:saves]))
+
+    def save_each():
+        for obj in objs:
+            storage.new(obj)
+            storage.save()
+    seconds, _ = timed(save_each)
+    report("  save after each new()", saves, seconds)
+
+    def bulk():
+        for obj in BaseModel.from_dicts(dicts[saves:]):
+            storage.new(obj)
+        storage.save()
+    seconds, _ = timed(bulk)
+    report("  bulk new() + save()", n - saves, seconds)
+    seconds, _ = timed(storage.reload)
+    report("  reload", n, seconds)
+    ids = random.Random(1).sample([d["id"] for d in dicts], 2000)
+    seconds, _ = timed(lambda: [storage.get("Place", id) for id in ids])
+    report("  get by id (cold)", len(ids), seconds, "lookups")
+    seconds, _ = timed(storage.find, "Place", city_id="")
+    report("  first query (builds indexes)", 1, seconds, "queries")
+    seconds, _ = timed(lambda: [storage.count("Place") for _ in range(100)])
+    report("  count(Place)", 100, seconds, "calls")
+    cities = sorted({d["city_id"] for d in dicts})[:20]
+    seconds, _ = timed(lambda: [storage.find("Place", city_id=city)
+                                for city in cities])
+    report("  find(city_id=...)", len(cities), seconds, "queries")
+
+
+def main(n=50000, saves=500):
+    """Runs the benchmark on n Places."""
+    tmp = use_tempdir()
+    print("FileStorage")
+    run(FileStorage(), n, saves)
+    print("DBStorage")
+    DBStorage._DBStorage__db_path = os.path.join(tmp, "file.db")
+    storage = DBStorage()
+    storage.reload()
+    run(storage, n, saves)
+    storage.close()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
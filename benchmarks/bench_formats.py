@@ -0,0 +1,36 @@
+#!/usr/bin/python3
+"""Benchmark of the storage file formats.
+
+Saves n Places with each format of FileStorage and reports the size of
+the file, the time of a full save and the time of reload().
+"""
+
+import os
+import sys
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+
+def main(n=100000):
+    """Runs the benchmark on n Places."""
+    objects = list(BaseModel.from_dicts(payloads(n)))
+    for name in ("json", "binary"):
+        use_tempdir()
+        FileStorage._FileStorage__format = name
+        for obj in objects:
+            storage.new(obj)
+        seconds, _ = timed(storage.save)
+        report("save, format={}".format(name), n, seconds)
+        FileStorage._FileStorage__objects = {}
+        seconds, _ = timed(storage.reload)
+        assert storage.count() == n
+        report("reload, format={}".format(name), n, seconds)
+        size = os.path.getsize(FileStorage._FileStorage__file_path)
+        print("{:<40} {:>12,} bytes".format("", size))
+    FileStorage._FileStorage__format = "json"
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
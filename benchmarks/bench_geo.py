@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+"""Benchmark of radius queries on Place coordinates.
+
+Compares computing the distance to every Place with FileStorage.near(),
+which only visits the grid cells around the point.
+"""
+
+import sys
+from models import storage
+from models.base_model import BaseModel
+from models.engine.geo import distance
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+
+def scan(lat, lon, km):
+    """Returns the Places within km with a full scan."""
+    return {key: obj for key, obj in storage.all("Place").items()
+            if distance(lat, lon, obj.latitude, obj.longitude) <= km}
+
+
+def main(n=200000, rounds=50):
+    """Runs the benchmark on n Places."""
+    use_tempdir()
+    for obj in BaseModel.from_dicts(payloads(n)):
+        storage.new(obj)
+    storage.near("Place", 0, 0, 1)  # Build the grid
+    points = [(48.85, 2.35, 5), (-33.9, 151.2, 25), (40.7, -74.0, 50)]
+    for lat, lon, km in points:
+        print("{} km around ({}, {})".format(km, lat, lon))
+        seconds, expected = timed(lambda: [scan(lat, lon, km)
+                                           for _ in range(rounds // 10)])
+        report("  full scan", rounds // 10, seconds, "queries")
+        seconds, found = timed(lambda: [storage.near("Place", lat, lon, km)
+                                        for _ in range(rounds)])
+        report("  grid index ({} hits)".format(len(found[0])), rounds,
+               seconds, "queries")
+        assert set(expected[0]) == set(found[0])
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
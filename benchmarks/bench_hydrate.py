@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+"""Benchmark of object construction from to_dict() dictionaries.
+
+Compares the original BaseModel(**kwargs) path, which resolved the class
+table and ran datetime.strptime for every object, with the batch
+BaseModel.from_dicts() path used by FileStorage.reload().
+"""
+
+import sys
+from datetime import datetime
+from models import storage
+from models.base_model import BaseModel
+from benchmarks.common import payloads, report, timed
+
+
+def legacy(dicts):
+    """Builds objects the way reload() used to."""
+    objs = []
+    for d in dicts:
+        obj = object.__new__(storage.classes()[d["__class__"]])
+        for key, value in d.items():
+            if key == "__class__":
+                continue
+            if key in {"created_at", "updated_at"}:
+                value = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+            setattr(obj, key, value)
+        objs.append(obj)
+    return objs
+
+
+def main(n=100000):
+    """Runs the benchmark on n objects."""
+    dicts = payloads(n)
+    seconds, old = timed(legacy, dicts)
+    report("legacy kwargs + strptime", n, seconds)
+    seconds, new = timed(lambda: list(BaseModel.from_dicts(dicts)))
+    report("BaseModel.from_dicts", n, seconds)
+    assert [o.to_dict() for o in old[:100]] == [o.to_dict() for o in new[:100]]
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""Benchmark of the memory held by reloaded objects.
+
+Saves n Places, then reloads them with and without the compact mode of
+FileStorage and reports the traced bytes per object.
+"""
+
+import gc
+import sys
+import tracemalloc
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+
+def measure(compact, n):
+    """Reloads the storage file and returns (seconds, bytes per object)."""
+    FileStorage._FileStorage__compact = compact
+    FileStorage._FileStorage__objects = {}
+    gc.collect()
+    tracemalloc.start()
+    seconds, _ = timed(storage.reload)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert storage.count() == n
+    return seconds, size / n
+
+
+def main(n=100000):
+    """Runs the benchmark on n objects."""
+    use_tempdir()
+    for obj in BaseModel.from_dicts(payloads(n)):
+        storage.new(obj)
+    storage.save()
+    for compact in (False, True):
+        seconds, per_object = measure(compact, n)
+        label = "reload, compact={}".format(compact)
+        report(label, n, seconds)
+        print("{:<40} {:>10,.0f} bytes/object".format("", per_object))
+    FileStorage._FileStorage__compact = False
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""Benchmark of the record format.
+
+Saves n Places as JSON and as records, then reports what a console
+command touching one object costs: reload() plus show, and update with
+its save.
+"""
+
+import sys
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+
+def main(n=100000, lookups=1000):
+    """Runs the benchmark on n Places, fetching lookups of them."""
+    objects = list(BaseModel.from_dicts(payloads(n)))
+    ids = [obj.id for obj in objects[::max(1, n // lookups)]]
+    for name in ("json", "records"):
+        use_tempdir()
+        FileStorage._FileStorage__format = name
+        for obj in objects:
+            storage.new(obj)
+        seconds, _ = timed(storage.save)
+        report("save, format={}".format(name), n, seconds)
+        FileStorage._FileStorage__objects = {}
+        seconds, _ = timed(storage.reload)
+        report("reload, format={}".format(name), n, seconds)
+        seconds, found = timed(lambda: [storage.get("Place", i) for i in ids])
+        assert all(found)
+        report("get, format={}".format(name), len(ids), seconds, "gets")
+
+        def update():
+            obj = storage.get("Place", ids[0])
+            obj.name = "renamed"
+            obj.save()
+        seconds, _ = timed(update)
+        report("update one, format={}".format(name), 1, seconds, "saves")
+    FileStorage._FileStorage__format = "json"
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+"""Benchmark of saving after a single change in a large store.
+
+Times BaseModel.save() on one object among n, which rewrites file.json
+but only serializes the dirty object again, against a save that has to
+serialize every object (the first one after reload()).
+"""
+
+import sys
+from models import storage
+from models.base_model import BaseModel
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+
+def main(n=100000, rounds=10):
+    """Runs the benchmark on n Places."""
+    use_tempdir()
+    for obj in BaseModel.from_dicts(payloads(n)):
+        storage.new(obj)
+    seconds, _ = timed(storage.save)
+    report("full serialization", n, seconds)
+    obj = next(iter(storage.all().values()))
+
+    def update():
+        for i in range(rounds):
+            obj.name = "renamed {}".format(i)
+            obj.save()
+    seconds, _ = timed(update)
+    report("one dirty object per save", rounds, seconds, "saves")
+    print("dirty after save:", storage.dirty())
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""Benchmark of the command server.
+
+Stores n Places, then compares running one command by starting
+console.py, which loads the storage each time, with connecting to a
+running server.py. Then c concurrent clients each send m commands (show,
+count and update), waiting for each answer, then pipelined. The server
+saves only when it stops (--commit-every 0), so the commands themselves
+are measured.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from models import storage
+from models.base_model import BaseModel
+from server import Client
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def commands(ids, m, client):
+    """Returns m command lines for one client."""
+    lines = []
+    for i in range(m):
+        uid = ids[(client * m + i) % len(ids)]
+        lines.append(("show Place {}".format(uid), "count Place",
+                      'Place.update("{}", {{"max_guest": {}}})'.format(
+                          uid, i % 10))[i % 3])
+    return lines
+
+
+async def load(path, ids, c, m, pipelined):
+    """Runs c clients of m commands; returns the elapsed seconds."""
+    clients = [await Client.connect(path=path) for _ in range(c)]
+
+    async def run(number, client):
+        lines = commands(ids, m, number)
+        if pipelined:
+            for line in lines:
+                client.send(line)
+            answers = [await client.receive() for line in lines]
+        else:
+            answers = [await client.call(line) for line in lines]
+        assert all(ok for ok, output in answers)
+    start = time.perf_counter()
+    await asyncio.gather(*(run(number, client)
+                           for number, client in enumerate(clients)))
+    seconds = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    return seconds
+
+
+async def connections(path, uid, count):
+    """Connects count times to run one show; returns the elapsed seconds."""
+    start = time.perf_counter()
+    for _ in range(count):
+        client = await Client.connect(path=path)
+        ok, output = await client.call("show Place " + uid)
+        assert ok, output
+        await client.close()
+    return time.perf_counter() - start
+
+
+def main(n=20000, c=50, m=200, starts=5):
+    """Runs the benchmark on n Places with c clients of m commands."""
+    tmp = use_tempdir()
+    for obj in BaseModel.from_dicts(payloads(n)):
+        storage.new(obj)
+    storage.save()
+    ids = [key.partition(".")[2] for key in storage.all("Place")]
+    env = dict(os.environ, PYTHONPATH=ROOT)
+
+    def start_console():
+        subprocess.run([sys.executable, os.path.join(ROOT, "console.py"),
+                        "--batch"], input="show Place {}\n".format(ids[0]),
+                       cwd=tmp, env=env, check=True, capture_output=True,
+                       text=True)
+    seconds, _ = timed(lambda: [start_console() for _ in range(starts)])
+    report("console.py process per command", starts, seconds, "commands")
+    path = os.path.join(tmp, "hbnb.sock")
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "server.py"), "--unix", path,
+         "--commit-every", "0"], cwd=tmp, env=env, stderr=subprocess.PIPE)
+    try:
+        server.stderr.readline()  # Serving on ...
+        seconds = asyncio.run(connections(path, ids[0], 100 * starts))
+        report("server connection per command", 100 * starts, seconds,
+               "commands")
+        for pipelined in (False, True):
+            seconds = asyncio.run(load(path, ids, c, m, pipelined))
+            report("{} clients, {}".format(
+                c, "pipelined" if pipelined else "one at a time"),
+                c * m, seconds, "commands")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""Benchmark of the sharded layout.
+
+Saves n Places in one file and in shards hash-partitioned by key, then
+reports reload() with one process and with one per CPU, and a save after
+changing a single object.
+"""
+
+import sys
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+
+def main(n=100000, partitions=8):
+    """Runs the benchmark on n Places split in partitions shards."""
+    objects = list(BaseModel.from_dicts(payloads(n)))
+    for sharded in (False, True):
+        use_tempdir()
+        FileStorage._FileStorage__sharded = sharded
+        FileStorage._FileStorage__shard_partitions = partitions
+        label = ("{} shards".format(partitions) if sharded
+                 else "single file")
+        for obj in objects:
+            storage.new(obj)
+        seconds, _ = timed(storage.save)
+        report("save, " + label, n, seconds)
+        for workers in ((1, 0) if sharded else (1,)):
+            FileStorage._FileStorage__reload_workers = workers
+            FileStorage._FileStorage__objects = {}
+            seconds, _ = timed(storage.reload)
+            assert storage.count() == n
+            report("reload, {}, workers={}".format(
+                label, workers or "cpus"), n, seconds)
+        storage.save()  # Fill the cache of encoded objects
+        obj = next(iter(storage.all().values()))
+        obj.name = "renamed"
+        seconds, _ = timed(obj.save)
+        report("save one change, " + label, 1, seconds, "saves")
+    FileStorage._FileStorage__sharded = False
+    FileStorage._FileStorage__shard_partitions = 1
+    FileStorage._FileStorage__reload_workers = 1
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""Benchmark of several processes writing to the same storage file.
+
+Starts n processes that each create and save m Places, first with the
+default mode, where the last writer overwrites the others, then in shared
+mode, where each save locks the file and merges what the other processes
+wrote, with and without the journal. Reports the overall saves/s and how many objects were lost.
+"""
+
+import multiprocessing
+import sys
+from models import storage
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+
+def writer(path, shared, journal, m):
+    """Creates and saves m Places one at a time."""
+    FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__journal_path = path + ".journal"
+    FileStorage._FileStorage__shared = shared
+    FileStorage._FileStorage__journal = journal
+    storage.reload()
+    for obj in BaseModel.from_dicts(payloads(m)):
+        storage.new(obj)
+        storage.save()
+
+
+def run(n, m, shared, journal):
+    """Runs n writers and waits for all of them."""
+    path = FileStorage._FileStorage__file_path
+    workers = [multiprocessing.Process(target=writer,
+                                       args=(path, shared, journal, m))
+               for i in range(n)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def main(n=4, m=250):
+    """Runs the benchmark with n processes saving m objects each."""
+    for shared, journal in ((False, False), (True, False), (True, True)):
+        use_tempdir()
+        seconds, _ = timed(run, n, m, shared, journal)
+        FileStorage._FileStorage__journal = journal
+        storage.reload()
+        FileStorage._FileStorage__journal = False
+        label = "{} writers, shared={}, journal={}".format(n, shared, journal)
+        report(label, n * m, seconds, "saves")
+        print("{:<40} {:>10,} of {:,} objects lost".format(
+            "", n * m - storage.count(), n * m))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
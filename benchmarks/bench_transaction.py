@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""Benchmark of transactions.
+
+Lists n Places on a storage holding base objects: each listing creates
+the Place, attaches amenity ids and adds reviews, saving after every
+step, then with each listing in a transaction saved once by commit().
+Also reports the cost of a rollback.
+"""
+
+import sys
+from models import storage
+from models.base_model import BaseModel
+from models.place import Place
+from models.review import Review
+from benchmarks.common import payloads, report, timed, use_tempdir
+
+
+def listing(reviews):
+    """Creates a Place with amenities and reviews, saving each step."""
+    place = Place()
+    place.save()
+    place.amenity_ids = ["wifi", "kitchen"]
+    place.save()
+    for _ in range(reviews):
+        review = Review()
+        review.place_id = place.id
+        review.save()
+
+
+def main(n=50, base=20000, reviews=3):
+    """Runs the benchmark on n listings over base stored Places."""
+    for label in ("save per step", "transaction"):
+        use_tempdir()
+        for obj in BaseModel.from_dicts(payloads(base)):
+            storage.new(obj)
+        storage.save()
+
+        def run():
+            for _ in range(n):
+                if label == "save per step":
+                    listing(reviews)
+                else:
+                    with storage.transaction():
+                        listing(reviews)
+        seconds, _ = timed(run)
+        report("listing, {}".format(label), n, seconds, "listings")
+    storage.begin()
+    for _ in range(n):
+        listing(reviews)
+    seconds, _ = timed(storage.rollback)
+    report("rollback", n, seconds, "listings")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
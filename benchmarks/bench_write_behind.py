@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+"""Benchmark of many console creates with and without write-behind.
+
+Runs n "create Place" commands through HBNBCommand, each of which calls
+storage.save(), first writing file.json after every command and then in
+write-behind mode, where the saves of one window become a single write.
+"""
+
+import io
+import sys
+from contextlib import redirect_stdout
+from console import HBNBCommand
+from models import storage
+from models.engine.file_storage import FileStorage
+from benchmarks.common import report, timed, use_tempdir
+
+
+def creates(n):
+    """Runs n create commands and flushes what is left."""
+    console = HBNBCommand()
+    with redirect_stdout(io.StringIO()):
+        for i in range(n):
+            console.onecmd("create Place")
+    storage.flush()
+
+
+def main(n=2000):
+    """Runs the benchmark with n commands per mode."""
+    for write_behind in (False, True):
+        use_tempdir()
+        FileStorage._FileStorage__write_behind = write_behind
+        seconds, _ = timed(creates, n)
+        assert storage.count() == n
+        report("create, write_behind={}".format(write_behind), n, seconds,
+               "commands")
+    FileStorage._FileStorage__write_behind = False
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
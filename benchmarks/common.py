@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""Helpers shared by the benchmarks."""
+
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from models.engine.file_storage import FileStorage
+
+
+def use_tempdir():
+    """Points the storage at files in a fresh temporary directory.
+
+    Returns:
+        str: The temporary directory.
+    """
+    tmp = tempfile.mkdtemp(prefix="hbnb-bench-")
+    FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+    FileStorage._FileStorage__journal_path = os.path.join(
+        tmp, "file.json.journal")
+    FileStorage._FileStorage__objects = {}
+    return tmp
+
+
+def payloads(n, cities=100, users=1000):
+    """Returns n Place dictionaries as made by to_dict().
+
+    Args:
+        n (int): The number of dictionaries.
+        cities (int): The number of distinct city ids.
+        users (int): The number of distinct user ids.
+    """
+    city_ids = [str(uuid.uuid4()) for _ in range(cities)]
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    start = datetime(2024, 1, 1, 12, 0, 0, 1)
+    result = []
+    for i in range(n):
+        stamp = (start + timedelta(seconds=i)).isoformat()
+        result.append({
+            "id": str(uuid.uuid4()),
+            "created_at": stamp,
+            "updated_at": stamp,
+            "__class__": "Place",
+            "city_id": city_ids[i % cities],
+            "user_id": user_ids[i % users],
+            "name": "Place {}".format(i),
+            "number_rooms": i % 6,
+            "number_bathrooms": i % 3,
+            "max_guest": i % 10,
+            "price_by_night": 40 + i % 300,
+            "latitude": -60.0 + (i * 7919 % 120000) / 1000.0,
+            "longitude": -170.0 + (i * 104729 % 340000) / 1000.0,
+        })
+    return result
+
+
+def timed(func, *args, **kwargs):
+    """Calls func and returns (elapsed seconds, result)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def report(label, count, seconds, unit="objects"):
+    """Prints a throughput line.
+
+    Args:
+        label (str): What was measured.
+        count (int): The number of items processed.
+        seconds (float): The elapsed time.
+        unit (str): The name of the items.
+    """
+    rate = count / seconds if seconds else float("inf")
+    print("{:<40} {:>10.3f} s {:>14,.0f} {}/s".format(
+        label, seconds, rate, unit))
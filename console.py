@@ -1,7 +1,19 @@
 #!/usr/bin/python3
-"""Defines the HBnB console."""
+"""Defines the HBnB console.
+
+Usage: console.py [--batch [FILE]] [--commit-every N] [--stop-on-error]
+
+With --batch, the commands of FILE (standard input if omitted) run one
+after the other against the objects in memory, which are saved once at
+the end, or after every N changes with --commit-every. A summary of the
+run is printed to standard error.
+"""
+import argparse
 import cmd
 import re
+import sys
+import time
+from datetime import datetime
 from shlex import split
 from models import storage
 from models.base_model import BaseModel
@@ -11,6 +23,40 @@ from models.city import City
 from models.place import Place
 from models.amenity import Amenity
 from models.review import Review
+from models.engine.schema import Schema, literal
+
+# Compiled once: the shell-like tokens of an argument, the commands of the
+# <class>.<command>(<args>) syntax and the command word of a line
+_TOKEN = re.compile(r"""(?:[^ \t\r\n"'\\]+|"[^"\\]*"|'[^']*')+""")
+_TOKENS = re.compile(r"""[ \t\r\n]*(?:(?:[^ \t\r\n"'\\]+|"[^"\\]*"|'[^']*')+"""
+                     r"""[ \t\r\n]*)*""")
+_QUOTED = re.compile(r""""([^"]*)"|'([^']*)'""")
+_CURLY_BRACES = re.compile(r"\{(.*?)\}")
+_BRACKETS = re.compile(r"\[(.*?)\]")
+_CALL = re.compile(r"([^.]*)\.([^(]*)\((.*?)\)")
+_COMMAND = re.compile(r"([A-Za-z0-9_]*)(.*)", re.S)
+
+
+def _unquote(match):
+    """Return the text between the quotes of a match of _QUOTED."""
+    return match.group(1) if match.group(1) is not None else match.group(2)
+
+
+def split_args(arg):
+    """Split an argument into tokens like shlex.split().
+
+    Arguments without backslashes or unbalanced quotes are split by the
+    compiled patterns; others are handed to shlex.split().
+    Args:
+        arg (str): The command argument.
+    Returns:
+        list: The tokens, without their quotes.
+    """
+    if _TOKENS.fullmatch(arg) is None:
+        return split(arg)
+    return [_QUOTED.sub(_unquote, token) if "'" in token or '"' in token
+            else token for token in _TOKEN.findall(arg)]
+
 
 def parse(arg):
     """Parse command arguments.
@@ -21,18 +67,18 @@ def parse(arg):
     Returns:
         list: The parsed arguments.
     """
-    curly_braces = re.search(r"\{(.*?)\}", arg)
-    brackets = re.search(r"\[(.*?)\]", arg)
+    curly_braces = _CURLY_BRACES.search(arg)
+    brackets = _BRACKETS.search(arg)
     if curly_braces is None:
         if brackets is None:
-            return [i.strip(",") for i in split(arg)]
+            return [i.strip(",") for i in split_args(arg)]
         else:
-            lexer = split(arg[:brackets.span()[0]])
+            lexer = split_args(arg[:brackets.span()[0]])
             retl = [i.strip(",") for i in lexer]
             retl.append(brackets.group())
             return retl
     else:
-        lexer = split(arg[:curly_braces.span()[0]])
+        lexer = split_args(arg[:curly_braces.span()[0]])
         retl = [i.strip(",") for i in lexer]
         retl.append(curly_braces.group())
         return retl
@@ -42,10 +88,30 @@ class HBNBCommand(cmd.Cmd):
     
     Attributes:
         prompt (str): The command prompt.
+        commit_every (int): The number of changes after which the storage
+            is saved; 0 to save only when the console exits.
         __classes (set): Set of valid class names.
     """
 
     prompt = "(hbnb) "
+    commit_every = 1
+    __unsaved = 0
+    __compiled = None
+
+    # Methods of the commands of the <class>.<command>(<args>) syntax
+    __dot_commands = {
+        "all": "do_all",
+        "show": "do_show",
+        "destroy": "do_destroy",
+        "count": "do_count",
+        "update": "do_update",
+        "create_many": "do_create_many",
+        "update_where": "do_update_where",
+        "destroy_where": "do_destroy_where",
+        "near": "do_near",
+        "nearest": "do_nearest",
+        "within": "do_within"
+    }
     __classes = {
         "BaseModel",
         "User",
@@ -60,6 +126,23 @@ class HBNBCommand(cmd.Cmd):
         """Do nothing upon receiving an empty line."""
         pass
 
+    def parseline(self, line):
+        """Split a line into its command and argument.
+        
+        This is cmd.Cmd.parseline() with a compiled pattern.
+        Args:
+            line (str): The input line.
+        Returns:
+            tuple: The command, the argument and the stripped line.
+        """
+        line = line.strip()
+        if line[:1] == "?":
+            line = "help " + line[1:]
+        if not line or line[0] == "!":
+            return None, None, line
+        command, arg = _COMMAND.match(line).groups()
+        return command, arg.strip(), line
+
     def default(self, arg):
         """Default behavior for cmd module when input is invalid.
         
@@ -69,22 +152,12 @@ class HBNBCommand(cmd.Cmd):
         Returns:
             bool: False if the syntax is unknown, else result of command.
         """
-        argdict = {
-            "all": self.do_all,
-            "show": self.do_show,
-            "destroy": self.do_destroy,
-            "count": self.do_count,
-            "update": self.do_update
-        }
-        match = re.search(r"\.", arg)
+        match = _CALL.match(arg)
         if match is not None:
-            argl = [arg[:match.span()[0]], arg[match.span()[1]:]]
-            match = re.search(r"\((.*?)\)", argl[1])
-            if match is not None:
-                command = [argl[1][:match.span()[0]], match.group()[1:-1]]
-                if command[0] in argdict.keys():
-                    call = "{} {}".format(argl[0], command[1])
-                    return argdict[command[0]](call)
+            name, command, args = match.groups()
+            method = HBNBCommand.__dot_commands.get(command)
+            if method is not None:
+                return getattr(self, method)("{} {}".format(name, args))
         print("*** Unknown syntax: {}".format(arg))
         return False
 
@@ -96,6 +169,7 @@ class HBNBCommand(cmd.Cmd):
         Returns:
             bool: True to exit the program.
         """
+        storage.flush()
         return True
 
     def do_EOF(self, arg):
@@ -107,6 +181,7 @@ class HBNBCommand(cmd.Cmd):
             bool: True to exit the program.
         """
         print("")
+        storage.flush()
         return True
 
     def do_create(self, arg):
@@ -122,9 +197,9 @@ class HBNBCommand(cmd.Cmd):
         elif argl[0] not in HBNBCommand.__classes:
             print("** class doesn't exist **")
         else:
-            new_instance = eval(argl[0])()
+            new_instance = storage.classes()[argl[0]]()
             print(new_instance.id)
-            storage.save()
+            self.__save()
 
     def do_show(self, arg):
         """Display the string representation of a class instance of a given id.
@@ -133,18 +208,9 @@ class HBNBCommand(cmd.Cmd):
         Args:
             arg (str): The class name and id.
         """
-        argl = parse(arg)
-        objdict = storage.all()
-        if len(argl) == 0:
-            print("** class name missing **")
-        elif argl[0] not in HBNBCommand.__classes:
-            print("** class doesn't exist **")
-        elif len(argl) == 1:
-            print("** instance id missing **")
-        elif "{}.{}".format(argl[0], argl[1]) not in objdict:
-            print("** no instance found **")
-        else:
-            print(objdict["{}.{}".format(argl[0], argl[1])])
+        obj = self.__instance(parse(arg))
+        if obj is not None:
+            print(obj)
 
     def do_destroy(self, arg):
         """Delete a class instance of a given id.
@@ -153,38 +219,83 @@ class HBNBCommand(cmd.Cmd):
         Args:
             arg (str): The class name and id.
         """
-        argl = parse(arg)
-        objdict = storage.all()
+        obj = self.__instance(parse(arg))
+        if obj is not None:
+            storage.delete(obj)
+            self.__save()
+
+    def __instance(self, argl):
+        """Validate a class name and id and look up the instance.
+        
+        Args:
+            argl (list): The parsed arguments, starting with the class
+                name and the id.
+        Returns:
+            BaseModel: The instance, or None after printing the error.
+        """
         if len(argl) == 0:
             print("** class name missing **")
         elif argl[0] not in HBNBCommand.__classes:
             print("** class doesn't exist **")
         elif len(argl) == 1:
             print("** instance id missing **")
-        elif "{}.{}".format(argl[0], argl[1]) not in objdict.keys():
-            print("** no instance found **")
         else:
-            del objdict["{}.{}".format(argl[0], argl[1])]
-            storage.save()
+            obj = storage.get(argl[0], argl[1])
+            if obj is not None:
+                return obj
+            print("** no instance found **")
+        return None
 
     def do_all(self, arg):
         """Display string representations of all instances of a given class.
         
-        Usage: all or all <class> or <class>.all()
+        Usage: all [<class>] [limit=<n>] [offset=<n>] [after=<id>] [compact]
+               or <class>.all([limit=<n>, offset=<n>, after=<id>, compact])
+        The instances are printed one at a time as they are formatted, as
+        one list or, with compact, one per line. after=<id> continues a
+        listing after the instance with that id. Only the instances of the
+        page are read from the storage.
         Args:
-            arg (str): The class name (optional).
+            arg (str): The class name (optional) and the paging options.
         """
         argl = parse(arg)
-        if len(argl) > 0 and argl[0] not in HBNBCommand.__classes:
+        name = None
+        if argl and "=" not in argl[0] and argl[0] != "compact":
+            name = argl.pop(0)
+        if name is not None and name not in HBNBCommand.__classes:
             print("** class doesn't exist **")
-        else:
-            objl = []
-            for obj in storage.all().values():
-                if len(argl) > 0 and argl[0] == obj.__class__.__name__:
-                    objl.append(obj.__str__())
-                elif len(argl) == 0:
-                    objl.append(obj.__str__())
-            print(objl)
+            return
+        options = {"limit": None, "offset": 0, "after": None}
+        compact = False
+        for option in argl:
+            key, sep, value = option.partition("=")
+            if option == "compact":
+                compact = True
+            elif not sep or key not in options:
+                print("** invalid arguments **")
+                return
+            elif key == "after":
+                options[key] = value
+            elif value.isdigit():
+                options[key] = int(value)
+            else:
+                print("** invalid arguments **")
+                return
+        try:
+            page = storage.page(name, **options).values()
+        except KeyError:
+            print("** no instance found **")
+            return
+        if compact:
+            for obj in page:
+                print(obj)
+            return
+        write = sys.stdout.write
+        separator = "["
+        for obj in page:
+            write(separator + repr(str(obj)))
+            separator = ", "
+        print("[]" if separator == "[" else "]")
 
     def do_count(self, arg):
         """Retrieve the number of instances of a given class.
@@ -194,11 +305,12 @@ class HBNBCommand(cmd.Cmd):
             arg (str): The class name.
         """
         argl = parse(arg)
-        count = 0
-        for obj in storage.all().values():
-            if argl[0] == obj.__class__.__name__:
-                count += 1
-        print(count)
+        if len(argl) == 0:
+            print("** class name missing **")
+        elif argl[0] not in HBNBCommand.__classes:
+            print("** class doesn't exist **")
+        else:
+            print(storage.count(argl[0]))
 
     def do_update(self, arg):
         """Update a class instance of a given id by adding or updating an attribute.
@@ -206,51 +318,425 @@ class HBNBCommand(cmd.Cmd):
         Usage: update <class> <id> <attribute_name> <attribute_value> or
                <class>.update(<id>, <attribute_name>, <attribute_value>) or
                <class>.update(<id>, <dictionary>)
+        updated_at is set to the current time unless it is given.
         Args:
             arg (str): The class name, id, attribute name, and value or a dictionary.
         """
         argl = parse(arg)
-        objdict = storage.all()
-
-        if len(argl) == 0:
-            print("** class name missing **")
-            return False
-        if argl[0] not in HBNBCommand.__classes:
-            print("** class doesn't exist **")
-            return False
-        if len(argl) == 1:
-            print("** instance id missing **")
-            return False
-        if "{}.{}".format(argl[0], argl[1]) not in objdict.keys():
-            print("** no instance found **")
+        obj = self.__instance(argl)
+        if obj is None:
             return False
         if len(argl) == 2:
             print("** attribute name missing **")
             return False
         if len(argl) == 3:
             try:
-                type(eval(argl[2])) != dict
-            except NameError:
+                values = literal(argl[2])
+            except ValueError:
+                values = None
+            if type(values) is not dict:
                 print("** value missing **")
                 return False
+        else:
+            values = {argl[2]: argl[3]}
+        values = self.__typed(argl[0], values)
+        if values is None:
+            return False
+        values.setdefault("updated_at", datetime.now())
+        storage.changing(obj)
+        obj.__dict__.update(values)
+        storage.touch(obj)
+        self.__save()
+
+    def do_create_many(self, arg):
+        """Create several instances of a class with the same attributes.
+        
+        Usage: create_many <class> <count>[, <dictionary>] or
+               <class>.create_many(<count>[, <dictionary>])
+        Args:
+            arg (str): The class name, the number of instances and the
+                attributes to set on each.
+        """
+        args = self.__bulk_args(arg, (int, dict), 1)
+        if args is None:
+            return
+        name, count = args[0], args[1]
+        values = args[2] if len(args) > 2 else {}
+        if count < 0:
+            print("** invalid arguments **")
+            return
+        start = time.perf_counter()
+        cls = storage.classes()[name]
+        values = self.__typed(name, values)
+        if values is None:
+            return
+        cls.create_many(count, values)
+        self.__save()
+        self.__report(count, name, "created", start)
+
+    def do_update_where(self, arg):
+        """Update the instances of a class that match a filter.
+        
+        Usage: update_where <class> <filter>, <changes> or
+               <class>.update_where(<filter>, <changes>)
+        The filter maps attributes, optionally suffixed with __ne, __lt,
+        __le, __gt or __ge, to values; an empty filter matches every
+        instance. updated_at is set to the current time unless it is
+        given; lists and dictionaries are copied for each instance.
+        Args:
+            arg (str): The class name, the filter and the dictionary of
+                attributes to set.
+        """
+        args = self.__bulk_args(arg, (dict, dict), 2)
+        if args is None:
+            return
+        start = time.perf_counter()
+        filters = self.__typed(args[0], args[1], filters=True)
+        changes = self.__typed(args[0], args[2])
+        if filters is None or changes is None:
+            return
+        changes.setdefault("updated_at", datetime.now())
+        mutable = [key for key, value in changes.items()
+                   if type(value) in (list, dict)]
+        matches = storage.find(args[0], **filters)
+        for obj in matches.values():
+            storage.changing(obj)
+            obj.__dict__.update(changes)
+            for key in mutable:
+                obj.__dict__[key] = changes[key].copy()
+            storage.new(obj)  # Mark it changed and index it again
+        self.__save()
+        self.__report(len(matches), args[0], "updated", start)
+
+    def do_destroy_where(self, arg):
+        """Delete the instances of a class that match a filter.
+        
+        Usage: destroy_where <class> <filter> or
+               <class>.destroy_where(<filter>)
+        Args:
+            arg (str): The class name and the filter, as in update_where.
+        """
+        args = self.__bulk_args(arg, (dict,), 1)
+        if args is None:
+            return
+        start = time.perf_counter()
+        filters = self.__typed(args[0], args[1], filters=True)
+        if filters is None:
+            return
+        matches = storage.find(args[0], **filters)
+        for obj in matches.values():
+            storage.delete(obj)
+        self.__save()
+        self.__report(len(matches), args[0], "destroyed", start)
+
+    def do_begin(self, arg):
+        """Start a transaction: nothing is saved until commit.
+        
+        Usage: begin
+        Args:
+            arg (str): The command argument, unused.
+        """
+        try:
+            storage.begin()
+        except RuntimeError:
+            print("** transaction already open **")
+
+    def do_commit(self, arg):
+        """Save the changes of the transaction at once.
+        
+        Usage: commit
+        Args:
+            arg (str): The command argument, unused.
+        """
+        try:
+            storage.commit()
+        except RuntimeError:
+            print("** no transaction open **")
+        else:
+            self.__unsaved = 0
+
+    def do_rollback(self, arg):
+        """Undo the changes of the transaction.
+        
+        Usage: rollback
+        Args:
+            arg (str): The command argument, unused.
+        """
+        try:
+            storage.rollback()
+        except RuntimeError:
+            print("** no transaction open **")
+        else:
+            self.__unsaved = 0
+
+    def __bulk_args(self, arg, types, required):
+        """Validate the arguments of a bulk command.
+        
+        The arguments after the class name are Python literals separated
+        by commas.
+        Args:
+            arg (str): The class name followed by the arguments.
+            types (tuple): The type of each argument.
+            required (int): The number of arguments that must be given.
+        Returns:
+            list: The class name and the arguments, or None after an error.
+        """
+        name, _, rest = arg.strip().partition(" ")
+        if not name:
+            print("** class name missing **")
+            return None
+        if name not in HBNBCommand.__classes:
+            print("** class doesn't exist **")
+            return None
+        try:
+            values = literal("[{}]".format(rest))
+        except ValueError:
+            values = None
+        if (values is None or not required <= len(values) <= len(types) or
+                not all(type(value) is kind
+                        for value, kind in zip(values, types))):
+            print("** invalid arguments **")
+            return None
+        return [name] + values
+
+    @staticmethod
+    def __schema():
+        """Return the schema of the storage classes, compiled on first use.
+        
+        Returns:
+            Schema: The classes and the converters of their attributes.
+        """
+        if HBNBCommand.__compiled is None:
+            HBNBCommand.__compiled = Schema(storage.classes(),
+                                            storage.attributes())
+        return HBNBCommand.__compiled
+
+    @staticmethod
+    def __typed(name, values, filters=False):
+        """Convert values to the types of the class attributes they set.
+        
+        Args:
+            name (str): The class name.
+            values (dict): The values by attribute name.
+            filters (bool): Whether the keys may end with a filter
+                operator such as __gt.
+        Returns:
+            dict: The converted values, or None after an error.
+        """
+        converters = HBNBCommand.__schema().converters(name)
+        typed = {}
+        for key, value in values.items():
+            attr = key
+            if filters and "__" in key[1:]:
+                attr = key.rpartition("__")[0]
+            convert = converters.get(attr)
+            if convert is not None and value is not None:
+                try:
+                    value = convert(value)
+                except (TypeError, ValueError):
+                    print("** invalid value for {} **".format(attr))
+                    return None
+            typed[key] = value
+        return typed
+
+    @staticmethod
+    def __report(count, name, done, start):
+        """Print the number of instances affected and the elapsed time."""
+        print("{} {} {} in {:.3f} s".format(
+            count, name if count == 1 else name + " instances", done,
+            time.perf_counter() - start))
+
+    def __save(self):
+        """Save the storage once commit_every changes were made."""
+        self.__unsaved += 1
+        if self.commit_every and self.__unsaved >= self.commit_every:
+            storage.save()
+            self.__unsaved = 0
+
+    def run_batch(self, lines, commit_every=0, stop_on_error=False):
+        """Run commands one after the other and save the storage once.
+
+        The storage is saved at the end, and also every commit_every
+        changes if it is not 0. Lines that are empty or start with "#" are
+        skipped. A command fails when it prints an error message ("** "
+        or "*** ") or raises an exception, which is printed.
+        Args:
+            lines (iterable): The command lines.
+            commit_every (int): The number of changes between saves, 0 to
+                save only at the end.
+            stop_on_error (bool): True to stop at the first failure.
+        Returns:
+            tuple: The number of commands run, the number that failed and
+                the elapsed time in seconds.
+        """
+        commands = errors = 0
+        start = time.perf_counter()
+        out = sys.stdout
+        watch = _ErrorWatch(out)
+        interactive = self.commit_every
+        try:
+            sys.stdout = watch
+            self.commit_every = commit_every
+            for line in lines:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                commands += 1
+                watch.failed = False
+                try:
+                    stop = self.onecmd(self.precmd(line))
+                except Exception as error:
+                    print("*** {}: {}: {}".format(
+                        line, type(error).__name__, error))
+                    stop = False
+                if watch.failed:
+                    errors += 1
+                    stop = stop or stop_on_error
+                if stop:
+                    break
+        finally:
+            sys.stdout = out
+            self.commit_every = interactive
+            storage.flush()
+            self.__unsaved = 0
+        return commands, errors, time.perf_counter() - start
+
+    def do_near(self, arg):
+        """Display the instances within a distance of a point, closest first.
+        
+        Usage: near <class> <latitude> <longitude> <km> or
+               <class>.near(<latitude>, <longitude>, <km>)
+        Args:
+            arg (str): The class name, the point and the radius in km.
+        """
+        args = self.__located_args(arg, 3)
+        if args is not None:
+            print([str(obj) for obj in storage.near(*args).values()])
+
+    def do_nearest(self, arg):
+        """Display the k instances closest to a point.
+        
+        Usage: nearest <class> <latitude> <longitude> [<k>] or
+               <class>.nearest(<latitude>, <longitude>, <k>)
+        k must be a whole number, 0 or more; it defaults to 1.
+        Args:
+            arg (str): The class name, the point and the number wanted.
+        """
+        argl = parse(arg)
+        if len(argl) == 3:
+            argl.append("1")
+        args = self.__located_args(" ".join(argl), 3)
+        if args is not None:
+            cls, lat, lon, k = args
+            if not k.is_integer() or k < 0:
+                print("** invalid arguments **")
+                return
+            print([str(obj) for obj in
+                   storage.nearest(cls, lat, lon, int(k)).values()])
+
+    def do_within(self, arg):
+        """Display the instances inside a bounding box.
+        
+        Usage: within <class> <south> <west> <north> <east> or
+               <class>.within(<south>, <west>, <north>, <east>)
+        Args:
+            arg (str): The class name and the bounds in degrees.
+        """
+        args = self.__located_args(arg, 4)
+        if args is not None:
+            print([str(obj) for obj in storage.within(*args).values()])
+
+    def __located_args(self, arg, count):
+        """Validate the arguments of a spatial query.
+        
+        Args:
+            arg (str): The class name followed by count numbers.
+            count (int): The number of numbers expected.
+        Returns:
+            list: The class name and the numbers, or None after an error.
+        """
+        argl = parse(arg)
+        if len(argl) == 0:
+            print("** class name missing **")
+        elif argl[0] not in HBNBCommand.__classes:
+            print("** class doesn't exist **")
+        elif "latitude" not in storage.attributes().get(argl[0], {}):
+            print("** class has no coordinates **")
+        elif len(argl) != count + 1:
+            print("** coordinates missing **")
+        else:
+            try:
+                return [argl[0]] + [float(value) for value in argl[1:]]
+            except ValueError:
+                print("** invalid coordinates **")
+        return None
+
+
+class _ErrorWatch:
+    """Text stream noting whether error messages are written through it.
+
+    Attributes:
+        failed (bool): True once a line starting with "**" was written.
+    """
+
+    def __init__(self, stream):
+        """Wrap a text stream.
+        
+        Args:
+            stream (file): The stream written to.
+        """
+        self.__stream = stream
+        self.__line_start = True
+        self.failed = False
+
+    def write(self, text):
+        """Write text to the stream, looking for error messages."""
+        if text:
+            if self.__line_start and text.startswith("**"):
+                self.failed = True
+            elif "\n**" in text:
+                self.failed = True
+            self.__line_start = text.endswith("\n")
+        return self.__stream.write(text)
+
+    def flush(self):
+        """Flush the stream."""
+        self.__stream.flush()
+
+
+def main(argv=None):
+    """Run the console interactively or on a batch of commands.
+    
+    Args:
+        argv (list): The command line arguments, sys.argv[1:] if None.
+    Returns:
+        int: The exit status, 1 if a batch command failed.
+    """
+    parser = argparse.ArgumentParser(description="HBnB console")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="run the commands of FILE (default: stdin)")
+    parser.add_argument("--commit-every", type=int, default=0, metavar="N",
+                        help="in batch mode, save after every N changes")
+    parser.add_argument("--stop-on-error", action="store_true",
+                        help="in batch mode, stop at the first failure")
+    args = parser.parse_args(argv)
+    console = HBNBCommand()
+    if args.batch is None:
+        console.cmdloop()
+        return 0
+    if args.batch == "-":
+        result = console.run_batch(sys.stdin, args.commit_every,
+                                   args.stop_on_error)
+    else:
+        with open(args.batch, encoding="utf-8") as f:
+            result = console.run_batch(f, args.commit_every,
+                                       args.stop_on_error)
+    commands, errors, seconds = result
+    rate = commands / seconds if seconds else float("inf")
+    print("{} commands, {} errors in {:.3f} s ({:,.0f} commands/s)".format(
+        commands, errors, seconds, rate), file=sys.stderr)
+    return 1 if errors else 0
 
-        if len(argl) == 4:
-            obj = objdict["{}.{}".format(argl[0], argl[1])]
-            if argl[2] in obj.__class__.__dict__.keys():
-                valtype = type(obj.__class__.__dict__[argl[2]])
-                obj.__dict__[argl[2]] = valtype(argl[3])
-            else:
-                obj.__dict__[argl[2]] = argl[3]
-        elif type(eval(argl[2])) == dict:
-            obj = objdict["{}.{}".format(argl[0], argl[1])]
-            for k, v in eval(argl[2]).items():
-                if (k in obj.__class__.__dict__.keys() and
-                        type(obj.__class__.__dict__[k]) in {str, int, float}):
-                    valtype = type(obj.__class__.__dict__[k])
-                    obj.__dict__[k] = valtype(v)
-                else:
-                    obj.__dict__[k] = v
-        storage.save()
 
 if __name__ == "__main__":
-    HBNBCommand().cmdloop()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -28,9 +28,11 @@ class BaseModel:
         if kwargs:
             # Initialize from keyword arguments
             for key, value in kwargs.items():
+                if key == "__class__":
+                    continue  # The class is already known
                 if key in {"created_at", "updated_at"}:
                     # Convert string dates to datetime objects
-                    value = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+                    value = datetime.fromisoformat(value)
                 setattr(self, key, value)
         else:
             # Default initialization for new instances
@@ -39,6 +41,104 @@ class BaseModel:
             self.updated_at = datetime.now()  # Set the last update time to now
             storage.new(self)  # Register the new instance in storage
 
+    @classmethod
+    def from_dict(cls, obj_dict):
+        """Build an instance from a dictionary made by to_dict().
+
+        This is the fast path used when loading objects: the dictionary is
+        copied straight into the instance __dict__ and the timestamps are
+        parsed with datetime.fromisoformat. The instance is not registered
+        in storage.
+
+        Args:
+            - obj_dict: dictionary of attributes, as returned by to_dict()
+
+        Returns:
+            BaseModel: The new instance.
+        """
+        obj = cls.__new__(cls)
+        attrs = obj.__dict__
+        attrs.update(obj_dict)
+        attrs.pop("__class__", None)
+        for key in ("created_at", "updated_at"):
+            if type(attrs.get(key)) is str:
+                attrs[key] = datetime.fromisoformat(attrs[key])
+        return obj
+
+    @classmethod
+    def from_dicts(cls, obj_dicts):
+        """Build instances in bulk from dictionaries made by to_dict().
+
+        The class of each instance is looked up once per distinct
+        __class__ name; dictionaries without one build instances of cls.
+
+        Args:
+            - obj_dicts: iterable of dictionaries, as returned by to_dict()
+
+        Yields:
+            BaseModel: The new instances, in order.
+        """
+        classes = storage.classes()
+        parse = datetime.fromisoformat
+        new = object.__new__
+        for obj_dict in obj_dicts:
+            klass = classes.get(obj_dict.get("__class__"), cls)
+            obj = new(klass)
+            attrs = obj.__dict__
+            attrs.update(obj_dict)
+            attrs.pop("__class__", None)
+            attrs["created_at"] = parse(attrs["created_at"])
+            attrs["updated_at"] = parse(attrs["updated_at"])
+            yield obj
+
+    @classmethod
+    def create_many(cls, count, attrs=None):
+        """Create and register several instances with the same attributes.
+
+        This is the fast path of bulk creation: the __dict__ of each
+        instance is filled at once and the instance is registered in
+        storage once, instead of once per attribute set.
+
+        Args:
+            - count: number of instances to create
+            - attrs: dictionary of attributes to set on each instance;
+              lists and dictionaries are copied for each one
+
+        Returns:
+            list: The new instances.
+        """
+        attrs = dict(attrs or {})
+        for key in ("id", "created_at", "updated_at", "__class__"):
+            attrs.pop(key, None)
+        mutable = [key for key, value in attrs.items()
+                   if type(value) in (list, dict)]
+        new = object.__new__
+        objs = []
+        for _ in range(count):
+            obj = new(cls)
+            now = datetime.now()
+            fields = obj.__dict__
+            fields["id"] = str(uuid.uuid4())
+            fields["created_at"] = now
+            fields["updated_at"] = now
+            fields.update(attrs)
+            for key in mutable:
+                fields[key] = attrs[key].copy()
+            storage.new(obj)
+            objs.append(obj)
+        return objs
+
+    def __setattr__(self, name, value):
+        """Set an attribute and mark the instance as changed in storage.
+
+        Args:
+            - name: name of the attribute
+            - value: new value of the attribute
+        """
+        storage.changing(self)
+        super().__setattr__(name, value)
+        storage.touch(self, name)
+
     def __str__(self):
         """Return a string representation of the instance.
 
@@ -54,6 +154,7 @@ class BaseModel:
         and then saves the instance to storage.
         """
         self.updated_at = datetime.now()  # Update the last update time to now
+        storage.new(self)  # Mark the instance as changed
         storage.save()  # Save the updated instance in storage
 
     def to_dict(self):
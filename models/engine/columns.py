@@ -0,0 +1,167 @@
+#!/usr/bin/python3
+"""Module for ColumnStore class.
+
+NumPy is used to evaluate predicates over whole columns when it is
+installed. Otherwise each column keeps a sorted order of its rows, built
+on the first query after a change, and the most selective range is found
+by bisection.
+"""
+
+import operator
+from array import array
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Comparison suffixes accepted by FileStorage.find(), e.g. max_guest__ge
+OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+}
+
+
+class ColumnStore:
+    """Numeric attributes of one class held in contiguous typed arrays.
+
+    Every value is stored as a double; values that are not numbers are
+    stored as NaN, which only satisfies "ne" predicates.
+
+    Attributes:
+        fields (tuple): The names of the stored attributes.
+    """
+
+    def __init__(self, fields):
+        """Initializes an empty store.
+
+        Args:
+            fields (iterable): The names of the attributes to store.
+        """
+        self.fields = tuple(fields)
+        self.__columns = {name: array("d") for name in self.fields}
+        self.__keys = []  # row -> key
+        self.__rows = {}  # key -> row
+        self.__orders = {}  # field -> (sorted values, their rows)
+
+    def __len__(self):
+        """Returns the number of stored rows."""
+        return len(self.__keys)
+
+    def add(self, key, obj):
+        """Stores or refreshes the row of an object.
+
+        Args:
+            key (str): The storage key of the object.
+            obj (BaseModel): The object to read the attributes from.
+        """
+        row = self.__rows.get(key)
+        if row is None:
+            row = self.__rows[key] = len(self.__keys)
+            self.__keys.append(key)
+            for column in self.__columns.values():
+                column.append(0.0)
+            self.__orders = {}
+        for name, column in self.__columns.items():
+            try:
+                value = float(getattr(obj, name, "nan"))
+            except (TypeError, ValueError):
+                value = float("nan")
+            if column[row] != value:
+                column[row] = value
+                self.__orders.pop(name, None)
+
+    def discard(self, key):
+        """Removes the row of an object if it is there.
+
+        The last row is moved into the freed slot.
+
+        Args:
+            key (str): The storage key of the object.
+        """
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        last = len(self.__keys) - 1
+        last_key = self.__keys.pop()
+        for column in self.__columns.values():
+            value = column.pop()
+            if row != last:
+                column[row] = value
+        if row != last:
+            self.__keys[row] = last_key
+            self.__rows[last_key] = row
+        self.__orders = {}
+
+    def clear(self):
+        """Removes every row."""
+        for column in self.__columns.values():
+            del column[:]
+        self.__keys = []
+        self.__rows = {}
+        self.__orders = {}
+
+    def select(self, predicates, limit=None):
+        """Returns the keys of the rows matching every predicate.
+
+        Args:
+            predicates (list): (field, operator name, value) triples, the
+                operator name being a key of OPERATORS.
+            limit (float): Without NumPy, the number of rows of the most
+                selective range above which None is returned instead, as
+                checking them one at a time would be slower than a scan.
+
+        Returns:
+            list: The matching keys, in no particular order, or None.
+        """
+        if not predicates or not self.__keys:
+            return list(self.__keys)
+        if numpy is not None:
+            mask = numpy.ones(len(self.__keys), dtype=bool)
+            for name, op, value in predicates:
+                column = numpy.frombuffer(self.__columns[name], dtype=float)
+                mask &= OPERATORS[op](column, value)
+            return [self.__keys[row] for row in numpy.flatnonzero(mask)]
+        rows = None
+        for name, op, value in predicates:
+            if op != "ne":
+                found = self.__range(name, op, value)
+                if rows is None or len(found) < len(rows):
+                    rows, driver = found, (name, op, value)
+        if rows is None:
+            rows, driver = range(len(self.__keys)), None
+        if limit is not None and len(rows) > limit:
+            return None
+        for name, op, value in predicates:
+            if (name, op, value) != driver:
+                column, compare = self.__columns[name], OPERATORS[op]
+                rows = [row for row in rows if compare(column[row], value)]
+        keys = self.__keys
+        return [keys[row] for row in rows]
+
+    def __range(self, name, op, value):
+        """Returns the rows of a column satisfying one comparison."""
+        order = self.__orders.get(name)
+        if order is None:
+            column = self.__columns[name]
+            rows = sorted((row for row in range(len(column))
+                           if column[row] == column[row]),  # Skip NaN
+                          key=column.__getitem__)
+            order = (array("d", (column[row] for row in rows)),
+                     array("q", rows))
+            self.__orders[name] = order
+        values, rows = order
+        if op == "lt":
+            return rows[:bisect_left(values, value)]
+        if op == "le":
+            return rows[:bisect_right(values, value)]
+        if op == "gt":
+            return rows[bisect_right(values, value):]
+        if op == "ge":
+            return rows[bisect_left(values, value):]
+        return rows[bisect_left(values, value):bisect_right(values, value)]
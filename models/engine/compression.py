@@ -0,0 +1,182 @@
+#!/usr/bin/python3
+"""Module for compressed storage files.
+
+Storage files may be compressed with zlib, gzip or lzma (xz) from the
+standard library. Data is compressed and decompressed as a stream, one
+chunk at a time, so neither copy of a whole file is ever held in memory.
+The compression of a file being read is recognized from its first bytes.
+"""
+
+import io
+import lzma
+import zlib
+
+CODECS = ("zlib", "gzip", "lzma")
+CHUNK_SIZE = 1 << 16
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_XZ_MAGIC = b"\xfd7zXZ\x00"
+_WBITS = {"zlib": 15, "gzip": 31}  # zlib container, gzip container
+
+
+def detect(head):
+    """Returns the compression of a file from its first bytes.
+
+    Args:
+        head (bytes): At least the first 6 bytes of the file.
+
+    Returns:
+        str: One of CODECS, or None if the file is not compressed.
+    """
+    if head.startswith(_GZIP_MAGIC):
+        return "gzip"
+    if head.startswith(_XZ_MAGIC):
+        return "lzma"
+    if (len(head) >= 2 and head[0] & 0x0f == 8 and
+            (head[0] << 8 | head[1]) % 31 == 0):
+        return "zlib"
+    return None
+
+
+class CompressedFile(io.RawIOBase):
+    """Binary file compressed or decompressed as it is written or read.
+
+    Attributes:
+        codec (str): One of CODECS, or None for an uncompressed file.
+    """
+
+    def __init__(self, f, mode, codec, level=None, progress=None):
+        """Wraps a binary file.
+
+        Args:
+            f (file): The file, opened in binary mode; it is closed along
+                with this one.
+            mode (str): "r" or "w".
+            codec (str): One of CODECS, or None.
+            level (int): The compression level (lzma preset), or None for
+                the default of the codec.
+            progress (callable): Optional callback receiving the number of
+                bytes read from f so far.
+        """
+        super().__init__()
+        if codec is not None and codec not in CODECS:
+            raise ValueError("Unknown compression: {}".format(codec))
+        self.codec = codec
+        self.__f = f
+        self.__mode = mode
+        self.__progress = progress
+        self.__read = 0
+        if codec is None:
+            self.__engine = None
+        elif mode == "w":
+            if codec == "lzma":
+                self.__engine = lzma.LZMACompressor(
+                    preset=6 if level is None else level)
+            else:
+                self.__engine = zlib.compressobj(
+                    -1 if level is None else level, zlib.DEFLATED,
+                    _WBITS[codec])
+        elif codec == "lzma":
+            self.__engine = lzma.LZMADecompressor()
+        else:
+            self.__engine = zlib.decompressobj(_WBITS[codec])
+
+    def readable(self):
+        """Returns True if the file was opened for reading."""
+        return self.__mode == "r"
+
+    def writable(self):
+        """Returns True if the file was opened for writing."""
+        return self.__mode == "w"
+
+    def __fill(self):
+        """Returns the next chunk of the underlying file."""
+        chunk = self.__f.read(CHUNK_SIZE)
+        self.__count(len(chunk))
+        return chunk
+
+    def __count(self, n):
+        """Adds n to the bytes read and reports the total."""
+        self.__read += n
+        if self.__progress is not None and n:
+            self.__progress(self.__read)
+
+    def readinto(self, b):
+        """Reads up to len(b) uncompressed bytes into b.
+
+        Raises:
+            EOFError: If the compressed stream is truncated.
+        """
+        engine = self.__engine
+        if engine is None:
+            n = self.__f.readinto(b)
+            self.__count(n)
+            return n
+        while not engine.eof:
+            if self.codec == "lzma":
+                source = self.__fill() if engine.needs_input else b""
+                if engine.needs_input and not source:
+                    raise EOFError("Truncated compressed file")
+            else:
+                source = engine.unconsumed_tail or self.__fill()
+                if not source:
+                    raise EOFError("Truncated compressed file")
+            data = engine.decompress(source, len(b))
+            if data:
+                b[:len(data)] = data
+                return len(data)
+        return 0
+
+    def write(self, b):
+        """Compresses and writes b; returns its length."""
+        if self.__engine is None:
+            self.__f.write(b)
+        else:
+            self.__f.write(self.__engine.compress(bytes(b)))
+        return len(b)
+
+    def close(self):
+        """Writes what remains of the compressed stream and closes."""
+        if self.closed:
+            return
+        try:
+            if self.__mode == "w" and self.__engine is not None:
+                self.__f.write(self.__engine.flush())
+        finally:
+            self.__f.close()
+            super().close()
+
+
+def open_file(path, mode="r", codec=None, level=None, progress=None):
+    """Opens a possibly compressed file as a buffered binary stream.
+
+    Args:
+        path (str): The path of the file.
+        mode (str): "r" to read, the compression being detected, or "w"
+            to write.
+        codec (str): When writing, one of CODECS, or None not to compress.
+        level (int): When writing, the compression level, or None.
+        progress (callable): When reading, optional callback receiving
+            the number of bytes read from the file so far.
+
+    Returns:
+        file: A binary file object.
+    """
+    f = open(path, mode + "b")
+    try:
+        if mode == "r":
+            head = f.read(len(_XZ_MAGIC))
+            f.seek(0)
+            codec = detect(head)
+            if codec is None and progress is None:
+                return f
+            return io.BufferedReader(
+                CompressedFile(f, "r", codec, progress=progress),
+                CHUNK_SIZE)
+        if codec is None:
+            return f
+        return io.BufferedWriter(CompressedFile(f, "w", codec, level),
+                                 CHUNK_SIZE)
+    except BaseException:
+        f.close()
+        raise
@@ -0,0 +1,557 @@
+#!/usr/bin/python3
+"""Module for DBStorage class."""
+
+import contextlib
+import datetime
+import json
+import math
+import os
+import sqlite3
+from models.engine.columns import OPERATORS
+from models.engine.file_storage import FileStorage
+from models.engine.geo import (EARTH_RADIUS_KM, KM_PER_DEGREE, bounding_box,
+                               distance)
+
+# Column types by attribute type, and SQL operators by find() suffix
+SQL_TYPES = {
+    str: "TEXT",
+    int: "INTEGER",
+    float: "REAL",
+    list: "TEXT",
+    datetime.datetime: "TEXT"
+}
+SQL_OPERATORS = {"eq": "=", "ne": "!=", "lt": "<", "le": "<=", "gt": ">",
+                 "ge": ">="}
+EXTRA = "__extra"  # Column holding the attributes outside of the schema
+
+
+class DBStorage:
+    """Class for persistence of base classes in a SQLite database.
+
+    It offers the same interface as FileStorage. Objects are read from the
+    database when they are asked for and kept in an identity map, so every
+    lookup of the same row returns the same instance. Changes are written
+    row by row and committed by save(), or by commit() inside a
+    transaction.
+    """
+
+    # Private class attributes for database path and object storage
+    __db_path = os.getenv("HBNB_DB_PATH", "file.db")
+    __connection = None
+    __objects = {}  # Identity map of the loaded and new objects by key
+    __pending = {}  # key -> object to write, or None for a deletion
+    __dirty = {}  # key -> "created", "modified" or "deleted" until save()
+    __schemas = None  # class name -> [(column, attribute type)]
+    __transaction = False  # True between begin() and commit() or rollback()
+
+    def all(self, cls=None):
+        """Returns a dictionary of all objects, or of one class.
+
+        Args:
+            cls (type or str): Optional class (or class name) to filter on.
+
+        Returns:
+            dict: A new dictionary of the stored objects by key.
+        """
+        objects = {}
+        for name in self.__names(cls):
+            if name in self.__tables():
+                objects.update(self.__select(name, "ORDER BY rowid", ()))
+        return objects
+
+    def count(self, cls=None):
+        """Returns the number of stored objects, or of one class.
+
+        Args:
+            cls (type or str): Optional class (or class name) to count.
+
+        Returns:
+            int: The number of objects.
+        """
+        self.__flush()
+        return sum(self.__execute('SELECT COUNT(*) FROM "{}"'.format(name))
+                   .fetchone()[0] for name in self.__names(cls)
+                   if name in self.__tables())
+
+    def page(self, cls=None, limit=None, offset=0, after=None):
+        """Returns a page of the objects, or of the objects of one class.
+
+        The objects come in the order of all(). Only the rows of the page
+        are read: the position of after, the offset and the limit are
+        part of the query of each table.
+
+        Args:
+            cls (type or str): Optional class (or class name) to filter on.
+            limit (int): The maximum number of objects, None for all.
+            offset (int): The number of objects to skip.
+            after (str): The id of the object the page starts after, or
+                None to start from the first.
+
+        Returns:
+            dict: The objects of the page by key.
+
+        Raises:
+            KeyError: If no object has the id after.
+        """
+        self.__flush()
+        names = [name for name in self.__names(cls) if name in self.__tables()]
+        start = 0  # The rowid the page starts after, in names[0]
+        if after is not None:
+            for i, name in enumerate(names):
+                row = self.__execute('SELECT rowid FROM "{}" WHERE "id" = ?'
+                                     .format(name), (after,)).fetchone()
+                if row is not None:
+                    names, start = names[i:], row[0]
+                    break
+            else:
+                raise KeyError(after)
+        objects = {}
+        for name in names:
+            if limit is not None and len(objects) >= limit:
+                break
+            if offset:
+                rows = self.__execute('SELECT COUNT(*) FROM "{}" WHERE rowid '
+                                      '> ?'.format(name), (start,)).fetchone()
+                if offset >= rows[0]:
+                    offset, start = offset - rows[0], 0
+                    continue
+            rest = -1 if limit is None else limit - len(objects)
+            objects.update(self.__select(
+                name, "WHERE rowid > ? ORDER BY rowid LIMIT ? OFFSET ?",
+                (start, rest, offset)))
+            offset, start = 0, 0
+        return objects
+
+    def get(self, cls, id):
+        """Returns one object by class and id.
+
+        Args:
+            cls (type or str): The class (or class name) of the object.
+            id (str): The id of the object.
+
+        Returns:
+            BaseModel: The object, or None if there is none.
+        """
+        name = self.__names(cls)[0]
+        key = "{}.{}".format(name, id)
+        if key in DBStorage.__objects:
+            return DBStorage.__objects[key]
+        if name not in self.__tables():
+            return None
+        return self.__select(name, 'WHERE "id" = ?', (id,)).get(key)
+
+    def find(self, cls, /, **filters):
+        """Returns the objects of a class whose attributes match filters.
+
+        Filters use the syntax of FileStorage.find(). Those on schema
+        columns become an indexed WHERE clause; the others are checked on
+        the loaded objects.
+
+        Args:
+            cls (type or str): The class (or class name) to search.
+            **filters: The conditions the attributes must satisfy.
+
+        Returns:
+            dict: The matching objects by key.
+        """
+        name = self.__names(cls)[0]
+        if name not in self.__tables():
+            return {}
+        columns = dict(self.__tables()[name])
+        conditions, params = [], []
+        for attr, op, value in self.__predicates(filters):
+            if attr in columns and columns[attr] is not list:
+                sql, param = self.__condition(name, attr, op, value)
+                conditions.append(sql)
+                params.extend(param)
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return self.__matching(self.__select(name, where, params), filters)
+
+    def near(self, cls, latitude, longitude, km):
+        """Returns the objects of a class within a distance of a point.
+
+        Args:
+            cls (type or str): The class (or class name) to search.
+            latitude (float): The latitude of the center, in degrees.
+            longitude (float): The longitude of the center, in degrees.
+            km (float): The radius, in kilometers.
+
+        Returns:
+            dict: The matching objects by key, closest first.
+        """
+        found = []
+        for key, obj in self.within(
+                cls, *bounding_box(latitude, longitude, km)).items():
+            d = distance(latitude, longitude, obj.latitude, obj.longitude)
+            if d <= km:
+                found.append((d, key, obj))
+        found.sort(key=lambda match: match[:2])
+        return {key: obj for d, key, obj in found}
+
+    def nearest(self, cls, latitude, longitude, k=1):
+        """Returns the k objects of a class closest to a point.
+
+        Args:
+            cls (type or str): The class (or class name) to search.
+            latitude (float): The latitude of the center, in degrees.
+            longitude (float): The longitude of the center, in degrees.
+            k (int): The number of objects wanted.
+
+        Returns:
+            dict: The matching objects by key, closest first.
+        """
+        km = 0.1 * KM_PER_DEGREE
+        while k > 0:
+            found = self.near(cls, latitude, longitude, km)
+            if len(found) >= k or km >= math.pi * EARTH_RADIUS_KM:
+                return dict(list(found.items())[:k])
+            km *= 2
+        return {}
+
+    def within(self, cls, south, west, north, east):
+        """Returns the objects of a class inside a bounding box.
+
+        Args:
+            cls (type or str): The class (or class name) to search.
+            south (float): The minimum latitude.
+            west (float): The western longitude; greater than east when the
+                box crosses the antimeridian.
+            north (float): The maximum latitude.
+            east (float): The eastern longitude.
+
+        Returns:
+            dict: The matching objects by key.
+
+        Raises:
+            KeyError: If the class has no coordinates.
+        """
+        name = self.__names(cls)[0]
+        if "latitude" not in dict(self.__tables().get(name, ())):
+            raise KeyError(name)
+        filters = {"latitude__ge": south, "latitude__le": north}
+        if west <= east:
+            filters.update(longitude__ge=west, longitude__le=east)
+            return self.find(name, **filters)
+        found = self.find(name, longitude__ge=west, **filters)
+        found.update(self.find(name, longitude__le=east, **filters))
+        return found
+
+    def add_index(self, cls, attr):
+        """Declares an index on a column of a class table.
+
+        Args:
+            cls (type or str): The class (or class name) to index.
+            attr (str): The attribute to index.
+        """
+        name = self.__names(cls)[0]
+        self.__execute('CREATE INDEX IF NOT EXISTS "ix_{0}_{1}" '
+                       'ON "{0}" ("{1}")'.format(name, attr))
+
+    def new(self, obj):
+        """Adds a new object to the storage.
+
+        Args:
+            obj (BaseModel): The object to add to the storage.
+        """
+        key = "{}.{}".format(type(obj).__name__, obj.id)
+        if DBStorage.__dirty.get(key) != "created":
+            DBStorage.__dirty[key] = ("modified" if key in DBStorage.__objects
+                                      else "created")
+        DBStorage.__objects[key] = obj
+        DBStorage.__pending[key] = obj
+
+    def delete(self, obj=None):
+        """Removes an object from the storage.
+
+        Args:
+            obj (BaseModel): The object to remove. Nothing happens if None.
+        """
+        if obj is None:
+            return
+        key = "{}.{}".format(type(obj).__name__, obj.id)
+        DBStorage.__objects.pop(key, None)
+        DBStorage.__pending[key] = None
+        DBStorage.__dirty[key] = "deleted"
+
+    def touch(self, obj, attr=None):
+        """Marks a loaded object as modified.
+
+        Args:
+            obj (BaseModel): The object that changed.
+            attr (str): The attribute that changed, or None if unknown.
+        """
+        key = "{}.{}".format(type(obj).__name__, obj.__dict__.get("id"))
+        if key in DBStorage.__objects:
+            DBStorage.__pending[key] = obj
+            DBStorage.__dirty.setdefault(key, "modified")
+
+    def dirty(self):
+        """Returns the keys changed since the last save.
+
+        Returns:
+            dict: The state of each changed key: "created", "modified" or
+                "deleted".
+        """
+        return dict(DBStorage.__dirty)
+
+    def changing(self, obj):
+        """Notes that an object is about to change; nothing to do here.
+
+        rollback() reads the objects again from the database instead.
+
+        Args:
+            obj (BaseModel): The object about to change.
+        """
+
+    def begin(self):
+        """Saves the pending changes and starts a transaction.
+
+        Until commit(), save() only sends the changes to the database.
+
+        Raises:
+            RuntimeError: If a transaction is already open.
+        """
+        if DBStorage.__transaction:
+            raise RuntimeError("A transaction is already open")
+        self.save()
+        DBStorage.__transaction = True
+
+    def commit(self):
+        """Ends the transaction and commits its changes.
+
+        Raises:
+            RuntimeError: If no transaction is open.
+        """
+        if not DBStorage.__transaction:
+            raise RuntimeError("No transaction is open")
+        DBStorage.__transaction = False
+        self.save()
+
+    def rollback(self):
+        """Ends the transaction, undoing its changes.
+
+        The loaded objects are forgotten, so they are read again as they
+        were before begin().
+
+        Raises:
+            RuntimeError: If no transaction is open.
+        """
+        if not DBStorage.__transaction:
+            raise RuntimeError("No transaction is open")
+        DBStorage.__transaction = False
+        self.__connect().rollback()
+        DBStorage.__objects = {}
+        DBStorage.__pending = {}
+        DBStorage.__dirty = {}
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Runs a block in a transaction.
+
+        The changes are committed when the block ends, or rolled back if
+        it raises.
+
+        Yields:
+            DBStorage: The storage.
+        """
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    def save(self):
+        """Writes the pending changes and commits them.
+
+        Inside a transaction they are written but not committed.
+        """
+        self.__flush()
+        if not DBStorage.__transaction:
+            self.__connect().commit()
+            DBStorage.__dirty = {}
+
+    def flush(self):
+        """Writes the pending changes at once; the same as save()."""
+        self.save()
+
+    def reload(self):
+        """Opens the database, creating or extending the tables.
+
+        No object is read until it is asked for. An open transaction is
+        rolled back.
+        """
+        if DBStorage.__transaction:
+            self.rollback()
+        self.close()
+        connection = self.__connect()
+        for name, columns in self.__tables().items():
+            connection.execute('CREATE TABLE IF NOT EXISTS "{}" ("id" TEXT '
+                               'PRIMARY KEY)'.format(name))
+            existing = {row[1] for row in connection.execute(
+                'PRAGMA table_info("{}")'.format(name))}
+            for column, kind in columns + [(EXTRA, str)]:
+                if column not in existing:
+                    connection.execute('ALTER TABLE "{}" ADD COLUMN "{}" {}'
+                                       .format(name, column, SQL_TYPES[kind]))
+            for column, kind in columns:
+                if column.endswith("_id") or column == "latitude":
+                    self.add_index(name, column)
+        connection.commit()
+        DBStorage.__objects = {}
+        DBStorage.__pending = {}
+        DBStorage.__dirty = {}
+
+    def close(self):
+        """Commits and closes the database connection, if open."""
+        if DBStorage.__connection is not None:
+            DBStorage.__connection.commit()
+            DBStorage.__connection.close()
+            DBStorage.__connection = None
+
+    def classes(self):
+        """Returns a dictionary of valid classes and their references.
+
+        Returns:
+            dict: A dictionary mapping class names to class references.
+        """
+        return FileStorage().classes()
+
+    def attributes(self):
+        """Returns the valid attributes and their types for each class.
+
+        Returns:
+            dict: A dictionary mapping class names to their valid attributes and types.
+        """
+        return FileStorage().attributes()
+
+    def __connect(self):
+        """Returns the database connection, opening it if needed."""
+        if DBStorage.__connection is None:
+            connection = sqlite3.connect(DBStorage.__db_path,
+                                         check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            DBStorage.__connection = connection
+        return DBStorage.__connection
+
+    def __execute(self, sql, params=()):
+        """Runs one statement and returns its cursor."""
+        return self.__connect().execute(sql, params)
+
+    def __tables(self):
+        """Returns the columns of each class table from attributes()."""
+        if DBStorage.__schemas is None:
+            attributes = self.attributes()
+            base = list(attributes["BaseModel"].items())
+            DBStorage.__schemas = {
+                name: base + [(attr, kind) for attr, kind in attrs.items()
+                              if attr not in attributes["BaseModel"]]
+                for name, attrs in attributes.items()}
+        return DBStorage.__schemas
+
+    def __names(self, cls):
+        """Returns the class names designated by cls (all when None)."""
+        if cls is None:
+            return list(self.__tables())
+        return [cls if isinstance(cls, str) else cls.__name__]
+
+    def __flush(self):
+        """Sends the pending changes to the database, uncommitted."""
+        pending, DBStorage.__pending = DBStorage.__pending, {}
+        tables = self.__tables()
+        for key, obj in pending.items():
+            name, _, id = key.partition(".")
+            if obj is None:
+                self.__execute('DELETE FROM "{}" WHERE "id" = ?'.format(name),
+                               (id,))
+                continue
+            columns = tables[name]
+            values = obj.to_dict()
+            del values["__class__"]
+            row = []
+            for column, kind in columns:
+                value = values.get(column)
+                if kind is list and type(value) is list:
+                    row.append(json.dumps(values.pop(column)))
+                elif type(value) is kind or (kind is datetime.datetime and
+                                             type(value) is str):
+                    row.append(values.pop(column))
+                else:
+                    row.append(None)  # Unset, or kept in EXTRA as it is
+            row.append(json.dumps(values) if values else None)
+            names = [column for column, kind in columns] + [EXTRA]
+            # Updated in place, so that rows keep their rowid and order
+            self.__execute('INSERT INTO "{}" ({}) VALUES ({}) ON CONFLICT '
+                           '("id") DO UPDATE SET {}'.format(
+                               name, ", ".join(
+                                   '"{}"'.format(n) for n in names),
+                               ", ".join("?" * len(names)),
+                               ", ".join('"{0}" = excluded."{0}"'.format(n)
+                                         for n in names if n != "id")), row)
+
+    def __select(self, name, where, params):
+        """Returns the objects of the rows of a table matching a clause."""
+        self.__flush()
+        columns = self.__tables()[name] + [(EXTRA, str)]
+        cursor = self.__execute('SELECT {} FROM "{}" {}'.format(
+            ", ".join('"{}"'.format(column) for column, kind in columns),
+            name, where), params)
+        cls = self.classes()[name]
+        objects = {}
+        for row in cursor:
+            key = "{}.{}".format(name, row[0])
+            obj = DBStorage.__objects.get(key)
+            if obj is None:
+                values = {}
+                for (column, kind), value in zip(columns, row):
+                    if value is None:
+                        continue
+                    if column == EXTRA:
+                        values.update(json.loads(value))
+                    elif kind is list:
+                        values[column] = json.loads(value)
+                    else:
+                        values[column] = value
+                obj = DBStorage.__objects[key] = cls.from_dict(values)
+            objects[key] = obj
+        return objects
+
+    def __predicates(self, filters):
+        """Returns the (attribute, operator, value) triples of filters."""
+        predicates = []
+        for name, value in filters.items():
+            attr, sep, op = name.rpartition("__")
+            if not sep or op not in OPERATORS:
+                attr, op = name, "eq"
+            predicates.append((attr, op, value))
+        return predicates
+
+    def __condition(self, name, column, op, value):
+        """Returns the SQL condition of a predicate and its parameters.
+
+        A NULL column stands for the class default, so NULL rows also match
+        when the default satisfies the predicate.
+        """
+        sql = '"{}" {} ?'.format(column, SQL_OPERATORS[op])
+        default = getattr(self.classes()[name], column, None)
+        try:
+            if default is not None and OPERATORS[op](default, value):
+                sql = '({} OR "{}" IS NULL)'.format(sql, column)
+        except TypeError:
+            pass
+        return sql, [value]
+
+    def __matching(self, objects, filters):
+        """Returns the objects satisfying every filter."""
+        predicates = self.__predicates(filters)
+        matches = {}
+        for key, obj in objects.items():
+            try:
+                if all(OPERATORS[op](getattr(obj, attr, None), value)
+                       for attr, op, value in predicates):
+                    matches[key] = obj
+            except TypeError:
+                continue  # Values that cannot be compared never match
+        return matches
@@ -1,9 +1,27 @@
 #!/usr/bin/python3
 """Module for FileStorage class."""
 
+import atexit
+import contextlib
 import datetime
 import json
 import os
+import shutil
+import sys
+import threading
+import time
+import weakref
+from models.engine import formats, records, shards
+from models.engine.columns import OPERATORS, ColumnStore
+from models.engine.geo import GridIndex
+from models.engine.index import AttributeIndex
+from models.engine.lazy import LazyObjects, Raw, resolve, to_dict
+from models.engine.order import KeyOrder
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 class FileStorage:
     """Class for serialization and deserialization of base classes."""
@@ -12,13 +30,435 @@ class FileStorage:
     __file_path = "file.json"
     __objects = {}
 
-    def all(self):
-        """Returns the dictionary of all objects.
-        
+    # Objects partitioned by class name, rebuilt whenever __objects is
+    # replaced or changed behind the storage's back
+    __by_class = {}
+    __partitioned = None
+    __partitioned_len = 0
+
+    # Order of the keys by class name (None for every class), built by
+    # page() and kept by new() and delete() until the partitions are rebuilt
+    __orders = {}
+
+    # Secondary indexes by class name and attribute; None until first use,
+    # then every "*_id" attribute listed in attributes() is indexed
+    __indexes = None
+
+    # Numeric attributes by class name in typed arrays, built with the
+    # indexes for every class that has int or float attributes
+    __columns = None
+
+    # Share of the rows of a class above which find() scans the objects
+    # rather than checking a range of the column store row by row
+    __column_share = 0.5
+
+    # Spatial grids by class name, for classes with latitude and longitude
+    __grids = None
+
+    # Indexes, column store and grid of each class by attribute they read
+    __watched = {}
+
+    # Journaled mode: mutations are appended to __journal_path and folded
+    # back into __file_path once more than __journal_limit records exist
+    __journal_path = "file.json.journal"
+    __journal = os.getenv("HBNB_STORAGE_JOURNAL", "") == "1"
+    __journal_limit = int(os.getenv("HBNB_JOURNAL_LIMIT", "1000"))
+    __journal_records = 0
+
+    # Dirty tracking: state of each key changed since the last save, and
+    # every object as last encoded to __file_path
+    __dirty = {}
+    __encoded = {}
+    __encoded_for = None
+    __encoded_as = None
+
+    # Keys encoded with list or dictionary attributes, which can change in
+    # place without marking the key dirty: they are encoded again and
+    # compared on every save
+    __encoded_mutable = set()
+
+    # File format of the snapshots written by save(): "json", "binary" or
+    # "records"; reload() reads any of them, whatever this is set to
+    __format = os.getenv("HBNB_STORAGE_FORMAT", "json")
+    __formats = {}
+
+    # Record format: __file_path keeps each object in its own record,
+    # found through the index __file_path + ".index". reload() only reads
+    # the index and each object is read the first time it is accessed;
+    # save() rewrites only the records of the dirty keys
+    __records = None
+
+    # Compression of the snapshots written by save(): None, "zlib", "gzip"
+    # or "lzma", at __compression_level (None for the codec default);
+    # reload() recognizes compressed files whatever this is set to
+    __compression = os.getenv("HBNB_STORAGE_COMPRESSION") or None
+    __compression_level = (int(os.getenv("HBNB_COMPRESSION_LEVEL"))
+                           if os.getenv("HBNB_COMPRESSION_LEVEL") else None)
+
+    # Write-behind mode: save() only schedules a flush. A background thread
+    # flushes __flush_interval seconds after the first unsaved change, which
+    # bounds the changes lost on a crash, or at once when __flush_size keys
+    # are dirty; every mutation holds __lock so a flush sees a stable state
+    __write_behind = os.getenv("HBNB_STORAGE_WRITE_BEHIND", "") == "1"
+    __flush_interval = float(os.getenv("HBNB_FLUSH_INTERVAL", "1.0"))
+    __flush_size = int(os.getenv("HBNB_FLUSH_SIZE", "10000"))
+    __lock = threading.RLock()
+    __scheduled = threading.Condition(__lock)
+    __pending = False
+    __flusher = None
+
+    # Shared mode: several processes use the same files. Writers hold an
+    # exclusive lock on __file_path + ".lock" and merge what others wrote
+    # first; __seen is the stat signature of the files when last read or
+    # written, so a changed signature means another process wrote them;
+    # __replaced holds the objects a reload replaced, which touch() stores
+    # again when they change
+    __shared = os.getenv("HBNB_STORAGE_SHARED", "") == "1"
+    __seen = None
+    __replaced = weakref.WeakSet()
+
+    # Sharded layout: each class is saved to its own file in the directory
+    # __file_path + ".shards", split in __shard_partitions files by a hash
+    # of the key; reload() reads the shards in this process, or decodes
+    # them with __reload_workers processes if more than 1 (one per CPU if
+    # 0), and converts the other layout if needed
+    __sharded = os.getenv("HBNB_STORAGE_SHARDS", "") == "1"
+    __shard_partitions = int(os.getenv("HBNB_SHARD_PARTITIONS", "1"))
+    __reload_workers = int(os.getenv("HBNB_RELOAD_WORKERS", "1"))
+    __shard_keys = {}  # (class name, partition) -> keys, as last written
+
+    # Lazy mode: reload() only keeps the serialized objects and each one is
+    # built the first time it is read
+    __lazy = os.getenv("HBNB_STORAGE_LAZY", "") == "1"
+
+    # Compact mode: attribute names and the ids that objects share (foreign
+    # keys, amenity_ids) are interned as objects are loaded
+    __compact = os.getenv("HBNB_STORAGE_COMPACT", "") == "1"
+    __shared_fields = None
+
+    # Class table, resolved on the first call to classes()
+    __classes = None
+
+    # Transaction: None, or the state before begin() of each key changed
+    # since, as (object, copy of its attributes) or None for a key that did
+    # not exist; save() waits for commit(), rollback() puts them back
+    __undo = None
+    __undo_dirty = None
+
+    def all(self, cls=None):
+        """Returns the dictionary of all objects, or of one class.
+
+        Args:
+            cls (type or str): Optional class (or class name) to filter on.
+                The filtered dictionary is shared and must not be modified.
+
+        Returns:
+            dict: The dictionary containing the stored objects.
+        """
+        if FileStorage.__shared:
+            self.refresh()
+        if cls is None:
+            return FileStorage.__objects
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return self.__partitions().get(cls, {})
+
+    def count(self, cls=None):
+        """Returns the number of stored objects, or of one class.
+
+        Args:
+            cls (type or str): Optional class (or class name) to count.
+
+        Returns:
+            int: The number of objects.
+        """
+        return len(self.all(cls))
+
+    def page(self, cls=None, limit=None, offset=0, after=None):
+        """Returns a page of the objects, or of the objects of one class.
+
+        The objects come in the order of all(), starting offset objects
+        after the first one, or after the object of id after. The order of
+        the keys is kept between calls, so the start of the page is found
+        by bisection and only the objects of the page are read.
+
+        Args:
+            cls (type or str): Optional class (or class name) to filter on.
+            limit (int): The maximum number of objects, None for all.
+            offset (int): The number of objects to skip.
+            after (str): The id of the object the page starts after, or
+                None to start from the first.
+
+        Returns:
+            dict: The objects of the page by key.
+
+        Raises:
+            KeyError: If no object has the id after.
+        """
+        objects = self.all(cls)
+        if cls is not None and not isinstance(cls, str):
+            cls = cls.__name__
+        with FileStorage.__lock:
+            partitions = self.__partitions()
+            order = FileStorage.__orders.get(cls)
+            if order is None:
+                order = FileStorage.__orders[cls] = KeyOrder(objects)
+            if after is not None:
+                names = partitions if cls is None else (cls,)
+                key = next((name + "." + after for name in names
+                            if name + "." + after in objects), None)
+                if key is None:
+                    raise KeyError(after)
+                after = key
+            keys = order.page(offset, limit, after)
+        return {key: objects[key] for key in keys}
+
+    def get(self, cls, id):
+        """Returns one object by class and id.
+
+        Args:
+            cls (type or str): The class (or class name) of the object.
+            id (str): The id of the object.
+
+        Returns:
+            BaseModel: The object, or None if there is none.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        if FileStorage.__shared:
+            self.refresh()
+        return FileStorage.__objects.get("{}.{}".format(cls, id))
+
+    def find(self, cls, /, **filters):
+        """Returns the objects of a class whose attributes match filters.
+
+        A filter is either attr=value or attr__op=value, op being one of
+        eq, ne, lt, le, gt and ge. When every filter compares a numeric
+        attribute with a number, the column store narrows the candidates in one batch,
+        unless its best range holds most of the class. Otherwise the most
+        selective equality index narrows them, or every object of the
+        class is scanned. The candidates are then checked one by one.
+
+        Args:
+            cls (type or str): The class (or class name) to search.
+            **filters: The conditions the attributes must satisfy.
+
         Returns:
-            dict: The dictionary containing all stored objects.
+            dict: The matching objects by key.
         """
-        return FileStorage.__objects
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        predicates = []
+        for name, value in filters.items():
+            attr, sep, op = name.rpartition("__")
+            if not sep or op not in OPERATORS:
+                attr, op = name, "eq"
+            predicates.append((attr, op, value))
+        candidates = objects = self.all(cls)
+        self.__build_structures()
+        store = FileStorage.__columns.get(cls)
+        if store is not None and predicates and all(
+                attr in store.fields and isinstance(value, (int, float))
+                for attr, op, value in predicates):
+            # The store narrows the candidates, which are checked below;
+            # other values (strings, None) cannot be compared in its arrays
+            selected = store.select(
+                predicates, len(objects) * FileStorage.__column_share)
+            if selected is not None:
+                candidates = selected
+        indexes = FileStorage.__indexes.get(cls, {})
+        for attr, op, value in predicates:
+            if op == "eq" and attr in indexes:
+                found = indexes[attr].lookup(value)
+                if len(found) < len(candidates):
+                    candidates = found
+        checks = [(attr, OPERATORS[op], value)
+                  for attr, op, value in predicates]
+        matches = {}
+        for key in candidates:
+            obj = objects[key]
+            try:
+                for attr, compare, value in checks:
+                    if not compare(getattr(obj, attr, None), value):
+                        break
+                else:
+                    matches[key] = obj
+            except TypeError:
+                continue  # Values that cannot be compared never match
+        return matches
+
+    def near(self, cls, latitude, longitude, km):
+        """Returns the objects of a class within a distance of a point.
+
+        Args:
+            cls (type or str): The class (or class name) to search.
+            latitude (float): The latitude of the center, in degrees.
+            longitude (float): The longitude of the center, in degrees.
+            km (float): The radius, in kilometers.
+
+        Returns:
+            dict: The matching objects by key, closest first.
+        """
+        return self.__located(cls, lambda grid: [
+            key for d, key in grid.near(latitude, longitude, km)])
+
+    def nearest(self, cls, latitude, longitude, k=1):
+        """Returns the k objects of a class closest to a point.
+
+        Args:
+            cls (type or str): The class (or class name) to search.
+            latitude (float): The latitude of the center, in degrees.
+            longitude (float): The longitude of the center, in degrees.
+            k (int): The number of objects wanted.
+
+        Returns:
+            dict: The matching objects by key, closest first.
+        """
+        return self.__located(cls, lambda grid: [
+            key for d, key in grid.nearest(latitude, longitude, k)])
+
+    def within(self, cls, south, west, north, east):
+        """Returns the objects of a class inside a bounding box.
+
+        Args:
+            cls (type or str): The class (or class name) to search.
+            south (float): The minimum latitude.
+            west (float): The western longitude; greater than east when the
+                box crosses the antimeridian.
+            north (float): The maximum latitude.
+            east (float): The eastern longitude.
+
+        Returns:
+            dict: The matching objects by key.
+        """
+        return self.__located(cls, lambda grid: grid.within(
+            south, west, north, east))
+
+    def __located(self, cls, query):
+        """Runs a query on the spatial grid of a class.
+
+        Raises:
+            KeyError: If the class has no coordinates.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        objects = self.all(cls)
+        self.__build_structures()
+        grid = FileStorage.__grids[cls]
+        return {key: objects[key] for key in query(grid)}
+
+    def add_index(self, cls, attr):
+        """Declares a secondary index on an attribute of a class.
+
+        Args:
+            cls (type or str): The class (or class name) to index.
+            attr (str): The attribute to index.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__build_structures()
+        indexes = FileStorage.__indexes.setdefault(cls, {})
+        if attr not in indexes:
+            index = indexes[attr] = AttributeIndex(attr)
+            FileStorage.__watched.setdefault(cls, {}).setdefault(
+                attr, []).append(index)
+            for key, obj in dict.items(self.all(cls)):
+                index.add(key, obj)
+
+    def __build_structures(self):
+        """Creates the default indexes and column stores on first use."""
+        if FileStorage.__indexes is None:
+            attributes = self.attributes()
+            FileStorage.__indexes = {
+                cls: {attr: AttributeIndex(attr) for attr in attrs
+                      if attr.endswith("_id")}
+                for cls, attrs in attributes.items()}
+            FileStorage.__columns = {}
+            for cls, attrs in attributes.items():
+                fields = [attr for attr, kind in attrs.items()
+                          if kind in (int, float)]
+                if fields:
+                    FileStorage.__columns[cls] = ColumnStore(fields)
+            FileStorage.__grids = {
+                cls: GridIndex() for cls, attrs in attributes.items()
+                if "latitude" in attrs and "longitude" in attrs}
+            FileStorage.__watched = {}
+            for cls in attributes:
+                watched = FileStorage.__watched[cls] = {}
+                for attr, index in FileStorage.__indexes[cls].items():
+                    watched.setdefault(attr, []).append(index)
+                if cls in FileStorage.__columns:
+                    for attr in FileStorage.__columns[cls].fields:
+                        watched.setdefault(attr, []).append(
+                            FileStorage.__columns[cls])
+                if cls in FileStorage.__grids:
+                    for attr in ("latitude", "longitude"):
+                        watched.setdefault(attr, []).append(
+                            FileStorage.__grids[cls])
+            FileStorage.__partitioned = None  # Fill them on the next sync
+        self.__partitions()
+
+    def __structures(self, name):
+        """Returns the indexes and column store maintained for a class."""
+        structures = list((FileStorage.__indexes or {}).get(name, {}).values())
+        for extra in (FileStorage.__columns, FileStorage.__grids):
+            structure = (extra or {}).get(name)
+            if structure is not None:
+                structures.append(structure)
+        return structures
+
+    def __partitions(self):
+        """Returns the objects partitioned by class name, in sync."""
+        objects = FileStorage.__objects
+        if (FileStorage.__partitioned is not objects or
+                FileStorage.__partitioned_len != len(objects)):
+            by_class = {}
+            partition = type(objects)
+            # Placeholders stay as they are: the class is part of the key
+            for key, obj in dict.items(objects):
+                name = key.partition(".")[0]
+                if name not in by_class:
+                    by_class[name] = partition()
+                by_class[name][key] = obj
+            for name in set(FileStorage.__indexes or ()):
+                for structure in self.__structures(name):
+                    structure.clear()
+                    for key, obj in dict.items(by_class.get(name, {})):
+                        structure.add(key, obj)
+            FileStorage.__by_class = by_class
+            FileStorage.__orders = {}
+            FileStorage.__partitioned = objects
+            FileStorage.__partitioned_len = len(objects)
+        return FileStorage.__by_class
+
+    def __synced(self):
+        """Returns the objects partitioned by class name if in sync.
+
+        Returns:
+            dict: The partitions, or None when they are rebuilt on their
+                next use anyway, so changes need not be applied to them.
+        """
+        if (FileStorage.__partitioned is not FileStorage.__objects or
+                FileStorage.__partitioned_len != len(FileStorage.__objects)):
+            return None
+        return FileStorage.__by_class
+
+    def __reorder(self, name, key, added):
+        """Adds or removes a key in the orders built by page().
+
+        Args:
+            name (str): The class name of the key.
+            key (str): The key added to or removed from the storage.
+            added (bool): True if the key was added.
+        """
+        for order in (FileStorage.__orders.get(name),
+                      FileStorage.__orders.get(None)):
+            if order is None:
+                continue
+            if added:
+                order.add(key)
+            else:
+                order.discard(key)
 
     def new(self, obj):
         """Adds a new object to the storage dictionary.
@@ -26,22 +466,629 @@ class FileStorage:
         Args:
             obj (BaseModel): The object to add to the storage.
         """
-        key = "{}.{}".format(type(obj).__name__, obj.id)  # Create a unique key for the object
-        FileStorage.__objects[key] = obj  # Add the object to the dictionary
+        name = type(obj).__name__
+        key = "{}.{}".format(name, obj.id)  # Create a unique key for the object
+        with FileStorage.__lock:
+            self.__capture(key)
+            partitions = self.__synced()
+            created = key not in FileStorage.__objects
+            self.__mark(key, "created" if created else "modified")
+            FileStorage.__objects[key] = obj  # Add the object to the dictionary
+            if partitions is not None:
+                partitions.setdefault(name, {})[key] = obj
+                FileStorage.__partitioned_len = len(FileStorage.__objects)
+                if created:
+                    self.__reorder(name, key, True)
+                for structure in self.__structures(name):
+                    structure.add(key, obj)
+
+    def delete(self, obj=None):
+        """Removes an object from the storage dictionary.
+
+        Args:
+            obj (BaseModel): The object to remove. Nothing happens if None.
+        """
+        if obj is None:
+            return
+        name = type(obj).__name__
+        key = "{}.{}".format(name, obj.id)
+        with FileStorage.__lock:
+            self.__capture(key)
+            partitions = self.__synced()
+            if FileStorage.__objects.pop(key, None) is not None:
+                if partitions is not None:
+                    partitions[name].pop(key, None)
+                    FileStorage.__partitioned_len = len(FileStorage.__objects)
+                    self.__reorder(name, key, False)
+                    for structure in self.__structures(name):
+                        structure.discard(key)
+                self.__mark(key, "deleted")
+
+    def touch(self, obj, attr=None):
+        """Marks a stored object as modified and indexes it again.
+
+        Setting an attribute of a stored object does this automatically;
+        changes made through obj.__dict__ must be followed by touch(obj)
+        to be saved and found by find(), near() and within(). An object
+        replaced since it was read, by refresh() in shared mode or by
+        reload(), is stored again, so that its change is the one saved.
+        Any other object with the key of a stored one, such as a copy
+        built from its attributes, is ignored until saved.
+
+        Args:
+            obj (BaseModel): The object that changed.
+            attr (str): The attribute that changed, or None if unknown;
+                only the structures reading it are updated.
+        """
+        name = type(obj).__name__
+        key = "{}.{}".format(name, obj.__dict__.get("id"))
+        if key not in FileStorage.__objects:
+            return
+        with FileStorage.__lock:
+            stored = dict.get(FileStorage.__objects, key)
+            replaced = stored is not obj and (type(stored) is not Raw or
+                                              stored.obj is not obj)
+            if replaced and obj not in FileStorage.__replaced:
+                return
+            if key not in FileStorage.__dirty:
+                FileStorage.__dirty[key] = "modified"
+            partitions = self.__synced()
+            if replaced:
+                FileStorage.__replaced.discard(obj)
+                FileStorage.__objects[key] = obj
+                if partitions is not None:
+                    partitions.setdefault(name, {})[key] = obj
+                attr = None
+            if partitions is None:
+                return  # Indexed on the next rebuild
+            structures = (self.__structures(name) if attr is None else
+                          FileStorage.__watched.get(name, {}).get(attr, ()))
+            for structure in structures:
+                structure.add(key, obj)
+
+    def dirty(self):
+        """Returns the keys changed since the last save.
+
+        Returns:
+            dict: The state of each changed key: "created", "modified" or
+                "deleted".
+        """
+        return dict(FileStorage.__dirty)
+
+    def changing(self, obj):
+        """Notes that a stored object is about to change.
+
+        Inside a transaction, the first call for an object keeps the
+        attributes that rollback() restores; otherwise nothing happens.
+        Setting an attribute does this automatically; code changing
+        obj.__dict__ must call it first.
+
+        Args:
+            obj (BaseModel): The object about to change.
+        """
+        if FileStorage.__undo is not None:
+            key = "{}.{}".format(type(obj).__name__, obj.__dict__.get("id"))
+            if key in FileStorage.__objects:
+                with FileStorage.__lock:
+                    self.__capture(key)
+
+    def begin(self):
+        """Starts a transaction.
+
+        Until commit(), save() writes nothing; rollback() undoes every
+        change made in the process since begin().
+
+        Raises:
+            RuntimeError: If a transaction is already open.
+        """
+        with FileStorage.__lock:
+            if FileStorage.__undo is not None:
+                raise RuntimeError("A transaction is already open")
+            FileStorage.__undo = {}
+            FileStorage.__undo_dirty = dict(FileStorage.__dirty)
+
+    def commit(self):
+        """Ends the transaction and saves its changes at once.
+
+        Raises:
+            RuntimeError: If no transaction is open.
+        """
+        with FileStorage.__lock:
+            if FileStorage.__undo is None:
+                raise RuntimeError("No transaction is open")
+            FileStorage.__undo = FileStorage.__undo_dirty = None
+        self.save()
+
+    def rollback(self):
+        """Ends the transaction, undoing its changes.
+
+        Objects created since begin() are removed, and deleted or changed
+        ones get back their attributes as they were before their first
+        change. Changes made in place to a list or dictionary attribute
+        before any assignment cannot be undone.
+
+        Raises:
+            RuntimeError: If no transaction is open.
+        """
+        with FileStorage.__lock:
+            undo = FileStorage.__undo
+            if undo is None:
+                raise RuntimeError("No transaction is open")
+            objects = FileStorage.__objects
+            partitions = self.__synced()
+            for key, before in undo.items():
+                name = key.partition(".")[0]
+                structures = (self.__structures(name)
+                              if partitions is not None else ())
+                for structure in structures:
+                    structure.discard(key)
+                if before is None:
+                    dict.pop(objects, key, None)
+                    if partitions is not None:
+                        partitions.get(name, {}).pop(key, None)
+                    continue
+                obj, attrs = before
+                obj.__dict__.clear()
+                obj.__dict__.update(attrs)
+                dict.__setitem__(objects, key, obj)
+                if partitions is not None:
+                    partitions.setdefault(name, {})[key] = obj
+                    for structure in structures:
+                        structure.add(key, obj)
+            if partitions is not None:
+                FileStorage.__partitioned_len = len(objects)
+            FileStorage.__orders = {}
+            FileStorage.__dirty = FileStorage.__undo_dirty
+            FileStorage.__undo = FileStorage.__undo_dirty = None
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Runs a block in a transaction.
+
+        The changes are committed when the block ends, or rolled back if
+        it raises.
+
+        Yields:
+            FileStorage: The storage.
+        """
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    def __capture(self, key):
+        """Keeps the state of a key before its first change in a transaction."""
+        undo = FileStorage.__undo
+        if undo is None or key in undo:
+            return
+        value = dict.get(FileStorage.__objects, key)
+        if value is None:
+            undo[key] = None
+            return
+        obj = resolve(value)
+        undo[key] = (obj, {name: (attr.copy() if type(attr) in (list, dict)
+                                  else attr)
+                           for name, attr in obj.__dict__.items()})
+
+    def __mark(self, key, state):
+        """Records a change of state for a key."""
+        previous = FileStorage.__dirty.get(key)
+        if previous == "created" and state != "created":
+            if state == "deleted":
+                del FileStorage.__dirty[key]  # Never saved, nothing to undo
+            return
+        if previous == "deleted" and state == "created":
+            state = "modified"
+        FileStorage.__dirty[key] = state
 
     def save(self):
-        """Serializes the storage dictionary to a JSON file."""
-        with open(FileStorage.__file_path, "w", encoding="utf-8") as f:
-            # Convert each object to a dictionary before serialization
-            obj_dict = {k: v.to_dict() for k, v in FileStorage.__objects.items()}
-            json.dump(obj_dict, f)  # Write the serialized objects to the file
+        """Persists the changes made since the last save.
+
+        In write-behind mode the changes are only scheduled for the
+        background flusher, unless __flush_size keys are dirty; otherwise
+        they are written at once by flush(). Inside a transaction nothing
+        is written until commit().
+        """
+        if FileStorage.__undo is not None:
+            return
+        if not FileStorage.__write_behind:
+            self.flush()
+            return
+        with FileStorage.__lock:
+            if len(FileStorage.__dirty) >= FileStorage.__flush_size:
+                self.flush()
+            elif not FileStorage.__pending:
+                FileStorage.__pending = True
+                self.__start_flusher()
+                FileStorage.__scheduled.notify()
+
+    def flush(self):
+        """Writes the changes made since the last flush.
+
+        In journaled mode only the objects added, updated or deleted since
+        the last flush are appended to the journal; otherwise the JSON file
+        is rewritten, serializing again only those objects, or only their
+        records are rewritten in the record format. In shared mode
+        the changes are first merged into what other processes wrote.
+        Inside a transaction, the flush waits for commit().
+        """
+        with FileStorage.__lock, self.__file_lock(True):
+            if FileStorage.__undo is not None:
+                return
+            FileStorage.__pending = False
+            self.__merge()
+            if not FileStorage.__journal:
+                self.__write_snapshot()
+                return
+            if FileStorage.__dirty:
+                objects = FileStorage.__objects
+                with open(FileStorage.__journal_path, "a+b") as f:
+                    self.__cut_torn_record(f)
+                    for key, state in FileStorage.__dirty.items():
+                        if state == "deleted":
+                            record = {"op": "delete", "key": key}
+                        elif key in objects:
+                            record = {"op": "put", "key": key,
+                                      "value": to_dict(dict.get(objects, key))}
+                        else:
+                            continue  # Dropped along with __objects
+                        f.write((json.dumps(record) + "\n").encode("utf-8"))
+                        FileStorage.__journal_records += 1
+                FileStorage.__dirty = {}
+                FileStorage.__seen = self.__signature()
+            if FileStorage.__journal_records > FileStorage.__journal_limit:
+                self.__write_snapshot()
+
+    @staticmethod
+    def __cut_torn_record(f):
+        """Truncates the journal after its last complete record.
+
+        A write interrupted by a crash leaves a record without its newline
+        at the end; records appended after it would be lost with it.
+
+        Args:
+            f (file): The journal, opened in binary append mode.
+        """
+        end = position = f.seek(0, os.SEEK_END)
+        while position > 0:
+            start = max(0, position - 4096)
+            f.seek(start)
+            chunk = f.read(position - start)
+            if position == end and chunk.endswith(b"\n"):
+                return
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                f.truncate(start + newline + 1)
+                return
+            position = start
+        f.truncate(0)
+
+    def refresh(self):
+        """Reads the storage files again if another process wrote them.
+
+        Changes this process has not saved yet are kept on top of what is
+        read. Shared mode calls this before all() and get() answer. Inside
+        a transaction the files are not read: the transaction sees the
+        objects as of begin(), with its own changes.
+
+        Returns:
+            bool: True if the files were read again.
+        """
+        with FileStorage.__lock:
+            if (FileStorage.__undo is not None or
+                    self.__signature() == FileStorage.__seen):
+                return False
+            with self.__file_lock(False):
+                self.__merge()
+            return True
+
+    def __merge(self):
+        """Loads what another process wrote and reapplies local changes.
+
+        When the snapshot is unchanged and the journal only grew, just the
+        new journal records are read.
+        """
+        if not FileStorage.__shared:
+            return
+        seen, current = FileStorage.__seen, self.__signature()
+        if current == seen:
+            return
+        dirty = FileStorage.__dirty
+        local = {key: dict.get(FileStorage.__objects, key) for key in dirty
+                 if key in FileStorage.__objects}
+        if (seen is not None and current[0] == seen[0] and
+                current[1] is not None and
+                (seen[1] is None or (current[1][0] == seen[1][0] and
+                                     current[1][1] > seen[1][1]))):
+            self.__replay(seen[1][1] if seen[1] else 0)
+            FileStorage.__partitioned = None  # Records bypass new()
+            FileStorage.__encoded_for = None
+            FileStorage.__seen = current
+        else:
+            self.__load()
+        for key, state in dirty.items():
+            if state == "deleted":
+                FileStorage.__objects.pop(key, None)
+            elif key in local:
+                FileStorage.__objects[key] = local[key]
+        FileStorage.__dirty = dirty
+
+    def __signature(self):
+        """Returns the inode, size and mtime of the storage files.
+
+        In the sharded layout, the directory of the shards stands for the
+        snapshot: replacing a shard changes its mtime.
+        """
+        signature = []
+        snapshot = (self.__shard_dir() if self.__in_shards()
+                    else FileStorage.__file_path)
+        for path in (snapshot, FileStorage.__journal_path):
+            try:
+                st = os.stat(path)
+            except OSError:
+                signature.append(None)
+            else:
+                signature.append((st.st_ino, st.st_size, st.st_mtime_ns))
+        return tuple(signature)
+
+    @contextlib.contextmanager
+    def __file_lock(self, exclusive):
+        """Holds the lock file of the storage in shared mode.
+
+        Args:
+            exclusive (bool): True to write, False to read.
+        """
+        if not FileStorage.__shared or fcntl is None:
+            yield
+            return
+        with open(FileStorage.__file_path + ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def __start_flusher(self):
+        """Starts the background flusher once per process.
+
+        Pending changes are also flushed when the interpreter exits.
+        """
+        if FileStorage.__flusher is None:
+            FileStorage.__flusher = threading.Thread(
+                target=self.__flush_loop, name="FileStorage flusher",
+                daemon=True)
+            FileStorage.__flusher.start()
+            atexit.register(self.__flush_at_exit)
+
+    def __flush_at_exit(self):
+        """Flushes the changes still scheduled when the interpreter exits."""
+        if FileStorage.__pending:
+            self.flush()
+
+    def __flush_loop(self):
+        """Flushes the scheduled changes, one window after the first.
+
+        A failed flush is reported on stderr and tried again one window
+        later, the changes being still dirty.
+        """
+        while True:
+            with FileStorage.__lock:
+                while not FileStorage.__pending:
+                    FileStorage.__scheduled.wait()
+            time.sleep(FileStorage.__flush_interval)
+            with FileStorage.__lock:
+                if not FileStorage.__pending:
+                    continue
+                try:
+                    self.flush()
+                except Exception as error:
+                    FileStorage.__pending = True
+                    print("Could not flush the storage: {!r}".format(error),
+                          file=sys.stderr, flush=True)
+
+    def compact(self):
+        """Serializes the storage dictionary to a JSON file.
+
+        Outside of journaled mode, the JSON text of each object is kept
+        between saves and only the dirty objects are serialized again.
+        The snapshot replaces the journal, which is removed afterwards.
+        A record file is written again whole, without its freed records.
+
+        Raises:
+            RuntimeError: If a transaction is open.
+        """
+        with FileStorage.__lock, self.__file_lock(True):
+            if FileStorage.__undo is not None:
+                raise RuntimeError("Cannot compact inside a transaction")
+            self.__merge()
+            if FileStorage.__format == "records":
+                FileStorage.__encoded_for = None  # Drop the freed records
+            self.__write_snapshot()
+
+    def __write_snapshot(self):
+        """Writes every object to __file_path and clears the journal.
+
+        Each file is written under a temporary name and then renamed, so
+        readers see either the previous snapshot or the new one. In the
+        sharded layout only the shards holding dirty objects are written,
+        unless the encoded objects had to be discarded.
+        """
+        if FileStorage.__format == "records":
+            self.__write_records()
+            self.__snapshot_written()
+            return
+        objects = FileStorage.__objects
+        codec = self.__codec(FileStorage.__format)
+        layout = (codec, FileStorage.__sharded, FileStorage.__shard_partitions)
+        changed = None
+        if FileStorage.__journal:
+            encoded = None
+
+            def entry(key):
+                return codec.encode(key, to_dict(dict.get(objects, key)))
+        else:
+            encoded = FileStorage.__encoded
+            mutable = FileStorage.__encoded_mutable
+            if (FileStorage.__encoded_for is not objects or
+                    FileStorage.__encoded_as != layout):
+                encoded, mutable = {}, set()
+            else:
+                changed = {self.__shard(key) for key in FileStorage.__dirty}
+                for key in FileStorage.__dirty:
+                    encoded.pop(key, None)
+                for key in mutable.difference(FileStorage.__dirty):
+                    if key in objects:
+                        text = codec.encode(
+                            key, to_dict(dict.get(objects, key)))
+                        if text != encoded.get(key):
+                            encoded[key] = text
+                            changed.add(self.__shard(key))
+            for key in [key for key in objects if key not in encoded]:
+                value = to_dict(dict.get(objects, key))
+                encoded[key] = codec.encode(key, value)
+                if any(type(v) in (list, dict) for v in value.values()):
+                    mutable.add(key)
+                else:
+                    mutable.discard(key)
+            if len(encoded) != len(objects):
+                encoded = {key: encoded[key] for key in objects}
+                mutable.intersection_update(encoded)
+            entry = encoded.__getitem__
+        FileStorage.__records = None
+        if os.path.isfile(FileStorage.__file_path + ".index"):
+            os.remove(FileStorage.__file_path + ".index")  # From records
+        if FileStorage.__sharded:
+            self.__write_shards(codec, entry, changed)
+            if os.path.isfile(FileStorage.__file_path):
+                os.remove(FileStorage.__file_path)  # Migrated to shards
+        else:
+            # Convert each object to a dictionary as it is written
+            self.__write_file(FileStorage.__file_path, codec,
+                              map(entry, objects))
+            if os.path.isdir(self.__shard_dir()):
+                shutil.rmtree(self.__shard_dir())  # Migrated from shards
+        if encoded is not None:
+            FileStorage.__encoded_mutable = mutable
+        FileStorage.__encoded = encoded or {}
+        FileStorage.__encoded_for = objects if encoded is not None else None
+        FileStorage.__encoded_as = layout
+        self.__snapshot_written()
+
+    def __snapshot_written(self):
+        """Clears the journal and the dirty keys after a snapshot."""
+        if os.path.isfile(FileStorage.__journal_path):
+            os.remove(FileStorage.__journal_path)
+        FileStorage.__journal_records = 0
+        FileStorage.__dirty = {}
+        FileStorage.__seen = self.__signature()
+
+    def __write_records(self):
+        """Writes the dirty objects to the record file.
+
+        Each object is rewritten in its record, or appended when it no
+        longer fits. The whole file is written again when it does not
+        hold the other objects (it is not open yet, or the journal was
+        used), or when freed records take more than half of it.
+        """
+        objects = FileStorage.__objects
+        current = FileStorage.__records
+        if (current is not None and not FileStorage.__journal and
+                current.path == FileStorage.__file_path and
+                FileStorage.__encoded_for is objects and
+                FileStorage.__encoded_as == ("records",)):
+            for key, state in FileStorage.__dirty.items():
+                if state == "deleted":
+                    current.delete(key)
+                elif key in objects:
+                    current.put(key, to_dict(dict.get(objects, key)))
+            if len(current) == len(objects) and current.free * 2 <= current.size:
+                current.commit()
+                return
+        FileStorage.__records = records.RecordFile.write(
+            FileStorage.__file_path,
+            ((key, to_dict(dict.get(objects, key))) for key in objects))
+        FileStorage.__encoded, FileStorage.__encoded_for = {}, objects
+        FileStorage.__encoded_as = ("records",)
+        if os.path.isdir(self.__shard_dir()):
+            shutil.rmtree(self.__shard_dir())  # Migrated from shards
+
+    def __write_file(self, path, codec, entries):
+        """Writes encoded objects to a file through a temporary file."""
+        temp = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with codec.open(temp, "w", FileStorage.__compression,
+                            FileStorage.__compression_level) as f:
+                codec.write(f, entries)
+            os.replace(temp, path)
+        except BaseException:
+            if os.path.isfile(temp):
+                os.remove(temp)
+            raise
+
+    def __write_shards(self, codec, entry, changed):
+        """Writes the shards of the objects.
+
+        Args:
+            codec: The format of the shards.
+            entry (callable): Returns the encoded object of a key.
+            changed (set): The (class name, partition) shards to write, or
+                None to write them all and remove the others.
+        """
+        directory = self.__shard_dir()
+        os.makedirs(directory, exist_ok=True)
+        members = FileStorage.__shard_keys
+        if changed is not None:
+            for key, state in FileStorage.__dirty.items():
+                group = members.setdefault(self.__shard(key), {})
+                if state == "deleted":
+                    group.pop(key, None)
+                else:
+                    group[key] = None
+            if sum(map(len, members.values())) != len(FileStorage.__objects):
+                changed = None  # Objects were added behind new()'s back
+        if changed is None:
+            members = FileStorage.__shard_keys = {}
+            for key in FileStorage.__objects:
+                members.setdefault(self.__shard(key), {})[key] = None
+        for shard in (members if changed is None else changed):
+            path = os.path.join(directory, shards.shard_name(*shard))
+            if members.get(shard):
+                self.__write_file(path, codec, map(entry, members[shard]))
+            elif os.path.isfile(path):
+                os.remove(path)
+        if changed is None:
+            wanted = {shards.shard_name(*shard) for shard in members}
+            for name in os.listdir(directory):
+                if name not in wanted:
+                    os.remove(os.path.join(directory, name))
+
+    def __shard(self, key):
+        """Returns the (class name, partition) shard of a key."""
+        return (key.partition(".")[0],
+                shards.partition(key, FileStorage.__shard_partitions))
+
+    def __shard_dir(self):
+        """Returns the directory of the sharded layout."""
+        return FileStorage.__file_path + ".shards"
+
+    def __in_shards(self):
+        """Returns True if snapshots are written as shards.
+
+        The record format always uses the single file.
+        """
+        return FileStorage.__sharded and FileStorage.__format != "records"
 
     def classes(self):
         """Returns a dictionary of valid classes and their references.
+
+        The dictionary is built once and shared; it must not be modified.
         
         Returns:
             dict: A dictionary mapping class names to class references.
         """
+        if FileStorage.__classes is not None:
+            return FileStorage.__classes
+
         from models.base_model import BaseModel
         from models.user import User
         from models.state import State
@@ -60,18 +1107,184 @@ class FileStorage:
             "Place": Place,
             "Review": Review
         }
+        FileStorage.__classes = classes
         return classes
 
-    def reload(self):
-        """Deserializes the JSON file back into the storage dictionary."""
-        if not os.path.isfile(FileStorage.__file_path):
-            return  # Exit if the file does not exist
+    def reload(self, progress=None):
+        """Deserializes the storage file back into the storage dictionary.
+
+        The format of the file, JSON or binary, and its compression are
+        detected. The file is
+        read one entry at a time and each object is created as soon as its
+        entry is parsed. The journal, if any, is replayed on
+        top of the snapshot.
+
+        An open transaction ends: its changes are dropped with the rest.
+
+        Args:
+            progress (callable): Optional callback receiving the number of
+                bytes read so far and the size of the file.
+        """
+        with FileStorage.__lock, self.__file_lock(False):
+            FileStorage.__undo = FileStorage.__undo_dirty = None
+            self.__load(progress)
+
+    def __load(self, progress=None):
+        """Replaces the storage dictionary with the contents of the files.
 
-        with open(FileStorage.__file_path, "r", encoding="utf-8") as f:
-            obj_dict = json.load(f)  # Load the JSON file
-            # Recreate the objects from their dictionaries
-            obj_dict = {k: self.classes()[v["__class__"]](**v) for k, v in obj_dict.items()}
+        When only the layout not in use (single file or shards) is on
+        disk, it is read and then written again in the layout in use.
+        """
+        directory = self.__shard_dir()
+        sharded = os.path.isdir(directory) and (
+            self.__in_shards() or
+            not os.path.isfile(FileStorage.__file_path))
+        in_records = False
+        if sharded:
+            paths = shards.list_shards(directory)
+        elif os.path.isfile(FileStorage.__file_path):
+            paths = [FileStorage.__file_path]
+        else:
+            paths = None
+        if paths is not None:
+            size = sum(map(os.path.getsize, paths))
+            report = None
+            if progress is not None:
+                def report(read):
+                    progress(read, size)
+            classes = self.classes()
+            FileStorage.__records = None
+            with contextlib.ExitStack() as stack:
+                if not sharded and records.is_record_file(paths[0]):
+                    in_records = True
+                    current = FileStorage.__records = records.RecordFile(
+                        paths[0])
+                    items = ()
+                elif sharded:
+                    items = shards.read_shards(
+                        paths, self.attributes(),
+                        FileStorage.__reload_workers, report)
+                else:
+                    codec = self.__codec(formats.detect(paths[0]))
+                    f = stack.enter_context(
+                        codec.open(paths[0], "r", progress=report))
+                    items = codec.read(f)
+                items = self.__compacted(items)
+                # Recreate the objects from their dictionaries
+                if in_records:
+                    # Only the index is read: each placeholder reads its
+                    # own record when the object is first accessed
+                    read = current.read
+                    obj_dict = LazyObjects(
+                        (k, Raw(classes[k.partition(".")[0]], k, read))
+                        for k in current)
+                    if progress is not None:
+                        progress(size, size)
+                elif FileStorage.__lazy:
+                    obj_dict = LazyObjects(
+                        (k, Raw(classes[v["__class__"]], v))
+                        for k, v in items)
+                else:
+                    objs = classes["BaseModel"].from_dicts(
+                        v for k, v in items)
+                    obj_dict = {
+                        "{}.{}".format(type(obj).__name__, obj.id): obj
+                        for obj in objs}
+            for obj in dict.values(FileStorage.__objects):
+                obj = obj.obj if type(obj) is Raw else obj
+                if obj is not None:
+                    FileStorage.__replaced.add(obj)
             FileStorage.__objects = obj_dict  # Update the storage dictionary with deserialized objects
+        FileStorage.__dirty = {}
+        FileStorage.__pending = False
+        FileStorage.__encoded, FileStorage.__encoded_for = {}, None
+        FileStorage.__journal_records = 0
+        if os.path.isfile(FileStorage.__journal_path):
+            self.__replay()
+        elif in_records:
+            # The record file holds every object that is not dirty
+            FileStorage.__encoded_for = FileStorage.__objects
+            FileStorage.__encoded_as = ("records",)
+        FileStorage.__seen = self.__signature()
+        if paths is not None and (
+                sharded != self.__in_shards() or
+                in_records != (FileStorage.__format == "records")):
+            self.__write_snapshot()
+
+    def __codec(self, name):
+        """Returns the format of a name, compiled once."""
+        codec = FileStorage.__formats.get(name)
+        if codec is None:
+            codec = FileStorage.__formats[name] = formats.get(
+                name, self.attributes())
+        return codec
+
+    def __replay(self, offset=0):
+        """Applies the journal records to the storage dictionary.
+
+        Args:
+            offset (int): The position of the first record to apply.
+        """
+        classes = self.classes()
+        if FileStorage.__lazy and type(FileStorage.__objects) is not LazyObjects:
+            FileStorage.__objects = LazyObjects(FileStorage.__objects)
+        with open(FileStorage.__journal_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    record = (json.loads(line) if line.endswith(b"\n")
+                              else None)
+                except ValueError:
+                    record = None
+                if record is None:
+                    break  # Torn record from an interrupted write
+                replaced = dict.get(FileStorage.__objects, record["key"])
+                if type(replaced) is Raw:
+                    replaced = replaced.obj
+                if replaced is not None:
+                    FileStorage.__replaced.add(replaced)
+                if record["op"] == "delete":
+                    FileStorage.__objects.pop(record["key"], None)
+                else:
+                    value = next(self.__compacted([(None, record["value"])]))[1]
+                    cls = classes[value["__class__"]]
+                    if FileStorage.__lazy:
+                        obj = Raw(cls, value)
+                    else:
+                        obj = cls.from_dict(value)
+                    FileStorage.__objects[record["key"]] = obj
+                FileStorage.__journal_records += 1
+
+    def __compacted(self, items):
+        """Yields (key, dictionary) pairs, interning shared strings.
+
+        Outside of compact mode the pairs are passed through unchanged.
+        Interned strings are stored once however many objects hold them.
+
+        Args:
+            items (iterable): The (key, dictionary) pairs read from a file.
+        """
+        if not FileStorage.__compact:
+            yield from items
+            return
+        if FileStorage.__shared_fields is None:
+            FileStorage.__shared_fields = {
+                cls: ["__class__"] + [
+                    attr for attr, kind in attrs.items()
+                    if kind is list or (kind is str and attr.endswith("_id"))]
+                for cls, attrs in self.attributes().items()}
+        shared_fields = FileStorage.__shared_fields
+        intern = sys.intern
+        for key, value in items:
+            value = {intern(k): v for k, v in value.items()}
+            for attr in shared_fields.get(value.get("__class__"), ()):
+                shared = value.get(attr)
+                if type(shared) is str:
+                    value[attr] = intern(shared)
+                elif type(shared) is list:
+                    value[attr] = [intern(v) if type(v) is str else v
+                                   for v in shared]
+            yield key, value
 
     def attributes(self):
         """Returns the valid attributes and their types for each class.
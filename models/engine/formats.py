@@ -0,0 +1,422 @@
+#!/usr/bin/python3
+"""Module for the storage file formats.
+
+A format turns the (key, dictionary) pairs of the stored objects, the
+dictionaries being those made by to_dict(), into a file and back. Each
+object is encoded on its own so that FileStorage can keep the encoded
+form of unchanged objects between saves.
+
+JSON is the default. The binary format stores the attribute names and
+types of each class once, from FileStorage.attributes(), then one record
+per object with timestamps as integers and ids as 16-byte UUIDs. Files
+in the binary format start with MAGIC, which is how reload() tells them
+apart.
+
+Usage:
+    python3 -m models.engine.formats <json|binary> <source> <target> [codec]
+"""
+
+import io
+import json
+import struct
+import sys
+from functools import lru_cache
+from datetime import datetime, timedelta
+from models.engine import compression
+from models.engine.stream import (CHUNK_SIZE, encode_item, iter_items,
+                                  write_encoded)
+
+MAGIC = b"HBNB\x01"
+
+_HEADER = struct.Struct("<IH")  # Length of the record body, class number
+_LENGTH = struct.Struct("<I")
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Field kinds of the binary format and their struct codes
+_CODES = {"str": "I", "uuid": "16s", "int": "q", "float": "d",
+          "datetime": "q", "list": "I"}
+_INT_MIN, _INT_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _uuid_text(raw):
+    """Returns the canonical text of a 16-byte UUID."""
+    h = raw.hex()
+    return "{}-{}-{}-{}-{}".format(h[:8], h[8:12], h[12:16], h[16:20], h[20:])
+
+
+# Statements of the generated record decoders, by field kind; ids are
+# unique, other UUIDs are foreign keys decoded once through shared, and a
+# timestamp equal to the previous one of the record is not formatted again
+_DECODERS = {
+    "str": "n = {value}\nd[{attr}] = buf[text:text + n].decode()\ntext += n",
+    "id": "d[{attr}] = _uuid_text({value})",
+    "uuid": "r = {value}\ns = shared.get(r)\nif s is None:\n"
+            "    s = shared[r] = _uuid_text(r)\nd[{attr}] = s",
+    "int": "d[{attr}] = {value}",
+    "float": "d[{attr}] = {value}",
+    "datetime": "r = {value}\nif r != stamp:\n"
+                "    stamp, text_stamp = r, "
+                "(_EPOCH + r * _MICROSECOND).isoformat()\n"
+                "d[{attr}] = text_stamp",
+    "list": "n = {value}\nitems = buf[text:text + n].decode()\ntext += n\n"
+            "d[{attr}] = items[:-1].split('\\x00') if items else []",
+}
+
+# Statements of the generated record encoders, by field kind: each stores
+# the packed value of the field in {value}, sets its bit in present and
+# removes it from extra, unless it does not fit the kind of the field
+_ENCODERS = {
+    "str": "data = extra.get({attr})\nif type(data) is str:\n"
+           "    data = data.encode()\n    texts.append(data)\n"
+           "    {value} = len(data)\n    present |= {bit}\n"
+           "    del extra[{attr}]\nelse:\n    {value} = 0",
+    "id": "{value} = _uuid_bytes(extra.get({attr}))\n"
+          "if {value} is None:\n    {value} = b''\nelse:\n"
+          "    present |= {bit}\n    del extra[{attr}]",
+    "uuid": "data = extra.get({attr})\n"
+            "{value} = (_shared_uuid_bytes(data) if type(data) is str\n"
+            "           else None)\n"
+            "if {value} is None:\n    {value} = b''\nelse:\n"
+            "    present |= {bit}\n    del extra[{attr}]",
+    "int": "data = extra.get({attr})\n"
+           "if type(data) is int and _INT_MIN <= data <= _INT_MAX:\n"
+           "    {value} = data\n    present |= {bit}\n"
+           "    del extra[{attr}]\nelse:\n    {value} = 0",
+    "float": "data = extra.get({attr})\nif type(data) is float:\n"
+             "    {value} = data\n    present |= {bit}\n"
+             "    del extra[{attr}]\nelse:\n    {value} = 0",
+    "datetime": "data = extra.get({attr})\n"
+                "if data != stamp:\n"
+                "    stamp, packed_stamp = data, _timestamp(data)\n"
+                "if packed_stamp is None:\n    {value} = 0\nelse:\n"
+                "    {value} = packed_stamp\n"
+                "    present |= {bit}\n    del extra[{attr}]",
+    "list": "data = extra.get({attr})\n"
+            "if type(data) is list and all(type(item) is str and "
+            "'\\x00' not in item for item in data):\n"
+            "    data = ''.join(item + '\\x00' for item in data).encode()\n"
+            "    texts.append(data)\n    {value} = len(data)\n"
+            "    present |= {bit}\n    del extra[{attr}]\n"
+            "else:\n    {value} = 0",
+}
+
+
+def _uuid_bytes(value):
+    """Returns the 16 bytes of a canonical UUID string, or None."""
+    if (type(value) is not str or len(value) != 36 or
+            value[8] != "-" or value[13] != "-" or value[18] != "-" or
+            value[23] != "-" or value != value.lower()):
+        return None
+    try:
+        raw = bytes.fromhex(value.replace("-", ""))
+    except ValueError:
+        return None
+    return raw if len(raw) == 16 else None
+
+
+_shared_uuid_bytes = lru_cache(maxsize=1 << 16)(_uuid_bytes)
+
+
+def _timestamp(value):
+    """Returns a to_dict() timestamp in microseconds, or None."""
+    if type(value) is not str:
+        return None
+    try:
+        stamp = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if stamp.tzinfo is not None:
+        return None
+    # The two forms made by isoformat() come back unchanged; any other
+    # text must match what isoformat() would make of it
+    usual = value[10:11] == "T" and (len(value) == 19 or (
+        len(value) == 26 and value[19] == "." and value[20:] != "000000"))
+    if not usual and stamp.isoformat() != value:
+        return None
+    return (stamp - _EPOCH) // _MICROSECOND
+
+
+_GENERATED_GLOBALS = {
+    "_uuid_text": _uuid_text, "_uuid_bytes": _uuid_bytes,
+    "_shared_uuid_bytes": _shared_uuid_bytes, "_timestamp": _timestamp,
+    "_EPOCH": _EPOCH, "_MICROSECOND": _MICROSECOND, "_INT_MIN": _INT_MIN,
+    "_INT_MAX": _INT_MAX, "json": json}
+
+
+class JsonFormat:
+    """One JSON object mapping each key to its dictionary.
+
+    Attributes:
+        name (str): The name of the format.
+        binary (bool): Whether files are opened in binary mode.
+    """
+
+    name = "json"
+    binary = False
+
+    def open(self, path, mode, codec=None, level=None, progress=None):
+        """Returns a file of this format opened with mode "r" or "w".
+
+        The arguments after mode are those of compression.open_file().
+        """
+        return io.TextIOWrapper(compression.open_file(
+            path, mode, codec, level, progress), encoding="utf-8")
+
+    def encode(self, key, value):
+        """Returns the encoded form of one object."""
+        return encode_item(key, value)
+
+    def write(self, f, entries):
+        """Writes the encoded objects to a file."""
+        write_encoded(f, entries)
+
+    def read(self, f):
+        """Yields the (key, dictionary) pairs of a file."""
+        return iter_items(f)
+
+
+class BinaryFormat:
+    """Schema-based binary records.
+
+    The file is MAGIC, the length and JSON text of the schema (a list of
+    [class name, [[attribute, kind], ...]]), then one record per object:
+    a header holding the length of the rest and the class number, a mask
+    of the attributes present, the fixed-size fields of the class, the
+    text of its strings and lists, and a JSON object of the remaining
+    attributes.
+    Values that do not fit the kind of their attribute go to that JSON
+    object. Objects of unknown classes are stored as a JSON [key, value]
+    pair under the class number one past the last class.
+
+    Attributes:
+        name (str): The name of the format.
+        binary (bool): Whether files are opened in binary mode.
+    """
+
+    name = "binary"
+    binary = True
+
+    def __init__(self, attributes):
+        """Compiles the record layout of each class.
+
+        Args:
+            attributes (dict): The attribute types of each class, as
+                returned by FileStorage.attributes().
+        """
+        base = attributes.get("BaseModel", {})
+        schema = []
+        for cls, attrs in attributes.items():
+            fields = dict(base)
+            fields.update(attrs)
+            schema.append([cls, [[attr, self.__kind(attr, kind)]
+                                 for attr, kind in fields.items()]])
+        self.__schema = schema
+        self.__layouts = self.__compile(schema)
+        self.__numbers = {cls: number
+                          for number, (cls, fields) in enumerate(schema)}
+
+    @staticmethod
+    def __kind(attr, kind):
+        """Returns the kind of field for an attribute type."""
+        if kind is str:
+            return "uuid" if attr == "id" or attr.endswith("_id") else "str"
+        if kind is datetime:
+            return "datetime"
+        return {int: "int", float: "float", list: "list"}.get(kind, "json")
+
+    @staticmethod
+    def __compile(schema):
+        """Returns (class name, struct, encoder, decoder) for each class.
+
+        The encoder and decoder of a class are generated from its fields,
+        so a record is converted without looping over them.
+        """
+        layouts = []
+        for number, (cls, fields) in enumerate(schema):
+            fields = [(attr, kind) for attr, kind in fields if kind in _CODES]
+            packer = struct.Struct("<IHQ" + "".join(_CODES[kind]
+                                                    for attr, kind in fields))
+            names = ["v{}".format(bit) for bit in range(len(fields))]
+            encoder = ["def encode(value):", "extra = dict(value)",
+                       "del extra['__class__']", "present = 0", "texts = []",
+                       "stamp = packed_stamp = None"]
+            decoder = ["def decode(values, buf, text, shared):",
+                       "present = values[2]", "d = {}", "stamp = None"]
+            for bit, (attr, kind) in enumerate(fields):
+                kind = "id" if attr == "id" else kind
+                encoder.extend(_ENCODERS[kind].format(
+                    attr=repr(attr), value=names[bit],
+                    bit=1 << bit).split("\n"))
+                decoder.append("if present & {}:".format(1 << bit))
+                decoder.extend("    " + line for line in
+                               _DECODERS[kind].format(
+                                   attr=repr(attr),
+                                   value="values[{}]".format(bit + 3)
+                               ).split("\n"))
+            encoder.extend([
+                "if extra:",
+                "    texts.append(json.dumps(extra).encode())",
+                "texts = b''.join(texts)",
+                "return pack(len(texts) + {}, {}, present, {}) + texts".format(
+                    packer.size - _HEADER.size, number, ", ".join(names))])
+            decoder.append("return d, text")
+            namespace = dict(_GENERATED_GLOBALS, pack=packer.pack)
+            exec("\n    ".join(encoder), namespace)
+            exec("\n    ".join(decoder), namespace)
+            layouts.append((cls, packer, namespace["encode"],
+                            namespace["decode"]))
+        return layouts
+
+    def open(self, path, mode, codec=None, level=None, progress=None):
+        """Returns a file of this format opened with mode "r" or "w".
+
+        The arguments after mode are those of compression.open_file().
+        """
+        return compression.open_file(path, mode, codec, level, progress)
+
+    def encode(self, key, value):
+        """Returns the record of one object."""
+        cls = value.get("__class__")
+        number = self.__numbers.get(cls)
+        if number is None or key != "{}.{}".format(cls, value.get("id")):
+            body = json.dumps([key, value]).encode("utf-8")
+            return _HEADER.pack(len(body), len(self.__layouts)) + body
+        return self.__layouts[number][2](value)
+
+    def write(self, f, entries):
+        """Writes the schema and the records to a file."""
+        schema = json.dumps(self.__schema).encode("utf-8")
+        f.write(MAGIC + _LENGTH.pack(len(schema)) + schema)
+        batch = []
+        for entry in entries:
+            batch.append(entry)
+            if len(batch) == 4096:
+                f.write(b"".join(batch))
+                batch = []
+        f.write(b"".join(batch))
+
+    def read(self, f, chunk_size=CHUNK_SIZE):
+        """Yields the (key, dictionary) pairs of a file.
+
+        The records are decoded with the schema stored in the file.
+
+        Raises:
+            ValueError: If the file is not in the binary format.
+        """
+        buf = f.read(len(MAGIC) + _LENGTH.size)
+        if buf[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a binary storage file")
+        size = _LENGTH.unpack_from(buf, len(MAGIC))[0]
+        schema = f.read(size)
+        layouts = self.__compile(json.loads(schema))
+        shared = {}
+        buf, pos = b"", 0
+        while True:
+            chunk = f.read(chunk_size)
+            if chunk:
+                buf = buf[pos:] + chunk
+                pos = 0
+            end = len(buf)
+            while pos + _HEADER.size <= end:
+                length, number = _HEADER.unpack_from(buf, pos)
+                start = pos
+                pos += _HEADER.size + length
+                if pos > end:
+                    pos = start
+                    break
+                if number >= len(layouts):
+                    yield tuple(json.loads(buf[start + _HEADER.size:pos]))
+                    continue
+                yield self.__decode(layouts[number], buf, start, pos, shared)
+            if not chunk:
+                if pos != len(buf):
+                    raise ValueError("Truncated binary storage file")
+                return
+
+    @staticmethod
+    def __decode(layout, buf, start, end, shared):
+        """Returns the (key, dictionary) pair of one record.
+
+        Foreign keys are decoded once per distinct value through shared.
+        """
+        cls, packer, encode, decode = layout
+        value, text = decode(packer.unpack_from(buf, start), buf,
+                             start + packer.size, shared)
+        if text < end:
+            value.update(json.loads(buf[text:end]))
+        value["__class__"] = cls
+        return "{}.{}".format(cls, value.get("id")), value
+
+
+def detect(path):
+    """Returns the name of the format of a storage file.
+
+    The file may be compressed.
+
+    Args:
+        path (str): The path of the file.
+    """
+    with compression.open_file(path, "r") as f:
+        return "binary" if f.read(len(MAGIC)) == MAGIC else "json"
+
+
+def get(name, attributes):
+    """Returns a format by name.
+
+    Args:
+        name (str): "json" or "binary".
+        attributes (dict): The attribute types of each class, as returned
+            by FileStorage.attributes().
+
+    Raises:
+        ValueError: If there is no such format.
+    """
+    if name == "json":
+        return JsonFormat()
+    if name == "binary":
+        return BinaryFormat(attributes)
+    raise ValueError("Unknown storage format: {}".format(name))
+
+
+def convert(source, target, name, codec=None, level=None):
+    """Writes a copy of a storage file in another format.
+
+    The format and compression of the source are detected.
+
+    Args:
+        source (str): The path of the file to read.
+        target (str): The path of the file to write.
+        name (str): The format of the target, "json" or "binary".
+        codec (str): The compression of the target, one of
+            compression.CODECS, or None.
+        level (int): The compression level, or None for the default.
+
+    Returns:
+        int: The number of objects converted.
+    """
+    from models.engine.file_storage import FileStorage
+    attributes = FileStorage().attributes()
+    reader = get(detect(source), attributes)
+    writer = get(name, attributes)
+    count = 0
+    with reader.open(source, "r") as f, \
+            writer.open(target, "w", codec, level) as out:
+        def entries():
+            nonlocal count
+            for key, value in reader.read(f):
+                count += 1
+                yield writer.encode(key, value)
+        writer.write(out, entries())
+    return count
+
+
+if __name__ == "__main__":
+    if (len(sys.argv) not in (4, 5) or sys.argv[1] not in ("json", "binary")
+            or sys.argv[4:] and sys.argv[4] not in compression.CODECS):
+        print("Usage: {} <json|binary> <source> <target> [{}]".format(
+            "python3 -m models.engine.formats",
+            "|".join(compression.CODECS)))
+        sys.exit(1)
+    print("{} objects converted".format(
+        convert(*sys.argv[2:4], sys.argv[1], *sys.argv[4:])))
@@ -0,0 +1,214 @@
+#!/usr/bin/python3
+"""Module for GridIndex class.
+
+Points are filed into cells of a fixed number of degrees, so a query only
+visits the cells overlapping its area instead of every point.
+"""
+
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def distance(lat1, lon1, lat2, lon2):
+    """Returns the great-circle distance between two points in km.
+
+    Args:
+        lat1 (float): Latitude of the first point, in degrees.
+        lon1 (float): Longitude of the first point, in degrees.
+        lat2 (float): Latitude of the second point, in degrees.
+        lon2 (float): Longitude of the second point, in degrees.
+    """
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) *
+         math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat, lon, km):
+    """Returns the bounding box of a circle.
+
+    Args:
+        lat (float): The latitude of the center, in degrees.
+        lon (float): The longitude of the center, in degrees.
+        km (float): The radius, in kilometers.
+
+    Returns:
+        tuple: (south, west, north, east); west is greater than east when
+            the box crosses the antimeridian.
+    """
+    dlat = km / KM_PER_DEGREE
+    south, north = lat - dlat, lat + dlat
+    if south <= -90 or north >= 90:
+        return max(south, -90), -180, min(north, 90), 180
+    dlon = dlat / max(math.cos(math.radians(max(abs(south), abs(north)))),
+                      1e-12)
+    if dlon >= 180:
+        return south, -180, north, 180
+    west, east = lon - dlon, lon + dlon
+    if west < -180:
+        west += 360
+    if east > 180:
+        east -= 360
+    return south, west, north, east
+
+
+class GridIndex:
+    """Spatial index of objects by latitude and longitude.
+
+    Objects whose coordinates are not numbers within range are not indexed.
+
+    Attributes:
+        cell (float): The size of a cell, in degrees.
+    """
+
+    def __init__(self, cell=0.1, lat_attr="latitude", lon_attr="longitude"):
+        """Initializes an empty index.
+
+        Args:
+            cell (float): The size of a cell, in degrees.
+            lat_attr (str): The name of the latitude attribute.
+            lon_attr (str): The name of the longitude attribute.
+        """
+        self.cell = cell
+        self.__attrs = (lat_attr, lon_attr)
+        self.__columns = math.ceil(360 / cell)
+        self.__cells = {}  # (row, column) -> {key: (lat, lon)}
+        self.__points = {}  # key -> (lat, lon, cell)
+
+    def __len__(self):
+        """Returns the number of indexed objects."""
+        return len(self.__points)
+
+    def __cell(self, lat, lon):
+        """Returns the cell holding a point."""
+        return (math.floor(lat / self.cell),
+                math.floor((lon + 180) / self.cell) % self.__columns)
+
+    def add(self, key, obj):
+        """Files an object under its current coordinates.
+
+        Args:
+            key (str): The storage key of the object.
+            obj (BaseModel): The object to index.
+        """
+        self.discard(key)
+        try:
+            lat, lon = (float(getattr(obj, attr)) for attr in self.__attrs)
+        except (AttributeError, TypeError, ValueError):
+            return
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            return  # Also rejects NaN
+        cell = self.__cell(lat, lon)
+        self.__cells.setdefault(cell, {})[key] = (lat, lon)
+        self.__points[key] = (lat, lon, cell)
+
+    def discard(self, key):
+        """Removes an object from the index if it is there.
+
+        Args:
+            key (str): The storage key of the object.
+        """
+        point = self.__points.pop(key, None)
+        if point is not None:
+            bucket = self.__cells[point[2]]
+            del bucket[key]
+            if not bucket:
+                del self.__cells[point[2]]
+
+    def clear(self):
+        """Removes every object from the index."""
+        self.__cells = {}
+        self.__points = {}
+
+    def __visit(self, south, west, north, east):
+        """Yields (key, lat, lon) for the points in the cells of a box.
+
+        A box with west > east crosses the antimeridian.
+        """
+        rows = range(math.floor(max(south, -90) / self.cell),
+                     math.floor(min(north, 90) / self.cell) + 1)
+        first = math.floor((west + 180) / self.cell)
+        last = math.floor((east + 180) / self.cell)
+        if west > east:
+            last += self.__columns
+        last = min(last, first + self.__columns - 1)
+        if len(rows) * (last - first + 1) > len(self.__cells):
+            cells = [(cell, bucket) for cell, bucket in self.__cells.items()
+                     if cell[0] in rows and
+                     (cell[1] - first) % self.__columns <= last - first]
+        else:
+            cells = []
+            for row in rows:
+                for column in range(first, last + 1):
+                    cell = (row, column % self.__columns)
+                    if cell in self.__cells:
+                        cells.append((cell, self.__cells[cell]))
+        for cell, bucket in cells:
+            for key, (lat, lon) in bucket.items():
+                yield key, lat, lon
+
+    def within(self, south, west, north, east):
+        """Returns the keys of the points inside a bounding box.
+
+        Args:
+            south (float): The minimum latitude.
+            west (float): The western longitude; greater than east when the
+                box crosses the antimeridian.
+            north (float): The maximum latitude.
+            east (float): The eastern longitude.
+
+        Returns:
+            list: The matching keys.
+        """
+        if west <= east:
+            def inside(lon):
+                return west <= lon <= east
+        else:
+            def inside(lon):
+                return lon >= west or lon <= east
+        return [key for key, lat, lon in self.__visit(south, west, north, east)
+                if south <= lat <= north and inside(lon)]
+
+    def near(self, lat, lon, km):
+        """Returns the points within a distance, closest first.
+
+        Args:
+            lat (float): The latitude of the center.
+            lon (float): The longitude of the center.
+            km (float): The radius, in kilometers.
+
+        Returns:
+            list: (distance in km, key) pairs sorted by distance.
+        """
+        found = []
+        for key, plat, plon in self.__visit(*bounding_box(lat, lon, km)):
+            d = distance(lat, lon, plat, plon)
+            if d <= km:
+                found.append((d, key))
+        found.sort()
+        return found
+
+    def nearest(self, lat, lon, k=1):
+        """Returns the k points closest to a location.
+
+        The search radius doubles, starting from one cell, until k points
+        are found within it or the whole index has been searched.
+
+        Args:
+            lat (float): The latitude of the center.
+            lon (float): The longitude of the center.
+            k (int): The number of points wanted.
+
+        Returns:
+            list: (distance in km, key) pairs sorted by distance.
+        """
+        if k <= 0 or not self.__points:
+            return []
+        km = self.cell * KM_PER_DEGREE
+        while True:
+            found = self.near(lat, lon, km)
+            if len(found) >= k or km >= math.pi * EARTH_RADIUS_KM:
+                return found[:k]
+            km *= 2
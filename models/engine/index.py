@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""Module for AttributeIndex class."""
+
+
+class AttributeIndex:
+    """Hash index from the value of one attribute to the objects holding it.
+
+    Attributes:
+        attr (str): The name of the indexed attribute.
+    """
+
+    __missing = object()
+
+    def __init__(self, attr):
+        """Initializes an empty index.
+
+        Args:
+            attr (str): The name of the attribute to index.
+        """
+        self.attr = attr
+        self.__buckets = {}  # value -> {key: obj}
+        self.__values = {}  # key -> value the object is filed under
+
+    def add(self, key, obj):
+        """Files an object under its current attribute value.
+
+        Re-adding an object moves it if the attribute changed.
+
+        Args:
+            key (str): The storage key of the object.
+            obj (BaseModel): The object to index.
+        """
+        self.discard(key)
+        value = getattr(obj, self.attr, None)
+        try:
+            self.__buckets.setdefault(value, {})[key] = obj
+        except TypeError:
+            return  # Unhashable values (lists, dicts) are never indexed
+        self.__values[key] = value
+
+    def discard(self, key):
+        """Removes an object from the index if it is there.
+
+        Args:
+            key (str): The storage key of the object.
+        """
+        value = self.__values.pop(key, self.__missing)
+        if value is self.__missing:
+            return
+        bucket = self.__buckets[value]
+        del bucket[key]
+        if not bucket:
+            del self.__buckets[value]
+
+    def clear(self):
+        """Removes every object from the index."""
+        self.__buckets = {}
+        self.__values = {}
+
+    def lookup(self, value):
+        """Returns the objects filed under a value.
+
+        Args:
+            value: The attribute value to look for.
+
+        Returns:
+            dict: The matching objects by key. It must not be modified.
+        """
+        try:
+            return self.__buckets.get(value, {})
+        except TypeError:
+            return {}
@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+"""Module for lazily hydrated object dictionaries.
+
+A LazyObjects dictionary may hold Raw placeholders instead of model
+instances. A placeholder keeps the serialized dictionary of an object, or
+a function reading it from a file, and builds the instance the first time
+it is read through the dictionary.
+"""
+
+
+class Raw:
+    """Placeholder for an object that has not been built yet.
+
+    Attributes:
+        cls (type): The class of the object.
+        payload (dict): The serialized object, None once hydrated.
+        obj (BaseModel): The object, None until hydrated.
+    """
+
+    __slots__ = ("cls", "_payload", "_fetch", "obj")
+
+    def __init__(self, cls, payload, fetch=None):
+        """Initializes a placeholder.
+
+        Args:
+            cls (type): The class of the object.
+            payload (dict): The serialized object, or what fetch needs to
+                read it when given.
+            fetch (callable): Optional function returning the serialized
+                object from the value given as payload, called the first
+                time the payload is needed.
+        """
+        self.cls = cls
+        self._payload = payload
+        self._fetch = fetch
+        self.obj = None
+
+    @property
+    def payload(self):
+        """Returns the serialized object, fetching it on first use."""
+        if self._fetch is not None:
+            self._payload = self._fetch(self._payload)
+            self._fetch = None
+        return self._payload
+
+    @payload.setter
+    def payload(self, value):
+        """Replaces the serialized object."""
+        self._payload = value
+        self._fetch = None
+
+    def __getattr__(self, name):
+        """Reads an attribute without hydrating.
+
+        Values come from the payload as serialized (timestamps are strings)
+        or, when missing there, from the class defaults.
+        """
+        if self.obj is not None:
+            return getattr(self.obj, name)
+        try:
+            return self.payload[name]
+        except KeyError:
+            return getattr(self.cls, name)
+
+    def hydrate(self):
+        """Builds the object once and returns it."""
+        if self.obj is None:
+            self.obj = self.cls.from_dict(self.payload)
+            self.payload = None
+        return self.obj
+
+
+def resolve(value):
+    """Returns the object behind a dictionary value.
+
+    Args:
+        value (BaseModel or Raw): A stored value.
+    """
+    return value.hydrate() if type(value) is Raw else value
+
+
+def to_dict(value):
+    """Returns the serialized form of a stored value without hydrating.
+
+    Args:
+        value (BaseModel or Raw): A stored value.
+    """
+    if type(value) is Raw:
+        if value.obj is None:
+            return value.payload
+        value = value.obj
+    return value.to_dict()
+
+
+class LazyObjects(dict):
+    """Dictionary of objects that hydrates Raw values on first access.
+
+    Copies made with dict(), {**...} or dict.update() hydrate too: as
+    __iter__ is overridden, CPython reads the values through __getitem__
+    instead of copying the placeholders. Only dict.values() and
+    dict.items() called on the class see the placeholders.
+    """
+
+    def __iter__(self):
+        """Returns an iterator over the keys."""
+        return dict.__iter__(self)
+
+    def __getitem__(self, key):
+        """Returns the object stored under key, building it if needed."""
+        value = dict.__getitem__(self, key)
+        if type(value) is Raw:
+            value = value.hydrate()
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        """Returns the object stored under key, or default."""
+        return self[key] if key in self else default
+
+    def pop(self, key, *default):
+        """Removes key and returns its object."""
+        return resolve(dict.pop(self, key, *default))
+
+    def popitem(self):
+        """Removes and returns the last (key, object) pair."""
+        key, value = dict.popitem(self)
+        return key, resolve(value)
+
+    def setdefault(self, key, default=None):
+        """Returns the object under key, storing default if missing."""
+        if key not in self:
+            dict.__setitem__(self, key, default)
+        return self[key]
+
+    def values(self):
+        """Returns the list of objects, building them as needed."""
+        return [self[key] for key in self]
+
+    def items(self):
+        """Returns the list of (key, object) pairs, building as needed."""
+        return [(key, self[key]) for key in self]
+
+    def copy(self):
+        """Returns a shallow copy sharing the placeholders."""
+        return LazyObjects(dict.items(self))
+
+    def __eq__(self, other):
+        """Compares the hydrated contents with another mapping."""
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        """Compares the hydrated contents with another mapping."""
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Returns the representation of the hydrated dictionary."""
+        return repr(dict(self.items()))
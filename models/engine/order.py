@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""Module for KeyOrder class."""
+
+from bisect import bisect_left, bisect_right
+
+
+class KeyOrder:
+    """Keys in the order they were stored, for reading them by pages.
+
+    Each key has a rank that grows with the order of insertion, and the
+    ranks are kept in a sorted list next to the keys, so the position of a
+    key is found by bisection even after keys before it were removed.
+    """
+
+    def __init__(self, keys=()):
+        """Initializes the order with keys already stored.
+
+        Args:
+            keys (iterable): The keys, in the order they were stored.
+        """
+        self.__keys = list(keys)
+        self.__ranks = list(range(len(self.__keys)))
+        self.__rank_of = dict(zip(self.__keys, self.__ranks))
+
+    def __len__(self):
+        """Returns the number of keys."""
+        return len(self.__keys)
+
+    def add(self, key):
+        """Appends a key, unless it is already there.
+
+        Args:
+            key (str): The storage key of a new object.
+        """
+        if key in self.__rank_of:
+            return
+        rank = self.__ranks[-1] + 1 if self.__ranks else 0
+        self.__keys.append(key)
+        self.__ranks.append(rank)
+        self.__rank_of[key] = rank
+
+    def discard(self, key):
+        """Removes a key if it is there.
+
+        Args:
+            key (str): The storage key of a removed object.
+        """
+        rank = self.__rank_of.pop(key, None)
+        if rank is None:
+            return
+        i = bisect_left(self.__ranks, rank)
+        del self.__keys[i]
+        del self.__ranks[i]
+
+    def page(self, offset=0, limit=None, after=None):
+        """Returns a slice of the keys.
+
+        Args:
+            offset (int): The number of keys to skip.
+            limit (int): The maximum number of keys, None for all.
+            after (str): The key the slice starts after, or None to start
+                from the first.
+
+        Returns:
+            list: The keys of the slice, in order.
+
+        Raises:
+            KeyError: If after is not one of the keys.
+        """
+        start = offset
+        if after is not None:
+            start += bisect_right(self.__ranks, self.__rank_of[after])
+        stop = None if limit is None else start + limit
+        return self.__keys[start:stop]
@@ -0,0 +1,304 @@
+#!/usr/bin/python3
+"""Module for record files.
+
+A record file stores each object in its own record at a fixed offset, so
+that one object can be read, rewritten or removed without touching the
+others. The file is read through mmap: only the pages of the records
+actually read are loaded.
+
+The file is MAGIC followed by the records. A record is a header (its
+capacity, the length of its value, 0 once freed, and the length of its
+key), the key, the JSON text of the dictionary made by to_dict(), and
+free space so that the object can grow in place. An object that outgrows
+its record is appended to the file and its old record is freed.
+
+The offset of each key is kept in an index file, path + ".index", which
+is rewritten when keys are added, removed or moved. An index that is
+missing or does not match the size of the file is rebuilt by walking the
+record headers.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"HBNR\x01"
+INDEX_MAGIC = b"HBNI\x01"
+
+_RECORD = struct.Struct("<IIH")  # Capacity, length of the value, of the key
+_INDEX = struct.Struct("<QQI")  # Size of the file, freed bytes, keys
+
+
+def is_record_file(path):
+    """Returns True if a file is a record file.
+
+    Args:
+        path (str): The path of the file.
+    """
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _record(key, value):
+    """Returns a new record, with room for its value to grow by a quarter.
+
+    Args:
+        key (bytes): The encoded key.
+        value (bytes): The encoded value.
+    """
+    size = len(key) + len(value)
+    capacity = size + (size >> 2)
+    return b"".join((_RECORD.pack(capacity, len(value), len(key)), key, value,
+                     bytes(capacity - size)))
+
+
+def _encode(value):
+    """Returns the JSON text of a dictionary as bytes."""
+    return json.dumps(value).encode("utf-8")
+
+
+class RecordFile:
+    """Objects stored in records of a file, located through an index.
+
+    Changes are written to the file as they are made; commit() writes the
+    index and frees the records left behind by moved objects.
+
+    Attributes:
+        path (str): The path of the file.
+        size (int): The size of the file.
+        free (int): The bytes of the file held by freed records.
+    """
+
+    def __init__(self, path):
+        """Opens a record file.
+
+        Args:
+            path (str): The path of the file.
+
+        Raises:
+            ValueError: If the file is not a record file.
+        """
+        self.path = path
+        self.__fd = os.open(path, os.O_RDWR)
+        self.__map = None
+        self.__moved = []  # Records to free once the index is written
+        self.__changed = False
+        self.size = os.fstat(self.__fd).st_size
+        self.free = 0
+        if os.pread(self.__fd, len(MAGIC), 0) != MAGIC:
+            self.close()
+            raise ValueError("Not a record file: {}".format(path))
+        if not self.__read_index():
+            self.__scan()
+            self.__changed = True
+
+    @classmethod
+    def write(cls, path, items):
+        """Writes a new record file and its index, and opens it.
+
+        The file is written under a temporary name and then renamed.
+
+        Args:
+            path (str): The path of the file.
+            items (iterable): The (key, dictionary) pairs to store.
+
+        Returns:
+            RecordFile: The new file.
+        """
+        temp = "{}.{}.tmp".format(path, os.getpid())
+        keys, offsets = [], array("Q")
+        try:
+            with open(temp, "wb") as f:
+                f.write(MAGIC)
+                offset = len(MAGIC)
+                for key, value in items:
+                    record = _record(key.encode("utf-8"), _encode(value))
+                    f.write(record)
+                    keys.append(key)
+                    offsets.append(offset)
+                    offset += len(record)
+            os.replace(temp, path)
+        except BaseException:
+            if os.path.isfile(temp):
+                os.remove(temp)
+            raise
+        _write_index(path, offset, 0, keys, offsets)
+        return cls(path)
+
+    def __len__(self):
+        """Returns the number of keys."""
+        return len(self.__offsets)
+
+    def __contains__(self, key):
+        """Returns True if a key is stored."""
+        return key in self.__offsets
+
+    def __iter__(self):
+        """Iterates over the keys, in the order of the index."""
+        return iter(self.__offsets)
+
+    def read(self, key):
+        """Returns the dictionary stored under a key.
+
+        Only the pages holding its record are read from the file.
+
+        Raises:
+            KeyError: If the key is not stored.
+        """
+        offset = self.__offsets[key]
+        view = self.__view(offset + _RECORD.size)
+        capacity, length, key_length = _RECORD.unpack_from(view, offset)
+        if not length:
+            raise KeyError(key)  # Freed by another process
+        start = offset + _RECORD.size + key_length
+        return json.loads(self.__view(start + length)[start:start + length])
+
+    def put(self, key, value):
+        """Stores a dictionary under a key.
+
+        The record of the key is rewritten in place when the new value
+        fits in it; otherwise a new record is appended.
+
+        Args:
+            key (str): The key.
+            value (dict): The dictionary made by to_dict().
+        """
+        data, encoded = _encode(value), key.encode("utf-8")
+        offset = self.__offsets.get(key)
+        if offset is not None:
+            capacity, length, key_length = _RECORD.unpack(
+                os.pread(self.__fd, _RECORD.size, offset))
+            if key_length + len(data) <= capacity:
+                os.pwrite(self.__fd, b"".join((_RECORD.pack(
+                    capacity, len(data), key_length), encoded, data)), offset)
+                return
+            self.__moved.append(offset)
+        record = _record(encoded, data)
+        os.pwrite(self.__fd, record, self.size)
+        self.__offsets[key] = self.size
+        self.size += len(record)
+        self.__changed = True
+
+    def delete(self, key):
+        """Removes a key; nothing happens if it is not stored."""
+        offset = self.__offsets.pop(key, None)
+        if offset is not None:
+            self.__moved.append(offset)
+            self.__changed = True
+
+    def commit(self):
+        """Writes the index, then frees the records no longer indexed."""
+        if not self.__changed:
+            return
+        moved = []
+        for offset in self.__moved:
+            capacity, length, key_length = _RECORD.unpack(
+                os.pread(self.__fd, _RECORD.size, offset))
+            if length:
+                moved.append((offset, capacity, key_length))
+                self.free += _RECORD.size + capacity
+        keys = list(self.__offsets)
+        _write_index(self.path, self.size, self.free, keys,
+                     array("Q", self.__offsets.values()))
+        for offset, capacity, key_length in moved:
+            os.pwrite(self.__fd, _RECORD.pack(capacity, 0, key_length), offset)
+        self.__moved = []
+        self.__changed = False
+
+    def close(self):
+        """Closes the file; pending changes to the index are lost."""
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        if self.__fd is not None:
+            os.close(self.__fd)
+            self.__fd = None
+
+    def __del__(self):
+        """Closes the file when the object is collected."""
+        if getattr(self, "_RecordFile__fd", None) is not None:
+            self.close()
+
+    def __view(self, end):
+        """Returns a map of the file covering at least end bytes."""
+        if self.__map is None or len(self.__map) < end:
+            if self.__map is not None:
+                self.__map.close()
+            self.__map = mmap.mmap(self.__fd, 0, access=mmap.ACCESS_READ)
+        return self.__map
+
+    def __read_index(self):
+        """Loads the index; returns False if it is missing or stale."""
+        try:
+            with open(self.path + ".index", "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+        start = len(INDEX_MAGIC) + _INDEX.size
+        if data[:len(INDEX_MAGIC)] != INDEX_MAGIC or len(data) < start:
+            return False
+        size, free, count = _INDEX.unpack_from(data, len(INDEX_MAGIC))
+        if size != self.size:
+            return False  # The file was written after the index
+        offsets = array("Q")
+        offsets.frombytes(data[start:start + 8 * count])
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        keys = data[start + 8 * count:].decode("utf-8").split("\0")
+        if len(offsets) != count or len(keys) != max(count, 1):
+            return False
+        self.__offsets = dict(zip(keys, offsets))
+        self.free = free
+        return True
+
+    def __scan(self):
+        """Rebuilds the index from the record headers.
+
+        A key found in several records, left by an interrupted move, is
+        stored in the last one.
+        """
+        self.__offsets = {}
+        self.free = 0
+        view = self.__view(self.size)
+        offset = len(MAGIC)
+        while offset + _RECORD.size <= self.size:
+            capacity, length, key_length = _RECORD.unpack_from(view, offset)
+            if offset + _RECORD.size + capacity > self.size:
+                break  # Torn record from an interrupted append
+            if length:
+                start = offset + _RECORD.size
+                key = view[start:start + key_length].decode("utf-8")
+                if key in self.__offsets:
+                    self.__moved.append(self.__offsets[key])
+                self.__offsets[key] = offset
+            else:
+                self.free += _RECORD.size + capacity
+            offset += _RECORD.size + capacity
+        if offset != self.size:
+            self.size = offset
+            os.ftruncate(self.__fd, offset)
+
+
+def _write_index(path, size, free, keys, offsets):
+    """Writes the index of a record file through a temporary file.
+
+    Args:
+        path (str): The path of the record file.
+        size (int): The size of the record file.
+        free (int): The bytes held by freed records.
+        keys (list): The keys.
+        offsets (array): The offset of the record of each key.
+    """
+    if sys.byteorder == "big":
+        offsets = array("Q", offsets)
+        offsets.byteswap()
+    index = path + ".index"
+    temp = "{}.{}.tmp".format(index, os.getpid())
+    with open(temp, "wb") as f:
+        f.write(INDEX_MAGIC + _INDEX.pack(size, free, len(keys)))
+        f.write(offsets.tobytes())
+        f.write("\0".join(keys).encode("utf-8"))
+    os.replace(temp, index)
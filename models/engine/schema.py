@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""Module for the conversion of console values.
+
+Values given to the console arrive as text, or inside the literals of a
+dictionary. A Schema compiles a converter for each typed attribute of
+each class once, from FileStorage.attributes(), so a value is converted
+by one lookup and one call. Literals are parsed by ast.literal_eval(),
+which builds values without running any code, or by the much faster
+json.loads() for the lists and dictionaries both read alike.
+"""
+
+import ast
+import json
+import re
+from datetime import datetime
+
+# Words json.loads() accepts but ast.literal_eval() does not
+_JSON_WORDS = re.compile(r"true|false|null|NaN|Infinity")
+
+
+def literal(text):
+    """Returns the value of a Python literal.
+
+    Args:
+        text (str): A string, number, tuple, list, dictionary, set,
+            boolean or None literal.
+
+    Raises:
+        ValueError: If the text is not a literal.
+    """
+    if (text.startswith(("{", "[")) and "\\" not in text and
+            _JSON_WORDS.search(text) is None):
+        try:
+            return json.loads(text)
+        except (ValueError, RecursionError):
+            pass  # Python syntax, such as single quotes
+    try:
+        return ast.literal_eval(text)
+    except (SyntaxError, ValueError, TypeError, MemoryError, RecursionError):
+        raise ValueError("Not a literal: {!r}".format(text)) from None
+
+
+def to_list(value):
+    """Returns a list from a list, a tuple or the text of a list literal.
+
+    Raises:
+        ValueError: If the value is not a list.
+    """
+    if type(value) is str:
+        value = literal(value)
+    if not isinstance(value, (list, tuple)):
+        raise ValueError("Not a list: {!r}".format(value))
+    return list(value)
+
+
+def to_datetime(value):
+    """Returns a datetime from a datetime or its ISO 8601 text.
+
+    Raises:
+        ValueError: If the text is not an ISO 8601 date.
+        TypeError: If the value is neither a datetime nor text.
+    """
+    if type(value) is datetime:
+        return value
+    return datetime.fromisoformat(value)
+
+
+_CONVERTERS = {
+    str: str,
+    int: int,
+    float: float,
+    list: to_list,
+    datetime: to_datetime
+}
+
+
+class Schema:
+    """The classes of the storage and the converters of their attributes.
+
+    Attributes:
+        classes (dict): The classes by name.
+    """
+
+    def __init__(self, classes, attributes):
+        """Compiles the converters of each class.
+
+        Args:
+            classes (dict): The classes by name, as returned by
+                FileStorage.classes().
+            attributes (dict): The attribute types of each class, as
+                returned by FileStorage.attributes().
+        """
+        self.classes = classes
+        base = attributes.get("BaseModel", {})
+        self.__converters = {}
+        for name in classes:
+            fields = dict(base)
+            fields.update(attributes.get(name, {}))
+            self.__converters[name] = {
+                attr: _CONVERTERS[kind] for attr, kind in fields.items()
+                if kind in _CONVERTERS}
+
+    def converters(self, name):
+        """Returns the converter of each typed attribute of a class.
+
+        The dictionary is shared; it must not be modified.
+
+        Args:
+            name (str): The class name.
+        """
+        return self.__converters.get(name, {})
+
+    def convert(self, name, attr, value):
+        """Returns a value converted to the type of an attribute.
+
+        Values of attributes without a type are returned unchanged.
+
+        Args:
+            name (str): The class name.
+            attr (str): The attribute name.
+            value: The value, or its text.
+
+        Raises:
+            ValueError: If the value cannot be converted.
+            TypeError: If the value has a type that cannot be converted.
+        """
+        convert = self.__converters.get(name, {}).get(attr)
+        return value if convert is None else convert(value)
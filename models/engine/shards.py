@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""Module for sharded storage files.
+
+In the sharded layout each class is stored in its own file, optionally
+split further into partitions by a hash of the key, all in one directory.
+Shards can be decoded in parallel by a pool of worker processes.
+"""
+
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from models.engine import formats
+
+
+def partition(key, partitions):
+    """Returns the partition of a key.
+
+    Args:
+        key (str): The storage key of an object.
+        partitions (int): The number of partitions of its class.
+    """
+    if partitions <= 1:
+        return 0
+    return zlib.crc32(key.encode("utf-8")) % partitions
+
+
+def shard_name(cls, number):
+    """Returns the file name of a shard.
+
+    Args:
+        cls (str): The class name.
+        number (int): The partition.
+    """
+    return "{}.{}".format(cls, number)
+
+
+def list_shards(directory):
+    """Returns the paths of the shards in a directory, largest first."""
+    paths = [os.path.join(directory, name) for name in os.listdir(directory)
+             if not name.endswith(".tmp")]
+    return sorted(paths, key=os.path.getsize, reverse=True)
+
+
+def read_shard(path, attributes):
+    """Returns the (key, dictionary) pairs of one shard.
+
+    Args:
+        path (str): The path of the shard.
+        attributes (dict): The attribute types of each class, as returned
+            by FileStorage.attributes().
+    """
+    codec = formats.get(formats.detect(path), attributes)
+    with codec.open(path, "r") as f:
+        return list(codec.read(f))
+
+
+def read_shards(paths, attributes, workers=1, progress=None):
+    """Yields the (key, dictionary) pairs of several shards.
+
+    The shards are read one after the other, unless several workers are
+    asked for, there are several shards and the platform can fork: they
+    are then decoded by a pool of forked worker processes. Sending the
+    decoded objects back from the workers usually costs more than the
+    decoding saves, so the pool has to be measured before it is used.
+
+    Args:
+        paths (list): The paths of the shards.
+        attributes (dict): The attribute types of each class.
+        workers (int): The number of processes, 1 to read the shards in
+            this process, or 0 for one per CPU.
+        progress (callable): Optional callback receiving the number of
+            bytes of the shards read so far, after each shard.
+    """
+    sizes = {path: os.path.getsize(path) for path in paths}
+    read = 0
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        results = ((path, read_shard(path, attributes)) for path in paths)
+        for path, items in results:
+            read += sizes[path]
+            if progress is not None:
+                progress(read)
+            yield from items
+        return
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        results = pool.map(read_shard, paths, [attributes] * len(paths))
+        for path, items in zip(paths, results):
+            read += sizes[path]
+            if progress is not None:
+                progress(read)
+            yield from items
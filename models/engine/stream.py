@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+"""Module for incremental reading and writing of JSON objects.
+
+The storage file is one JSON object mapping keys to dictionaries. These
+helpers walk it one top-level entry at a time so that the whole document
+never has to be held in memory.
+"""
+
+import json
+from itertools import islice
+
+CHUNK_SIZE = 1 << 16
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+def iter_items(f, chunk_size=CHUNK_SIZE, progress=None):
+    """Yields the (key, value) pairs of a JSON object read from a file.
+
+    Args:
+        f (file): A text file positioned at the start of a JSON object.
+        chunk_size (int): The number of characters read at a time.
+        progress (callable): Optional callback receiving the number of
+            characters read so far after each chunk.
+
+    Raises:
+        ValueError: If the file does not hold a JSON object.
+    """
+    buf = ""
+    pos = 0
+    read = 0
+    eof = False
+
+    def fill():
+        """Reads one more chunk; returns False at the end of the file."""
+        nonlocal buf, pos, read, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        read += len(chunk)
+        if progress is not None:
+            progress(read)
+        return True
+
+    def next_char():
+        """Skips whitespace and returns the next character, or ''."""
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf) or not fill():
+                return buf[pos:pos + 1]
+
+    def decode():
+        """Decodes the next complete JSON value from the buffer."""
+        nonlocal pos
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+                continue
+            if end == len(buf) and not eof and fill():
+                continue  # A number may continue in the next chunk
+            pos = end
+            return value
+
+    if next_char() != "{":
+        raise ValueError("Expecting a JSON object")
+    pos += 1
+    if next_char() == "}":
+        return
+    while True:
+        key = decode()
+        if next_char() != ":":
+            raise ValueError("Expecting ':' delimiter")
+        pos += 1
+        next_char()
+        yield key, decode()
+        char = next_char()
+        pos += 1
+        if char == "}":
+            return
+        if char != ",":
+            raise ValueError("Expecting ',' delimiter")
+        next_char()
+
+
+def write_items(f, items):
+    """Writes (key, value) pairs to a file as one JSON object.
+
+    The output is identical to json.dump() of the equivalent dictionary.
+
+    Args:
+        f (file): A text file opened for writing.
+        items (iterable): The (key, value) pairs to write.
+    """
+    write_encoded(f, (encode_item(key, value) for key, value in items))
+
+
+def encode_item(key, value):
+    """Returns the JSON text of one entry of an object.
+
+    Args:
+        key (str): The key of the entry.
+        value: The value of the entry.
+    """
+    return "{}: {}".format(json.dumps(key), json.dumps(value))
+
+
+def write_encoded(f, entries):
+    """Writes entries made by encode_item() to a file as one JSON object.
+
+    Args:
+        f (file): A text file opened for writing.
+        entries (iterable): The JSON text of each entry.
+    """
+    entries = iter(entries)
+    f.write("{")
+    separator = ""
+    while True:
+        batch = list(islice(entries, 4096))
+        if not batch:
+            break
+        f.write(separator + ", ".join(batch))
+        separator = ", "
+    f.write("}")
@@ -0,0 +1,259 @@
+#!/usr/bin/python3
+"""Defines the HBnB command server.
+
+Usage: server.py [--host HOST] [--port PORT] [--unix PATH] [--commit-every N]
+
+The server loads the storage once and runs the commands of the console
+for many clients at a time, over TCP (127.0.0.1:5555 by default) or a
+Unix socket. Clients send one command per line and may send several
+before reading the answers, which come back in order. Each answer is a
+header line, "ok <length>" or "error <length>", followed by the <length>
+bytes of UTF-8 text the command printed; a command fails when it prints
+an error message ("** " or "*** ") or raises.
+
+Commands run one at a time, so changes never interleave. A client that
+opens a transaction with begin holds the storage until its commit or
+rollback, and the commands of other clients wait for it; the transaction
+is rolled back if the client disconnects first.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import signal
+import sys
+from console import HBNBCommand
+from models import storage
+
+READ_SIZE = 65536
+
+
+class CommandServer:
+    """Runs console commands for the clients of a socket.
+
+    Attributes:
+        commit_every (int): The number of changes of a client after which
+            the storage is saved; 0 to save only when the server stops.
+    """
+
+    def __init__(self, commit_every=1):
+        """Initialize the server.
+
+        Args:
+            commit_every (int): The number of changes between saves.
+        """
+        self.commit_every = commit_every
+        self.__lock = None
+
+    async def start(self, host="127.0.0.1", port=5555, path=None):
+        """Start accepting clients.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The TCP port, 0 for any free port.
+            path (str): The path of a Unix socket, used instead of TCP.
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        self.__lock = asyncio.Lock()
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(self, reader, writer):
+        """Serve one client until it disconnects or quits.
+
+        All the complete lines received at once are run before their
+        answers are written together.
+        Args:
+            reader (asyncio.StreamReader): The stream of the commands.
+            writer (asyncio.StreamWriter): The stream of the answers.
+        """
+        console = HBNBCommand()
+        console.commit_every = self.commit_every
+        holding = stop = False
+        pending = b""
+        try:
+            while not stop:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    if not pending:
+                        break
+                    data, stop = b"\n", True  # Last line without newline
+                lines = (pending + data).split(b"\n")
+                pending = lines.pop()
+                answers = []
+                for line in lines:
+                    if not holding:
+                        if self.__lock.locked():
+                            writer.write(b"".join(answers))
+                            answers = []
+                        await self.__lock.acquire()
+                    line = line.decode("utf-8", "replace").strip()
+                    ok, output, stop = self.run(console, line)
+                    command = console.parseline(line)[0]
+                    if ok and command == "begin":
+                        holding = True
+                    elif ok and command in ("commit", "rollback"):
+                        holding = False
+                    if not holding:
+                        self.__lock.release()
+                    output = output.encode("utf-8")
+                    answers.append(b"%s %d\n%s" % (b"ok" if ok else b"error",
+                                                   len(output), output))
+                    if stop:
+                        break
+                writer.write(b"".join(answers))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if holding:
+                storage.rollback()
+                self.__lock.release()
+            writer.close()
+
+    @staticmethod
+    def run(console, line):
+        """Run one command line and capture what it prints.
+
+        Args:
+            console (HBNBCommand): The console of the client.
+            line (str): The command line.
+        Returns:
+            tuple: Whether the command succeeded, its output, and whether
+                it ends the session.
+        """
+        output = io.StringIO()
+        console.stdout = output
+        stop = False
+        try:
+            with contextlib.redirect_stdout(output):
+                stop = console.onecmd(console.precmd(line))
+        except Exception as error:
+            output.write("*** {}: {}: {}\n".format(
+                line, type(error).__name__, error))
+        text = output.getvalue()
+        return not (text.startswith("**") or "\n**" in text), text, stop
+
+
+class Client:
+    """Client of a command server.
+
+    send() queues commands, which may be pipelined; receive() returns
+    their answers in order.
+    """
+
+    def __init__(self, reader, writer):
+        """Initialize a client on an open connection.
+
+        Args:
+            reader (asyncio.StreamReader): The stream of the answers.
+            writer (asyncio.StreamWriter): The stream of the commands.
+        """
+        self.__reader = reader
+        self.__writer = writer
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=5555, path=None):
+        """Connect to a server.
+
+        Args:
+            host (str): The address of the server.
+            port (int): Its TCP port.
+            path (str): The path of its Unix socket, used instead of TCP.
+        Returns:
+            Client: The connected client.
+        """
+        if path is not None:
+            return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    def send(self, line):
+        """Queue a command line.
+
+        Args:
+            line (str): The command line, without its newline.
+        """
+        self.__writer.write(line.encode("utf-8") + b"\n")
+
+    async def receive(self):
+        """Wait for the answer to the oldest command not answered yet.
+
+        Returns:
+            tuple: Whether the command succeeded and what it printed.
+        """
+        header = await self.__reader.readline()
+        if not header:
+            raise ConnectionError("The server closed the connection")
+        status, length = header.split()
+        output = await self.__reader.readexactly(int(length))
+        return status == b"ok", output.decode("utf-8")
+
+    async def call(self, line):
+        """Send a command line and wait for its answer.
+
+        Args:
+            line (str): The command line.
+        Returns:
+            tuple: Whether the command succeeded and what it printed.
+        """
+        self.send(line)
+        await self.__writer.drain()
+        return await self.receive()
+
+    async def close(self):
+        """Close the connection."""
+        self.__writer.close()
+        await self.__writer.wait_closed()
+
+
+async def serve(host="127.0.0.1", port=5555, path=None, commit_every=1):
+    """Run a server until SIGINT or SIGTERM, then save the storage.
+
+    Args:
+        host (str): The address to listen on.
+        port (int): The TCP port.
+        path (str): The path of a Unix socket, used instead of TCP.
+        commit_every (int): The number of changes between saves.
+    """
+    server = await CommandServer(commit_every).start(host, port, path)
+    stopped = asyncio.get_running_loop().create_future()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            asyncio.get_running_loop().add_signal_handler(
+                signum, lambda: stopped.done() or stopped.set_result(None))
+    where = path or "{}:{}".format(*server.sockets[0].getsockname()[:2])
+    print("Serving on {}".format(where), file=sys.stderr, flush=True)
+    try:
+        async with server:
+            await stopped
+    finally:
+        storage.flush()
+
+
+def main(argv=None):
+    """Run the command server.
+
+    Args:
+        argv (list): The command line arguments, sys.argv[1:] if None.
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description="HBnB command server")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=5555,
+                        help="TCP port (default: 5555)")
+    parser.add_argument("--unix", metavar="PATH",
+                        help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--commit-every", type=int, default=1, metavar="N",
+                        help="save after every N changes of a client, "
+                             "0 to save only on exit (default: 1)")
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.host, args.port, args.unix, args.commit_every))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""Unittest package for HBnB, with the storage reset the tests share."""
+
+import os
+import shutil
+import unittest
+from models import storage
+from models.engine.file_storage import FileStorage
+
+# The FileStorage modes and their plain values: one JSON file, rewritten
+# by every save
+PLAIN_MODES = {
+    "journal": False,
+    "journal_limit": 1000,
+    "write_behind": False,
+    "flush_interval": 1.0,
+    "flush_size": 10000,
+    "shared": False,
+    "sharded": False,
+    "shard_partitions": 1,
+    "reload_workers": 1,
+    "format": "json",
+    "compression": None,
+    "compression_level": None,
+    "lazy": False,
+    "compact": False
+}
+
+# The modes set by the environment (HBNB_STORAGE_JOURNAL=1, ...) when
+# models was imported, which the whole suite can run in
+MODES = {name: getattr(FileStorage, "_FileStorage__" + name)
+         for name in PLAIN_MODES}
+
+# Decorator of the tests of FileStorage, which models only use when
+# HBNB_TYPE_STORAGE does not select another engine
+file_storage_only = unittest.skipUnless(
+    isinstance(storage, FileStorage), "models use another storage engine")
+
+
+def reset_storage(plain=False):
+    """Empties the storage and removes its files.
+
+    The FileStorage modes are set back to those of the environment, or to
+    the plain ones, which the tests of a single mode start from. With
+    HBNB_TYPE_STORAGE=db, the database is removed and opened again too.
+
+    Args:
+        plain (bool): True for the plain modes.
+    """
+    with FileStorage._FileStorage__lock:
+        for name, value in (PLAIN_MODES if plain else MODES).items():
+            setattr(FileStorage, "_FileStorage__" + name, value)
+        if FileStorage._FileStorage__records is not None:
+            FileStorage._FileStorage__records.close()
+        state = {"objects": {}, "dirty": {}, "undo": None,
+                 "undo_dirty": None, "journal_records": 0, "pending": False,
+                 "seen": None, "records": None, "encoded": {},
+                 "encoded_for": None, "encoded_as": None,
+                 "encoded_mutable": set(), "shard_keys": {},
+                 "partitioned": None}
+        for name, value in state.items():
+            setattr(FileStorage, "_FileStorage__" + name, value)
+        path = os.path.abspath(FileStorage._FileStorage__file_path)
+        directory, base = os.path.split(path)
+        paths = [os.path.join(directory, name)
+                 for name in os.listdir(directory)
+                 if name == base or name.startswith(base + ".")]
+        paths.append(FileStorage._FileStorage__journal_path)
+        for path in paths:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.isfile(path):
+                os.remove(path)
+    if not isinstance(storage, FileStorage):
+        storage.close()
+        for suffix in ("", "-wal", "-shm"):
+            path = storage._DBStorage__db_path + suffix
+            if os.path.isfile(path):
+                os.remove(path)
+        storage.reload()
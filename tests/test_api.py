@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+"""Unittest module for the HTTP JSON API."""
+
+import http.client
+import json
+import threading
+import time
+import unittest
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from api import PooledHTTPServer
+from tests import reset_storage
+
+
+class TestAPI(unittest.TestCase):
+    """Test Cases for the HTTP JSON API."""
+
+    def setUp(self):
+        """Stores a few objects and starts a server on a free port."""
+        reset_storage()
+        self.state = State()
+        self.cities = [City(), City()]
+        for city in self.cities:
+            city.state_id = self.state.id
+        self.amenity = Amenity()
+        self.places = []
+        for i in range(5):
+            place = Place()
+            place.city_id = self.cities[i % 2].id
+            place.price_by_night = 50 * i
+            place.amenity_ids = [self.amenity.id]
+            self.places.append(place)
+        self.user = User()
+        self.user.password = "secret"
+        self.server = PooledHTTPServer(("127.0.0.1", 0), workers=2)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.connection = http.client.HTTPConnection(
+            *self.server.server_address[:2])
+
+    def tearDown(self):
+        """Stops the server."""
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+        reset_storage()
+
+    def request(self, path, **headers):
+        """Sends a GET on the kept-alive connection.
+
+        Returns:
+            tuple: The status, the headers and the decoded body, or None.
+        """
+        self.connection.request("GET", path, headers=headers)
+        response = self.connection.getresponse()
+        body = response.read()
+        return (response.status, response.headers,
+                json.loads(body) if body else None)
+
+    def test_get(self):
+        """Tests collections, objects, filters and linked collections."""
+        status, headers, body = self.request("/places")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["count"], 5)
+        self.assertEqual([item["id"] for item in body["items"]],
+                         [place.id for place in self.places])
+        status, headers, body = self.request(
+            "/places?city_id={}&price_by_night__gt=50".format(
+                self.cities[0].id))
+        self.assertEqual([item["id"] for item in body["items"]],
+                         [self.places[2].id, self.places[4].id])
+        status, headers, body = self.request("/users/" + self.user.id)
+        self.assertEqual(body["id"], self.user.id)
+        self.assertNotIn("password", body)
+        status, headers, body = self.request(
+            "/states/{}/cities".format(self.state.id))
+        self.assertEqual(body["count"], 2)
+        status, headers, body = self.request(
+            "/places/{}/amenities".format(self.places[0].id))
+        self.assertEqual(body["items"][0]["id"], self.amenity.id)
+        for path, expected in (("/places/nope", 404), ("/nope", 404),
+                               ("/places?limit=x", 400),
+                               ("/places?max_guest=many", 400),
+                               ("/places?cls=1", 400),
+                               ("/places?after=nope", 400),
+                               ("/places?max_guest=0&after=nope", 400),
+                               ("/states/{}/cities?after={}".format(
+                                   self.state.id, self.places[0].id), 400)):
+            self.assertEqual(self.request(path)[0], expected)
+
+    def test_pages(self):
+        """Tests that next links walk through the collection."""
+        ids, path = [], "/places?limit=2"
+        while path:
+            status, headers, body = self.request(path)
+            ids.extend(item["id"] for item in body["items"])
+            path = body["next"]
+        self.assertEqual(ids, [place.id for place in self.places])
+        status, headers, body = self.request("/places?limit=2&offset=4")
+        self.assertEqual(([i["id"] for i in body["items"]], body["next"]),
+                         ([self.places[4].id], None))
+
+    def test_conditional(self):
+        """Tests 304 answers until an object of the answer changes."""
+        path = "/places/" + self.places[0].id
+        status, headers, body = self.request(path)
+        tag, modified = headers["ETag"], headers["Last-Modified"]
+        self.assertEqual(self.request(path, **{"If-None-Match": tag})[:3:2],
+                         (304, None))
+        self.assertEqual(self.request(
+            path, **{"If-Modified-Since": modified})[0], 304)
+        status, headers, body = self.request("/places?limit=2")
+        listing = headers["ETag"]
+        self.assertNotIn("Last-Modified", headers)
+        self.assertEqual(self.request(
+            "/places?limit=2", **{"If-None-Match": listing})[0], 304)
+        self.assertEqual(self.request(
+            "/places?limit=2", **{"If-Modified-Since": modified})[0], 200)
+        self.places[0].save()
+        self.assertEqual(self.request(path, **{"If-None-Match": tag})[0], 200)
+        self.assertEqual(self.request(
+            "/places?limit=2", **{"If-None-Match": listing})[0], 200)
+
+    def test_idle_connections(self):
+        """Tests that idle kept-alive connections hold no thread."""
+        idle = [http.client.HTTPConnection(*self.server.server_address[:2])
+                for _ in range(2)]  # As many as the workers
+        try:
+            for connection in idle:
+                connection.request("GET", "/states")
+                connection.getresponse().read()
+            started = time.monotonic()
+            self.assertEqual(self.request("/states")[0], 200)
+            self.assertLess(time.monotonic() - started, 2)
+            for connection in idle:
+                connection.request("GET", "/states")
+                self.assertEqual(connection.getresponse().status, 200)
+        finally:
+            for connection in idle:
+                connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,266 @@
+#!/usr/bin/python3
+"""Unittest module for the HBNBCommand console."""
+
+import shlex
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from console import HBNBCommand, split_args
+from models import storage
+from tests import reset_storage
+
+
+class TestHBNBCommand(unittest.TestCase):
+    """Test Cases for the HBNBCommand console."""
+
+    def setUp(self):
+        """Sets up test methods."""
+        reset_storage()
+
+    def tearDown(self):
+        """Tears down test methods."""
+        reset_storage()
+
+    def run_command(self, line):
+        """Runs one console line and returns what it printed."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd(line)
+        return output.getvalue().strip()
+
+    def test_create_show(self):
+        """Tests create followed by show."""
+        uid = self.run_command("create User")
+        self.assertIn("User." + uid, storage.all("User"))
+        self.assertTrue(self.run_command("show User " + uid)
+                        .startswith("[User] ({})".format(uid)))
+        self.assertEqual(self.run_command('User.show("nope")'),
+                         "** no instance found **")
+
+    def test_count_all(self):
+        """Tests count and all for one class."""
+        for _ in range(3):
+            self.run_command("create Place")
+        self.run_command("create City")
+        self.assertEqual(self.run_command("count Place"), "3")
+        self.assertEqual(self.run_command("City.count()"), "1")
+        self.assertEqual(self.run_command("count"), "** class name missing **")
+        self.assertEqual(self.run_command("count Foo"),
+                         "** class doesn't exist **")
+        self.assertEqual(len(eval(self.run_command("Place.all()"))), 3)
+        self.assertEqual(len(eval(self.run_command("all"))), 4)
+
+    def test_all_pages(self):
+        """Tests limit, offset, after and compact for all."""
+        ids = [self.run_command("create Place") for _ in range(5)]
+        self.run_command("create City")
+        page = eval(self.run_command("Place.all(limit=2)"))
+        self.assertEqual([p.split()[1] for p in page],
+                         ["({})".format(i) for i in ids[:2]])
+        page = eval(self.run_command(
+            "Place.all(limit=2, after={})".format(ids[1])))
+        self.assertEqual([p.split()[1] for p in page],
+                         ["({})".format(i) for i in ids[2:4]])
+        lines = self.run_command("all Place offset=3 compact").splitlines()
+        self.assertEqual([line.split()[1] for line in lines],
+                         ["({})".format(i) for i in ids[3:]])
+        self.assertEqual(self.run_command("all limit=0"), "[]")
+        self.assertEqual(len(eval(self.run_command("all offset=1"))), 5)
+        self.assertEqual(self.run_command("all Place limit=-1"),
+                         "** invalid arguments **")
+        self.assertEqual(self.run_command("Place.all(page=2)"),
+                         "** invalid arguments **")
+        self.assertEqual(self.run_command("all Place after=nope"),
+                         "** no instance found **")
+
+    def test_update_destroy(self):
+        """Tests update and destroy of an instance."""
+        uid = self.run_command("create Place")
+        self.assertEqual(storage.find("Place", max_guest__gt=2), {})
+        self.run_command("update Place {} max_guest 4".format(uid))
+        self.assertEqual(storage.get("Place", uid).max_guest, 4)
+        self.assertEqual(list(storage.find("Place", max_guest__gt=2)),
+                         ["Place." + uid])
+        self.run_command("update Place {} city_id b".format(uid))
+        self.assertEqual(list(storage.find("Place", city_id="b")),
+                         ["Place." + uid])
+        self.run_command('Place.update("{}", {{"name": "Loft"}})'.format(uid))
+        self.assertEqual(storage.get("Place", uid).name, "Loft")
+        self.run_command('Place.update("{}", {{"amenity_ids": "[\'a\']", '
+                         '"created_at": "2024-01-02T03:04:05"}})'.format(uid))
+        obj = storage.get("Place", uid)
+        self.assertEqual(obj.amenity_ids, ["a"])
+        self.assertEqual(obj.created_at.year, 2024)
+        self.assertEqual(
+            self.run_command("update Place {} latitude north".format(uid)),
+            "** invalid value for latitude **")
+        self.assertEqual(
+            self.run_command("update Place {} __import__('os')".format(uid)),
+            "** value missing **")
+        self.run_command("destroy Place " + uid)
+        self.assertEqual(storage.count("Place"), 0)
+
+    def test_transaction(self):
+        """Tests begin, commit and rollback."""
+        kept = self.run_command("create User")
+        self.run_command("begin")
+        self.assertEqual(self.run_command("begin"),
+                         "** transaction already open **")
+        self.run_command("update User {} first_name Lost".format(kept))
+        self.run_command("destroy User " + kept)
+        self.run_command("create User")
+        self.assertEqual(self.run_command("count User"), "1")
+        self.run_command("rollback")
+        self.assertEqual(self.run_command("count User"), "1")
+        self.assertNotIn("first_name", storage.get("User", kept).__dict__)
+        self.run_command("begin")
+        self.run_command('User.update_where({{"id": "{}"}}, '
+                         '{{"first_name": "Kept"}})'.format(kept))
+        self.run_command("commit")
+        storage.reload()
+        self.assertEqual(storage.get("User", kept).first_name, "Kept")
+        for command in ("commit", "rollback"):
+            self.assertEqual(self.run_command(command),
+                             "** no transaction open **")
+
+    def test_split_args(self):
+        """Tests that arguments split into the tokens of shlex.split()."""
+        for arg in ('', 'Place 1 name "My Loft"', "a'b c'd \"\" ''",
+                    '"x y",  z\t', 'a\\ b "c\\"d"', "'a\\'"):
+            self.assertEqual(split_args(arg), shlex.split(arg))
+        with self.assertRaises(ValueError):
+            split_args('name "unclosed')
+        self.assertEqual(self.run_command("show"), "** class name missing **")
+        self.assertEqual(self.run_command("Place.show()"),
+                         "** instance id missing **")
+        self.assertEqual(self.run_command("Place.nope()"),
+                         "*** Unknown syntax: Place.nope()")
+
+    def test_near(self):
+        """Tests the spatial commands."""
+        close = self.run_command("create Place")
+        far = self.run_command("create Place")
+        self.run_command('Place.update("{}", {{"latitude": 48.85, '
+                         '"longitude": 2.35}})'.format(close))
+        self.run_command('Place.update("{}", {{"latitude": 45.76, '
+                         '"longitude": 4.83}})'.format(far))
+        found = eval(self.run_command("Place.near(48.86, 2.34, 5)"))
+        self.assertEqual(len(found), 1)
+        self.assertIn(close, found[0])
+        found = eval(self.run_command("Place.nearest(48.86, 2.34, 2)"))
+        self.assertIn(far, found[1])
+        found = eval(self.run_command("within Place 45 4 46 5"))
+        self.assertIn(far, found[0])
+        self.run_command("update Place {} latitude 48.851".format(far))
+        self.run_command("update Place {} longitude 2.351".format(far))
+        found = eval(self.run_command("Place.near(48.86, 2.34, 5)"))
+        self.assertEqual(len(found), 2)
+        self.assertEqual(eval(self.run_command("within Place 45 4 46 5")), [])
+        self.assertEqual(self.run_command("near City 1 2 3"),
+                         "** class has no coordinates **")
+        self.assertEqual(self.run_command("near Place 1 2"),
+                         "** coordinates missing **")
+        self.assertEqual(self.run_command("near Place a b c"),
+                         "** invalid coordinates **")
+        for line in ("Place.nearest(48.86, 2.34, 2.7)",
+                     "nearest Place 48.86 2.34 -1",
+                     "nearest Place 48.86 2.34 inf"):
+            self.assertEqual(self.run_command(line), "** invalid arguments **")
+
+    def test_bulk(self):
+        """Tests create_many, update_where and destroy_where."""
+        self.assertTrue(self.run_command(
+            'Place.create_many(3, {"name": "Loft", "max_guest": "2"})')
+            .startswith("3 Place instances created in "))
+        self.run_command('create_many Place 2, {"name": "Barn"}')
+        self.assertEqual(storage.count("Place"), 5)
+        self.assertEqual(len(storage.find("Place", max_guest=2)), 3)
+        self.assertTrue(self.run_command(
+            'Place.update_where({"name": "Loft"}, {"price_by_night": 80})')
+            .startswith("3 Place instances updated in "))
+        self.assertEqual(len(storage.find("Place", price_by_night__gt=50)), 3)
+        self.run_command('Place.update_where({"name": "Loft"}, '
+                         '{"amenity_ids": ["a1"]})')
+        lists = [p.amenity_ids for p in storage.find("Place", name="Loft")
+                 .values()]
+        self.assertEqual(lists, [["a1"]] * 3)
+        self.assertEqual(len(set(map(id, lists))), 3)
+        self.assertTrue(self.run_command(
+            'Place.destroy_where({"price_by_night__ge": 80})')
+            .startswith("3 Place instances destroyed in "))
+        self.assertEqual(storage.count("Place"), 2)
+        self.assertTrue(self.run_command(
+            'Place.update_where({"max_guest": None}, {"name": "x"})')
+            .startswith("0 Place instances updated in "))
+        self.assertTrue(self.run_command('Place.destroy_where({"cls": 1})')
+                        .startswith("0 Place instances destroyed in "))
+        self.run_command("Place.destroy_where({})")
+        self.assertEqual(storage.count("Place"), 0)
+        self.assertEqual(storage.dirty(), {})
+
+    def test_bulk_errors(self):
+        """Tests the errors of the bulk commands."""
+        self.assertEqual(self.run_command("create_many"),
+                         "** class name missing **")
+        self.assertEqual(self.run_command("Foo.create_many(1)"),
+                         "** class doesn't exist **")
+        for line in ('Place.create_many("2")', "Place.create_many(-1)",
+                     "Place.update_where({})", "destroy_where Place",
+                     "Place.destroy_where({}, {})"):
+            self.assertEqual(self.run_command(line), "** invalid arguments **")
+        self.assertEqual(
+            self.run_command('Place.create_many(1, {"max_guest": "x"})'),
+            "** invalid value for max_guest **")
+        self.assertEqual(storage.count("Place"), 0)
+
+    def run_batch(self, lines, commit_every=0, stop_on_error=False):
+        """Runs a batch and returns its result, the saves and the output.
+
+        The final flush is not counted as a save.
+        """
+        console = HBNBCommand()
+        with patch("sys.stdout", new=StringIO()) as output, \
+                patch.object(storage, "save", wraps=storage.save) as save, \
+                patch.object(storage, "flush") as flush:
+            result = console.run_batch(lines, commit_every, stop_on_error)
+        self.assertTrue(flush.called)
+        storage.flush()
+        return result, save.call_count, output.getvalue().splitlines()
+
+    def test_batch(self):
+        """Tests that a batch saves once, at the end."""
+        lines = ["create Place", "", "# comment", "create Place",
+                 "count Place", "destroy Place nope"]
+        (commands, errors, seconds), saves, output = self.run_batch(lines)
+        self.assertEqual((commands, errors), (4, 1))
+        self.assertEqual(output[2:], ["2", "** no instance found **"])
+        self.assertEqual(saves, 0)
+        self.assertEqual(storage.dirty(), {})
+        storage.reload()
+        self.assertEqual(storage.count("Place"), 2)
+
+    def test_batch_commit_every(self):
+        """Tests saves every N changes and stopping at the first error."""
+        lines = ["create User"] * 5
+        result, saves, output = self.run_batch(lines, commit_every=2)
+        self.assertEqual(saves, 2)
+        lines = ["create User", "update User nope", 'User.update("x", {',
+                 "create User"]
+        (commands, errors, seconds), saves, output = self.run_batch(
+            lines, stop_on_error=True)
+        self.assertEqual((commands, errors), (2, 1))
+        self.assertEqual(storage.count("User"), 6)
+        uid = self.run_command("create User")
+        lines = ['User.update("{}", {{"age": 1 / 0}})'.format(uid)]
+        (commands, errors, seconds), saves, output = self.run_batch(lines)
+        self.assertEqual(errors, 1)
+        self.assertEqual(output[0], "** value missing **")
+        with patch.object(HBNBCommand, "do_count",
+                          side_effect=ZeroDivisionError):
+            (commands, errors, seconds), saves, output = self.run_batch(
+                ["count User"])
+        self.assertEqual(errors, 1)
+        self.assertIn("ZeroDivisionError", output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,23 +11,18 @@ from datetime import datetime
 from models import storage
 from models.base_model import BaseModel
 from models.engine.file_storage import FileStorage
+from tests import file_storage_only, reset_storage
 
 class TestBaseModel(unittest.TestCase):
     """Test cases for the BaseModel class."""
 
     def setUp(self):
         """Set up the test environment. This is run before each test."""
-        self.reset_storage()
+        reset_storage(plain=True)  # The tests read file.json as JSON
 
     def tearDown(self):
         """Tear down the test environment. This is run after each test."""
-        self.reset_storage()
-
-    def reset_storage(self):
-        """Reset the FileStorage data to a clean state."""
-        FileStorage._FileStorage__objects = {}  # Clear the objects dictionary
-        if os.path.isfile(FileStorage._FileStorage__file_path):  # Check if file exists
-            os.remove(FileStorage._FileStorage__file_path)  # Remove the storage file
+        reset_storage()
 
     def test_instantiation(self):
         """Test instantiation of the BaseModel class."""
@@ -148,6 +143,39 @@ class TestBaseModel(unittest.TestCase):
         # Check that the instance created from dict matches the original dict
         self.assertEqual(o.to_dict(), d)
 
+    def test_from_dict(self):
+        """Test that from_dict() rebuilds an instance without registering it."""
+        b = BaseModel()
+        b.name = "Holberton"
+        d = b.to_dict()
+        reset_storage(plain=True)
+        o = BaseModel.from_dict(d)
+        self.assertEqual(o.to_dict(), d)
+        self.assertIsInstance(o.created_at, datetime)
+        self.assertEqual(storage.count(), 0)
+
+    def test_from_dicts(self):
+        """Test that from_dicts() picks the class named in each dictionary."""
+        from models.user import User
+        dicts = [User().to_dict(), BaseModel().to_dict()]
+        objs = list(BaseModel.from_dicts(dicts))
+        self.assertEqual([type(o) for o in objs], [User, BaseModel])
+        self.assertEqual([o.to_dict() for o in objs], dicts)
+
+    def test_create_many(self):
+        """Test that create_many() registers instances with the attributes."""
+        from models.place import Place
+        objs = Place.create_many(3, {"name": "Loft", "id": "same",
+                                     "amenity_ids": ["wifi"]})
+        self.assertEqual(len({o.id for o in objs}), 3)
+        for o in objs:
+            self.assertIs(storage.all()["Place." + o.id], o)
+            self.assertEqual(o.name, "Loft")
+            self.assertIsInstance(o.created_at, datetime)
+        objs[0].amenity_ids.append("pool")
+        self.assertEqual(objs[1].amenity_ids, ["wifi"])
+
+    @file_storage_only
     def test_save_storage_call(self):
         """Test that storage.save() is called from save()."""
         b = BaseModel()
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""Unittest module for the ColumnStore class."""
+
+import unittest
+from types import SimpleNamespace
+from models.engine import columns
+from models.engine.columns import ColumnStore
+
+
+class TestColumnStore(unittest.TestCase):
+    """Test Cases for the ColumnStore class."""
+
+    def setUp(self):
+        """Fills a store with five rows."""
+        self.store = ColumnStore(["price", "guests"])
+        for i in range(5):
+            self.store.add("k{}".format(i),
+                           SimpleNamespace(price=100 + 10 * i, guests=i))
+
+    def test_select(self):
+        """Tests single and combined predicates."""
+        self.assertEqual(self.store.select([("price", "le", 120)]),
+                         ["k0", "k1", "k2"])
+        self.assertEqual(self.store.select([("price", "le", 120),
+                                            ("guests", "ge", 1)]),
+                         ["k1", "k2"])
+        self.assertEqual(self.store.select([("guests", "eq", 9)]), [])
+        self.assertEqual(len(self.store.select([])), 5)
+
+    def test_select_without_numpy(self):
+        """Tests the pure Python evaluation path."""
+        numpy, columns.numpy = columns.numpy, None
+        try:
+            self.test_select()
+            self.assertIsNone(self.store.select([("price", "ge", 110)], 3))
+            self.assertEqual(self.store.select([("price", "ge", 120)], 3),
+                             ["k2", "k3", "k4"])
+        finally:
+            columns.numpy = numpy
+
+    def test_update_discard(self):
+        """Tests that rows follow updates and deletions."""
+        self.store.add("k0", SimpleNamespace(price=500, guests=0))
+        self.store.discard("k1")
+        self.store.discard("missing")
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(sorted(self.store.select([("price", "lt", 200)])),
+                         ["k2", "k3", "k4"])
+        self.assertEqual(self.store.select([("price", "gt", 200)]), ["k0"])
+
+    def test_not_a_number(self):
+        """Tests that values which are not numbers never match."""
+        self.store.add("k0", SimpleNamespace(price="cheap", guests=None))
+        self.assertNotIn("k0", self.store.select([("price", "ge", 0)]))
+        self.store.clear()
+        self.assertEqual(self.store.select([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
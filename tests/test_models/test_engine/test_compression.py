@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""Unittest module for compressed storage files."""
+
+import gzip
+import lzma
+import os
+import tempfile
+import unittest
+import zlib
+from models.engine import compression
+
+
+class TestCompression(unittest.TestCase):
+    """Test Cases for open_file and detect."""
+
+    data = os.urandom(1000) + b'{"User.1": {"id": "1"}}' * 20000
+
+    def setUp(self):
+        """Creates a temporary file name."""
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        """Removes the temporary file."""
+        os.remove(self.path)
+
+    def write(self, codec, level=None):
+        """Writes data in small pieces and returns the file contents."""
+        with compression.open_file(self.path, "w", codec, level) as f:
+            for i in range(0, len(self.data), 777):
+                f.write(self.data[i:i + 777])
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test_roundtrip(self):
+        """Tests that each codec reads back what it wrote."""
+        for codec in (None,) + compression.CODECS:
+            self.write(codec)
+            with compression.open_file(self.path) as f:
+                self.assertEqual(f.read(), self.data)
+
+    def test_standard(self):
+        """Tests that the files are readable by the standard modules."""
+        decompress = {"zlib": zlib.decompress, "gzip": gzip.decompress,
+                      "lzma": lzma.decompress}
+        for codec in compression.CODECS:
+            raw = self.write(codec)
+            self.assertEqual(compression.detect(raw[:6]), codec)
+            self.assertEqual(decompress[codec](raw), self.data)
+            self.assertLess(len(raw), len(self.data) / 10)
+        self.assertIsNone(compression.detect(b'{"a": 1}'))
+        self.assertIsNone(compression.detect(b"HBNB\x01"))
+
+    def test_level(self):
+        """Tests that a higher level gives a smaller file."""
+        self.assertGreater(len(self.write("zlib", 1)),
+                           len(self.write("zlib", 9)))
+
+    def test_progress(self):
+        """Tests that progress reports the compressed bytes read."""
+        for codec in (None, "gzip"):
+            size = len(self.write(codec))
+            seen = []
+            with compression.open_file(self.path, progress=seen.append) as f:
+                while f.read(1000):
+                    pass
+            self.assertEqual(seen[-1], size)
+
+    def test_truncated(self):
+        """Tests that a truncated stream raises EOFError."""
+        for codec in compression.CODECS:
+            raw = self.write(codec)
+            with open(self.path, "wb") as f:
+                f.write(raw[:len(raw) // 2])
+            with compression.open_file(self.path) as f:
+                with self.assertRaises(EOFError):
+                    f.read()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/python3
+"""Unittest module for the DBStorage class."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from models.base_model import BaseModel
+from models.city import City
+from models.engine.db_storage import DBStorage
+from models.place import Place
+from models.user import User
+
+
+class TestDBStorage(unittest.TestCase):
+    """Test Cases for the DBStorage class."""
+
+    def setUp(self):
+        """Opens a storage on a database in a temporary directory."""
+        self.tmp = tempfile.mkdtemp()
+        self.path = DBStorage._DBStorage__db_path
+        self.storage = DBStorage()
+        self.storage.close()
+        DBStorage._DBStorage__db_path = os.path.join(self.tmp, "test.db")
+        self.storage.reload()
+
+    def tearDown(self):
+        """Closes the storage and removes the database."""
+        self.storage.close()
+        DBStorage._DBStorage__db_path = self.path
+        DBStorage._DBStorage__objects = {}
+        shutil.rmtree(self.tmp)
+
+    def add(self, obj, **attrs):
+        """Sets attributes on an object and adds it to the storage."""
+        for name, value in attrs.items():
+            setattr(obj, name, value)
+        self.storage.new(obj)
+        return obj
+
+    def test_docs(self):
+        """Tests that the interface of FileStorage is documented."""
+        for name in ("all", "new", "save", "reload", "classes",
+                     "attributes", "get", "find", "count", "delete"):
+            self.assertIsNotNone(getattr(DBStorage, name).__doc__)
+
+    def test_roundtrip(self):
+        """Tests that objects come back unchanged after a reload."""
+        place = self.add(Place(), name="Loft", max_guest=4, latitude=1.5,
+                         amenity_ids=["a", "b"], extra="kept",
+                         number_rooms="three")
+        user = self.add(User(), email="a@b.c")
+        expected = {"Place." + place.id: place.to_dict(),
+                    "User." + user.id: user.to_dict()}
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual({k: v.to_dict()
+                          for k, v in self.storage.all().items()}, expected)
+        self.assertIsInstance(self.storage.get(Place, place.id), Place)
+        self.assertIs(self.storage.get(Place, place.id),
+                      self.storage.all(Place)["Place." + place.id])
+        self.assertIsNone(self.storage.get("Place", "nope"))
+        self.assertEqual(self.storage.all("Nope"), {})
+
+    def test_count_delete(self):
+        """Tests that counts follow additions and deletions."""
+        users = [self.add(User()) for _ in range(3)]
+        self.add(BaseModel())
+        self.assertEqual(self.storage.count(), 4)
+        self.assertEqual(self.storage.count(User), 3)
+        self.storage.delete(users[0])
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual(self.storage.count("User"), 2)
+        self.assertIsNone(self.storage.get(User, users[0].id))
+
+    def test_page(self):
+        """Tests that pages follow the order of all() across tables."""
+        users = [self.add(User()) for _ in range(3)]
+        places = [self.add(Place()) for _ in range(3)]
+        self.storage.save()
+        users[0].email = "a@b.c"  # Updated in place, not moved to the end
+        self.storage.save()
+        self.storage.reload()
+        keys = list(self.storage.all())
+        self.assertEqual(list(self.storage.page(User)),
+                         ["User." + u.id for u in users])
+        self.assertEqual(list(self.storage.page(limit=2, offset=1)),
+                         keys[1:3])
+        for i in range(len(keys)):
+            self.assertEqual(list(self.storage.page(
+                limit=3, after=keys[i].partition(".")[2])), keys[i + 1:i + 4])
+        self.assertEqual(list(self.storage.page(Place, 1, 1, places[0].id)),
+                         ["Place." + places[2].id])
+        self.assertEqual(self.storage.page(limit=0), {})
+        self.assertEqual(self.storage.page(offset=9), {})
+        with self.assertRaises(KeyError):
+            self.storage.page(Place, after=users[0].id)
+        self.assertIs(self.storage.page(Place, 1)["Place." + places[0].id],
+                      self.storage.get(Place, places[0].id))
+
+    def test_uncommitted(self):
+        """Tests that reload() drops the changes that were not saved."""
+        self.add(User())
+        self.storage.save()
+        self.add(User())
+        self.storage.reload()
+        self.assertEqual(self.storage.count(User), 1)
+
+    def test_transaction(self):
+        """Tests that commit() keeps and rollback() undoes the changes."""
+        kept = self.add(User(), email="kept@hbnb.io")
+        self.storage.save()
+        with self.storage.transaction():
+            self.add(User())
+            self.storage.save()
+            with self.assertRaises(RuntimeError):
+                self.storage.begin()
+        self.assertEqual(self.storage.dirty(), {})
+        self.storage.begin()
+        self.add(self.storage.get(User, kept.id), email="lost@hbnb.io")
+        self.add(User())
+        self.storage.save()
+        self.assertEqual(self.storage.count(User), 3)
+        self.storage.rollback()
+        self.assertEqual(self.storage.count(User), 2)
+        self.assertEqual(self.storage.get(User, kept.id).email,
+                         "kept@hbnb.io")
+        with self.assertRaises(RuntimeError):
+            self.storage.commit()
+
+    def test_find(self):
+        """Tests equality, range and default value filters."""
+        city = self.add(City())
+        places = [self.add(Place(), city_id=city.id, price_by_night=50 * i)
+                  for i in range(4)]
+        unset = self.add(Place())
+        self.storage.save()
+        self.assertEqual(set(self.storage.find(Place, city_id=city.id)
+                             .values()), set(places))
+        self.assertEqual(list(self.storage.find(Place, city_id="").values()),
+                         [unset])
+        found = self.storage.find(Place, city_id=city.id,
+                                  price_by_night__gt=0, price_by_night__le=100)
+        self.assertEqual(set(found.values()), {places[1], places[2]})
+        self.assertEqual(len(self.storage.find(Place,
+                                               price_by_night__lt=50)), 2)
+        self.assertEqual(len(self.storage.find(Place, missing="x")), 0)
+        self.assertEqual(self.storage.find(Place, cls=Place, self=None), {})
+
+    def test_spatial(self):
+        """Tests radius, nearest and bounding box queries."""
+        paris = self.add(Place(), latitude=48.85, longitude=2.35)
+        lyon = self.add(Place(), latitude=45.76, longitude=4.83)
+        fiji = self.add(Place(), latitude=-17.7, longitude=179.9)
+        self.assertEqual(list(self.storage.near(Place, 48.86, 2.34, 5)
+                              .values()), [paris])
+        self.assertEqual(list(self.storage.nearest(Place, 48.86, 2.34, 2)
+                              .values()), [paris, lyon])
+        self.assertEqual(list(self.storage.within(Place, -20, 179, -10, -179)
+                              .values()), [fiji])
+        with self.assertRaises(KeyError):
+            self.storage.within(City, 0, 0, 1, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,12 +7,23 @@ from datetime import datetime
 import unittest
 from time import sleep
 import json
+import os
 from models.engine.file_storage import FileStorage
+from tests import file_storage_only, reset_storage
 
 
+@file_storage_only
 class TestFileStorage(unittest.TestCase):
     """Test Suite for the FileStorage class."""
 
+    def setUp(self):
+        """Starts from an empty storage in the plain mode."""
+        reset_storage(plain=True)
+
+    def tearDown(self):
+        """Removes the objects and the files written by a test."""
+        reset_storage()
+
     def test_instances(self):
         """Test instantiation of FileStorage."""
         obj = FileStorage()
@@ -25,5 +36,886 @@ class TestFileStorage(unittest.TestCase):
         self.assertIsNotNone(FileStorage.save.__doc__, "save method needs a docstring")
         self.assertIsNotNone(FileStorage.reload.__doc__, "reload method needs a docstring")
 
+    def test_all_by_class(self):
+        """Test that all(cls) and count(cls) only see that class."""
+        from models.user import User
+        from models.state import State
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        users = [User() for _ in range(3)]
+        state = State()
+        self.assertEqual(storage.count(), 4)
+        self.assertEqual(storage.count(User), 3)
+        self.assertEqual(storage.count("State"), 1)
+        self.assertEqual(storage.count("City"), 0)
+        self.assertEqual(set(storage.all("User").values()), set(users))
+        storage.delete(users[0])
+        self.assertEqual(storage.count("User"), 2)
+        self.assertEqual(list(storage.all(State).values()), [state])
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(storage.count("User"), 0)
+
+    def test_page(self):
+        """Test that pages follow the order of all()."""
+        from models.user import User
+        from models.state import State
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        users = [User() for _ in range(3)]
+        state = State()
+        keys = list(storage.all())
+        self.assertEqual(list(storage.page(limit=2, offset=1)), keys[1:3])
+        self.assertEqual(list(storage.page(after=users[1].id)), keys[2:])
+        self.assertEqual(storage.page(User, 1, 0, users[0].id),
+                         {"User." + users[1].id: users[1]})
+        self.assertEqual(storage.page(State), {"State." + state.id: state})
+        self.assertEqual(storage.page(limit=0), {})
+        with self.assertRaises(KeyError):
+            storage.page(User, after=state.id)
+        storage.delete(users[1])
+        late = User()
+        self.assertEqual(storage.page(User, after=users[0].id),
+                         {"User." + users[2].id: users[2],
+                          "User." + late.id: late})
+        self.assertEqual(list(storage.page(offset=3)), list(storage.all())[3:])
+
+    def test_find(self):
+        """Test find() through the foreign key indexes and by scanning."""
+        from models.city import City
+        from models.place import Place
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        paris, lyon = City(), City()
+        places = [Place() for _ in range(4)]
+        for i, place in enumerate(places):
+            place.city_id = paris.id if i % 2 else lyon.id
+            place.name = "place{}".format(i)
+            place.save()
+        in_paris = storage.find(Place, city_id=paris.id)
+        self.assertEqual(set(in_paris.values()), {places[1], places[3]})
+        self.assertEqual(list(storage.find("Place", city_id=lyon.id,
+                                           name="place2").values()),
+                         [places[2]])
+        self.assertEqual(storage.find(Place, name="place3"),
+                         {"Place." + places[3].id: places[3]})
+        places[1].city_id = lyon.id
+        places[1].save()
+        self.assertEqual(len(storage.find(Place, city_id=lyon.id)), 3)
+        storage.delete(places[0])
+        self.assertEqual(len(storage.find(Place, city_id=lyon.id)), 2)
+        storage.add_index(Place, "name")
+        self.assertEqual(len(storage.find(Place, name="place1")), 1)
+        self.assertEqual(storage.find(Place, cls=Place, self=None), {})
+
+    def test_find_after_change(self):
+        """Test that find() sees attributes changed without a save."""
+        from models.place import Place
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        place = Place()
+        place.city_id = "a"
+        place.price_by_night = 50
+        self.assertEqual(len(storage.find(Place, price_by_night__lt=100)), 1)
+        place.__dict__["price_by_night"] = 900  # Not indexed again
+        self.assertEqual(storage.find(Place, price_by_night__lt=100), {})
+        place.city_id = "b"
+        place.price_by_night = 900
+        self.assertEqual(storage.find(Place, city_id="a"), {})
+        self.assertEqual(list(storage.find(Place, city_id="b").values()),
+                         [place])
+        self.assertEqual(storage.find(Place, price_by_night__lt=100), {})
+        place.__dict__["price_by_night"] = 20
+        storage.touch(place)
+        self.assertEqual(list(storage.find(Place, price_by_night__lt=100)
+                              .values()), [place])
+
+    def test_near_after_move(self):
+        """Test that near() and within() see coordinates set directly."""
+        from models.place import Place
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        place = Place()
+        place.latitude, place.longitude = 45.5, 4.5
+        self.assertEqual(list(storage.within(Place, 45, 4, 46, 5)),
+                         ["Place." + place.id])
+        place.latitude, place.longitude = 48.85, 2.35
+        self.assertEqual(storage.within(Place, 45, 4, 46, 5), {})
+        self.assertEqual(list(storage.near(Place, 48.86, 2.34, 5)),
+                         ["Place." + place.id])
+
+    def test_reload_progress(self):
+        """Test that reload() restores objects and reports its progress."""
+        from models.user import User
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        users = [User() for _ in range(50)]
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        seen = []
+        storage.reload(progress=lambda read, size: seen.append((read, size)))
+        self.assertEqual(storage.count(User), len(users))
+        self.assertEqual(storage.all()["User." + users[7].id].to_dict(),
+                         users[7].to_dict())
+        size = os.path.getsize(FileStorage._FileStorage__file_path)
+        self.assertEqual(seen[-1], (size, size))
+
+    def test_lazy_reload(self):
+        """Test that lazy reload() builds objects only when read."""
+        from models.engine.lazy import Raw
+        from models.place import Place
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        places = [Place() for _ in range(3)]
+        places[0].city_id = "c1"
+        places[0].save()
+        expected = {p.id: p.to_dict() for p in places}
+        FileStorage._FileStorage__lazy = True
+        try:
+            storage.reload()
+        finally:
+            FileStorage._FileStorage__lazy = False
+        objs = storage.all()
+
+        def pending():
+            return len([v for v in dict.values(objs)
+                        if type(v) is Raw and v.obj is None])
+        self.assertEqual(pending(), 3)
+        self.assertEqual(list(storage.find(Place, city_id="c1")),
+                         ["Place." + places[0].id])
+        self.assertEqual(pending(), 2)
+        storage.save()
+        self.assertEqual(pending(), 2)
+        for obj in storage.all(Place).values():
+            self.assertIsInstance(obj, Place)
+            self.assertEqual(obj.to_dict(), expected[obj.id])
+        self.assertIs(objs["Place." + places[1].id],
+                      storage.all("Place")["Place." + places[1].id])
+
+    def test_lazy_copies(self):
+        """Test that copies of the lazy dictionary hold built objects."""
+        from models.place import Place
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        Place().save()
+        FileStorage._FileStorage__lazy = True
+        try:
+            storage.reload()
+        finally:
+            FileStorage._FileStorage__lazy = False
+        merged = {}
+        merged.update(storage.all())
+        for copy in (dict(storage.all()), {**storage.all()}, merged):
+            for obj in copy.values():
+                self.assertIsInstance(obj, Place)
+
+    def test_compact_reload(self):
+        """Test that compact reload() shares ids and keeps the output."""
+        from models.place import Place
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        places = [Place() for _ in range(2)]
+        for place in places:
+            place.city_id = "0123-city"
+            place.amenity_ids = ["a-1"]
+            place.save()
+        expected = {str(p): p.to_dict() for p in places}
+        FileStorage._FileStorage__compact = True
+        try:
+            storage.reload()
+        finally:
+            FileStorage._FileStorage__compact = False
+        first, second = storage.all(Place).values()
+        self.assertIs(first.city_id, second.city_id)
+        self.assertIs(first.amenity_ids[0], second.amenity_ids[0])
+        self.assertEqual({str(p): p.to_dict() for p in (first, second)},
+                         expected)
+
+    def test_find_ranges(self):
+        """Test find() with comparison filters on numeric attributes."""
+        from models.place import Place
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        places = [Place() for _ in range(6)]
+        for i, place in enumerate(places):
+            place.price_by_night = 60 + 30 * i
+            place.max_guest = i
+            place.name = "even" if i % 2 == 0 else "odd"
+            place.save()
+        found = storage.find(Place, price_by_night__le=120, max_guest__ge=1)
+        self.assertEqual(set(found.values()), {places[1], places[2]})
+        found = storage.find(Place, max_guest__gt=2, name="odd")
+        self.assertEqual(set(found.values()), {places[3], places[5]})
+        storage.delete(places[1])
+        self.assertEqual(list(storage.find(Place, price_by_night__lt=100)),
+                         ["Place." + places[0].id])
+
+    def test_find_non_numbers(self):
+        """Test find() with strings and None on numeric attributes."""
+        from models.place import Place
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        place = Place()
+        place.max_guest = 3
+        other = Place()
+        other.max_guest = "3"
+        self.assertEqual(storage.find(Place, max_guest="3"),
+                         {"Place." + other.id: other})
+        self.assertEqual(storage.find(Place, max_guest__lt="4"),
+                         {"Place." + other.id: other})
+        self.assertEqual(storage.find(Place, max_guest=None), {})
+        self.assertEqual(storage.find(Place, max_guest__ne=None),
+                         {"Place." + place.id: place,
+                          "Place." + other.id: other})
+
+    def test_dirty(self):
+        """Test that changes are tracked until the next save."""
+        from models.user import User
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        storage.save()
+        kept, gone = User(), User()
+        key = "User." + kept.id
+        self.assertEqual(storage.dirty()[key], "created")
+        storage.save()
+        self.assertEqual(storage.dirty(), {})
+        temp = User()
+        kept.first_name = "Betty"
+        storage.delete(gone)
+        storage.delete(temp)
+        self.assertEqual(storage.dirty(), {key: "modified",
+                                           "User." + gone.id: "deleted"})
+        storage.save()
+        kept.__dict__["last_name"] = "Holberton"
+        storage.touch(kept)
+        self.assertEqual(storage.dirty(), {key: "modified"})
+
+    def test_save_dirty_only(self):
+        """Test that save() only serializes the objects that changed."""
+        from unittest.mock import patch
+        from models.engine import file_storage
+        from models.user import User
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        users = [User() for _ in range(5)]
+        storage.save()
+        users[2].first_name = "Betty"
+        with patch.object(file_storage, "to_dict",
+                          wraps=file_storage.to_dict) as spy:
+            storage.save()
+        self.assertEqual(spy.call_count, 1)
+        with open(FileStorage._FileStorage__file_path) as f:
+            saved = json.load(f)
+        self.assertEqual(saved, {"User." + u.id: u.to_dict() for u in users})
+
+    def test_save_list_changed_in_place(self):
+        """Test that save() writes lists changed without an assignment."""
+        from models.place import Place
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        place = Place()
+        place.amenity_ids = ["pool"]
+        storage.save()
+        place.amenity_ids.append("wifi")
+        self.assertEqual(storage.dirty(), {})
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(storage.all()["Place." + place.id].amenity_ids,
+                         ["pool", "wifi"])
+
+    def test_binary_format(self):
+        """Test that binary snapshots are detected and reloaded."""
+        from models.place import Place
+        from models.engine.formats import MAGIC
+        storage = FileStorage()
+        place = Place(id="0b6b8f5e-4c4e-4a8a-9d55-8f0d6f1f0f2a",
+                      created_at="2024-01-01T12:00:00.000001",
+                      updated_at="2024-01-01T12:00:00.000001",
+                      name="Loft", max_guest=4)
+        storage.new(place)
+        FileStorage._FileStorage__format = "binary"
+        try:
+            storage.save()
+        finally:
+            FileStorage._FileStorage__format = "json"
+        with open(FileStorage._FileStorage__file_path, "rb") as f:
+            self.assertEqual(f.read(len(MAGIC)), MAGIC)
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(storage.get("Place", place.id).to_dict(),
+                         place.to_dict())
+
+    def test_compressed(self):
+        """Test that compressed snapshots are detected and reloaded."""
+        from models.user import User
+        storage = FileStorage()
+        user = User()
+        user.email = "a@b.c"
+        for codec in ("zlib", "gzip", "lzma"):
+            FileStorage._FileStorage__compression = codec
+            try:
+                storage.save()
+            finally:
+                FileStorage._FileStorage__compression = None
+            with open(FileStorage._FileStorage__file_path, "rb") as f:
+                self.assertNotIn(b"a@b.c", f.read())
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(storage.get("User", user.id).email, "a@b.c")
+
     if __name__ == '__main__':
-        unittest.main()
\ No newline at end of file
+        unittest.main()
+
+@file_storage_only
+class TestFileStorageJournal(unittest.TestCase):
+    """Test Suite for the journaled mode of FileStorage."""
+
+    def setUp(self):
+        """Enables the journal on an empty storage."""
+        reset_storage(plain=True)
+        FileStorage._FileStorage__journal = True
+
+    def tearDown(self):
+        """Restores the default mode and removes the storage files."""
+        reset_storage()
+
+    def test_save_appends(self):
+        """Test that save() appends one record per change."""
+        from models.user import User
+        u = User()
+        u.save()
+        u.first_name = "Betty"
+        u.save()
+        self.assertFalse(os.path.isfile(FileStorage._FileStorage__file_path))
+        with open(FileStorage._FileStorage__journal_path) as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[1])["value"]["first_name"], "Betty")
+
+    def test_reload_replays(self):
+        """Test that reload() applies the journal on top of the snapshot."""
+        from models.user import User
+        storage = FileStorage()
+        kept = User()
+        gone = User()
+        storage.compact()
+        kept.email = "kept@hbnb.io"
+        kept.save()
+        storage.delete(gone)
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        objs = storage.all()
+        self.assertNotIn("User." + gone.id, objs)
+        self.assertEqual(objs["User." + kept.id].email, "kept@hbnb.io")
+
+    def test_torn_record(self):
+        """Test that a truncated trailing record is ignored on reload."""
+        from models.user import User
+        storage = FileStorage()
+        u = User()
+        storage.save()
+        with open(FileStorage._FileStorage__journal_path, "a") as f:
+            f.write('{"op": "put", "key": "User.x", "val')
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(list(storage.all()), ["User." + u.id])
+
+    def test_torn_record_then_save(self):
+        """Test that records saved after a torn one survive a reload."""
+        from models.user import User
+        storage = FileStorage()
+        first = User()
+        storage.save()
+        with open(FileStorage._FileStorage__journal_path, "a") as f:
+            f.write('{"op": "put", "key": "User.x", "val')
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        second = User()
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(set(storage.all()),
+                         {"User." + first.id, "User." + second.id})
+
+    def test_compaction(self):
+        """Test that the journal is folded into the snapshot when too long."""
+        from models.user import User
+        FileStorage._FileStorage__journal_limit = 3
+        storage = FileStorage()
+        users = [User() for _ in range(4)]
+        storage.save()
+        self.assertFalse(os.path.isfile(FileStorage._FileStorage__journal_path))
+        with open(FileStorage._FileStorage__file_path) as f:
+            self.assertEqual(len(json.load(f)), len(users))
+
+
+@file_storage_only
+class TestFileStorageWriteBehind(unittest.TestCase):
+    """Test Suite for the write-behind mode of FileStorage."""
+
+    def setUp(self):
+        """Enables write-behind with a short window on an empty storage."""
+        reset_storage(plain=True)
+        FileStorage._FileStorage__write_behind = True
+        FileStorage._FileStorage__flush_interval = 0.05
+
+    def tearDown(self):
+        """Flushes, restores the default mode and removes the file."""
+        FileStorage().flush()
+        reset_storage()
+
+    def test_save_deferred(self):
+        """Test that save() returns before anything is written."""
+        from models.base_model import BaseModel
+        FileStorage._FileStorage__flush_interval = 60
+        BaseModel().save()
+        self.assertFalse(os.path.isfile(FileStorage._FileStorage__file_path))
+        self.assertEqual(len(FileStorage().dirty()), 1)
+
+    def test_flush(self):
+        """Test that flush() writes the scheduled changes at once."""
+        from models.base_model import BaseModel
+        FileStorage._FileStorage__flush_interval = 60
+        bm = BaseModel()
+        bm.save()
+        FileStorage().flush()
+        self.assertEqual(FileStorage().dirty(), {})
+        with open(FileStorage._FileStorage__file_path) as f:
+            self.assertIn("BaseModel." + bm.id, f.read())
+
+    def test_background_flush(self):
+        """Test that saves within one window are written together."""
+        from models.base_model import BaseModel
+        objs = [BaseModel() for i in range(10)]
+        for obj in objs:
+            obj.save()
+        for i in range(100):
+            if not FileStorage().dirty():
+                break
+            sleep(0.05)
+        with open(FileStorage._FileStorage__file_path) as f:
+            text = f.read()
+        for obj in objs:
+            self.assertIn("BaseModel." + obj.id, text)
+
+    def test_background_flush_error(self):
+        """Test that the flusher reports a failed flush and tries again."""
+        from io import StringIO
+        from unittest.mock import patch
+        from models.base_model import BaseModel
+        path = FileStorage._FileStorage__file_path
+        FileStorage._FileStorage__flush_interval = 0.05
+        FileStorage._FileStorage__file_path = os.path.join(os.devnull, path)
+        try:
+            with patch("sys.stderr", new=StringIO()) as stderr:
+                BaseModel().save()
+                for i in range(100):
+                    if stderr.getvalue():
+                        break
+                    sleep(0.05)
+            self.assertIn("Could not flush the storage", stderr.getvalue())
+        finally:
+            FileStorage._FileStorage__file_path = path
+        for i in range(100):
+            if not FileStorage().dirty():
+                break
+            sleep(0.05)
+        self.assertEqual(FileStorage().dirty(), {})
+        self.assertTrue(os.path.isfile(path))
+
+    def test_flush_size(self):
+        """Test that save() flushes at once when enough keys are dirty."""
+        from models.base_model import BaseModel
+        FileStorage._FileStorage__flush_interval = 60
+        FileStorage._FileStorage__flush_size = 3
+        for i in range(3):
+            BaseModel().save()
+        self.assertTrue(os.path.isfile(FileStorage._FileStorage__file_path))
+        self.assertEqual(FileStorage().dirty(), {})
+
+
+@file_storage_only
+class TestFileStorageShared(unittest.TestCase):
+    """Test Suite for the multi-process mode of FileStorage."""
+
+    def setUp(self):
+        """Enables the shared mode on an empty storage."""
+        reset_storage(plain=True)
+        FileStorage._FileStorage__shared = True
+
+    def tearDown(self):
+        """Restores the default mode and removes the storage files."""
+        reset_storage()
+
+    def write_elsewhere(self, obj):
+        """Adds an object to the file as another process would."""
+        with open(FileStorage._FileStorage__file_path) as f:
+            data = json.load(f)
+        data["{}.{}".format(type(obj).__name__, obj.id)] = obj.to_dict()
+        with open(FileStorage._FileStorage__file_path, "w") as f:
+            json.dump(data, f)
+
+    def test_atomic_write(self):
+        """Test that save() leaves no temporary file behind."""
+        from models.base_model import BaseModel
+        BaseModel().save()
+        path = FileStorage._FileStorage__file_path
+        directory = os.path.dirname(os.path.abspath(path))
+        self.assertEqual([name for name in os.listdir(directory)
+                          if name.startswith(os.path.basename(path)) and
+                          name.endswith(".tmp")], [])
+
+    def test_refresh(self):
+        """Test that objects written by another process become visible."""
+        from models.base_model import BaseModel
+        storage = FileStorage()
+        BaseModel().save()
+        self.assertFalse(storage.refresh())
+        other = BaseModel.from_dict(BaseModel().to_dict())
+        FileStorage._FileStorage__objects.pop("BaseModel." + other.id)
+        self.write_elsewhere(other)
+        self.assertIn("BaseModel." + other.id, storage.all())
+        self.assertFalse(storage.refresh())
+
+    def test_merge(self):
+        """Test that a save keeps what another process wrote meanwhile."""
+        from models.base_model import BaseModel
+        first = BaseModel()
+        first.save()
+        other = BaseModel.from_dict(BaseModel().to_dict())
+        FileStorage._FileStorage__objects.pop("BaseModel." + other.id)
+        self.write_elsewhere(other)
+        first.name = "changed"
+        first.save()
+        with open(FileStorage._FileStorage__file_path) as f:
+            data = json.load(f)
+        self.assertIn("BaseModel." + other.id, data)
+        self.assertEqual(data["BaseModel." + first.id]["name"], "changed")
+
+    def test_change_after_refresh(self):
+        """Test that an instance read before a refresh can still change."""
+        from models.base_model import BaseModel
+        storage = FileStorage()
+        first = BaseModel()
+        first.save()
+        other = BaseModel.from_dict(BaseModel().to_dict())
+        FileStorage._FileStorage__objects.pop("BaseModel." + other.id)
+        self.write_elsewhere(other)
+        self.assertTrue(storage.refresh())
+        key = "BaseModel." + first.id
+        self.assertIsNot(storage.all()[key], first)
+        first.name = "changed"
+        storage.save()
+        self.assertIs(storage.all()[key], first)
+        self.assertEqual(storage.find("BaseModel", name="changed"),
+                         {key: first})
+        with open(FileStorage._FileStorage__file_path) as f:
+            data = json.load(f)
+        self.assertIn("BaseModel." + other.id, data)
+        self.assertEqual(data[key]["name"], "changed")
+
+    def test_copy_not_stored(self):
+        """Test that a copy built with the id of an object is not stored."""
+        from models.place import Place
+        storage = FileStorage()
+        place = Place()
+        place.save()
+        key = "Place." + place.id
+        Place(**{"id": place.id, "name": "copy"})
+        self.assertIs(storage.all()[key], place)
+        self.assertEqual(storage.find("Place", name="copy"), {})
+        place.save()
+        with open(FileStorage._FileStorage__file_path) as f:
+            self.assertNotIn("name", json.load(f)[key])
+
+    def test_refresh_journal(self):
+        """Test that records appended by another process are replayed."""
+        from models.base_model import BaseModel
+        storage = FileStorage()
+        FileStorage._FileStorage__journal = True
+        try:
+            first = BaseModel()
+            first.save()
+            other = BaseModel.from_dict(BaseModel().to_dict())
+            FileStorage._FileStorage__objects.pop("BaseModel." + other.id)
+            record = {"op": "put", "key": "BaseModel." + other.id,
+                      "value": other.to_dict()}
+            with open(FileStorage._FileStorage__journal_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+            self.assertTrue(storage.refresh())
+            self.assertIn("BaseModel." + other.id, storage.all())
+            self.assertIn("BaseModel." + first.id, storage.all())
+        finally:
+            FileStorage._FileStorage__journal = False
+            if os.path.isfile(FileStorage._FileStorage__journal_path):
+                os.remove(FileStorage._FileStorage__journal_path)
+
+
+@file_storage_only
+class TestFileStorageShards(unittest.TestCase):
+    """Test Suite for the sharded layout of FileStorage."""
+
+    def setUp(self):
+        """Enables the sharded layout on an empty storage."""
+        reset_storage(plain=True)
+        FileStorage._FileStorage__sharded = True
+
+    def tearDown(self):
+        """Restores the single file layout and removes the files."""
+        reset_storage()
+
+    def shards(self):
+        """Returns the inode of each shard by name."""
+        directory = FileStorage._FileStorage__file_path + ".shards"
+        return {name: os.stat(os.path.join(directory, name)).st_ino
+                for name in os.listdir(directory)}
+
+    def populate(self):
+        """Saves a few objects of several classes."""
+        from models.user import User
+        from models.place import Place
+        from models.review import Review
+        objs = [User(), Place(), Place(), Review()]
+        FileStorage().save()
+        return objs
+
+    def reloaded(self):
+        """Returns the objects read back from the files."""
+        FileStorage._FileStorage__objects = {}
+        FileStorage().reload()
+        return {key: obj.to_dict() for key, obj in FileStorage().all().items()}
+
+    def test_one_file_per_class(self):
+        """Test that each class is saved to its own shard."""
+        objs = self.populate()
+        self.assertFalse(os.path.isfile(FileStorage._FileStorage__file_path))
+        self.assertEqual(set(self.shards()), {"User.0", "Place.0", "Review.0"})
+        expected = {"{}.{}".format(type(obj).__name__, obj.id): obj.to_dict()
+                    for obj in objs}
+        for workers in (1, 2):
+            FileStorage._FileStorage__reload_workers = workers
+            self.assertEqual(self.reloaded(), expected)
+
+    def test_changed_shards_only(self):
+        """Test that a save only rewrites the shards of dirty objects."""
+        objs = self.populate()
+        before = self.shards()
+        objs[3].text = "Great"
+        objs[3].save()
+        after = self.shards()
+        self.assertNotEqual(before["Review.0"], after["Review.0"])
+        self.assertEqual(before["User.0"], after["User.0"])
+        self.assertEqual(before["Place.0"], after["Place.0"])
+        FileStorage().delete(objs[0])
+        FileStorage().save()
+        self.assertNotIn("User.0", self.shards())
+
+    def test_partitions(self):
+        """Test that classes are split by a hash of the key."""
+        from models.place import Place
+        FileStorage._FileStorage__shard_partitions = 4
+        keys = {"Place." + Place().id for i in range(40)}
+        FileStorage().save()
+        self.assertEqual(set(self.shards()),
+                         {"Place.{}".format(i) for i in range(4)})
+        self.assertEqual(set(self.reloaded()), keys)
+
+    def test_migration(self):
+        """Test that reload() converts between the two layouts."""
+        FileStorage._FileStorage__sharded = False
+        objs = self.populate()
+        expected = self.reloaded()
+        self.assertEqual(len(expected), len(objs))
+        FileStorage._FileStorage__sharded = True
+        self.assertEqual(self.reloaded(), expected)
+        self.assertFalse(os.path.isfile(FileStorage._FileStorage__file_path))
+        self.assertEqual(len(self.shards()), 3)
+        FileStorage._FileStorage__sharded = False
+        self.assertEqual(self.reloaded(), expected)
+        self.assertTrue(os.path.isfile(FileStorage._FileStorage__file_path))
+        self.assertFalse(os.path.isdir(
+            FileStorage._FileStorage__file_path + ".shards"))
+
+
+@file_storage_only
+class TestFileStorageRecords(unittest.TestCase):
+    """Test Suite for the record format of FileStorage."""
+
+    def setUp(self):
+        """Selects the record format on an empty storage."""
+        reset_storage(plain=True)
+        FileStorage._FileStorage__format = "records"
+
+    def tearDown(self):
+        """Restores the JSON format and removes the files."""
+        reset_storage()
+
+    def populate(self):
+        """Saves a few objects."""
+        from models.user import User
+        from models.place import Place
+        objs = [User(), Place(), Place()]
+        FileStorage().save()
+        return objs
+
+    def reloaded(self):
+        """Returns the objects read back from the file."""
+        FileStorage._FileStorage__objects = {}
+        FileStorage().reload()
+        return {key: obj.to_dict() for key, obj in FileStorage().all().items()}
+
+    def test_point_lookup(self):
+        """Test that reload() reads only the objects that are accessed."""
+        from models.engine.lazy import Raw
+        objs = self.populate()
+        FileStorage._FileStorage__objects = {}
+        FileStorage().reload()
+        objects = FileStorage._FileStorage__objects
+        self.assertEqual(len(objects), 3)
+        self.assertTrue(all(type(value) is Raw and value._fetch is not None
+                            for value in dict.values(objects)))
+        obj = FileStorage().get("Place", objs[1].id)
+        self.assertEqual(obj.to_dict(), objs[1].to_dict())
+        self.assertIsNotNone(dict.get(objects, "Place." + objs[2].id)._fetch)
+
+    def test_save_changed_records(self):
+        """Test that a save rewrites only the dirty records."""
+        objs = self.populate()
+        FileStorage._FileStorage__objects = {}
+        FileStorage().reload()
+        path = FileStorage._FileStorage__file_path
+        with open(path + ".index", "rb") as f:
+            index = f.read()
+        obj = FileStorage().get("User", objs[0].id)
+        obj.first_name = "Betty"
+        obj.save()
+        with open(path + ".index", "rb") as f:
+            self.assertEqual(f.read(), index)
+        obj.last_name = "Holberton" * 20
+        obj.save()
+        FileStorage().delete(FileStorage().get("Place", objs[1].id))
+        FileStorage().save()
+        with open(path + ".index", "rb") as f:
+            self.assertNotEqual(f.read(), index)
+        objects = self.reloaded()
+        self.assertEqual(set(objects), {"User." + objs[0].id,
+                                        "Place." + objs[2].id})
+        self.assertEqual(objects["User." + objs[0].id]["last_name"],
+                         "Holberton" * 20)
+        size = os.path.getsize(path)
+        FileStorage().compact()
+        self.assertLess(os.path.getsize(path), size)
+        self.assertEqual(self.reloaded(), objects)
+
+    def test_migration(self):
+        """Test that reload() converts between JSON and records."""
+        from models.engine.records import is_record_file
+        FileStorage._FileStorage__format = "json"
+        objs = self.populate()
+        expected = self.reloaded()
+        self.assertEqual(len(expected), len(objs))
+        FileStorage._FileStorage__format = "records"
+        self.assertEqual(self.reloaded(), expected)
+        path = FileStorage._FileStorage__file_path
+        self.assertTrue(is_record_file(path))
+        FileStorage._FileStorage__format = "json"
+        self.assertEqual(self.reloaded(), expected)
+        self.assertFalse(is_record_file(path))
+        self.assertFalse(os.path.isfile(path + ".index"))
+
+
+@file_storage_only
+class TestFileStorageTransactions(unittest.TestCase):
+    """Test Suite for the transactions of FileStorage."""
+
+    def setUp(self):
+        """Saves a User and two Places."""
+        from models.user import User
+        from models.place import Place
+        reset_storage(plain=True)
+        self.user = User()
+        self.places = [Place(), Place()]
+        self.places[0].city_id = "c1"
+        self.places[0].max_guest = 2
+        FileStorage().save()
+
+    def tearDown(self):
+        """Ends any open transaction and removes the file."""
+        reset_storage()
+
+    def saved(self):
+        """Returns the content of the file."""
+        with open(FileStorage._FileStorage__file_path, "rb") as f:
+            return f.read()
+
+    def test_commit(self):
+        """Test that the changes are written once, by commit()."""
+        from models.review import Review
+        storage = FileStorage()
+        before = self.saved()
+        storage.begin()
+        review = Review()
+        review.save()
+        self.user.first_name = "Betty"
+        self.user.save()
+        storage.delete(self.places[1])
+        storage.save()
+        storage.flush()
+        self.assertEqual(self.saved(), before)
+        self.assertEqual(storage.count(), 3)
+        storage.commit()
+        self.assertEqual(storage.dirty(), {})
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(set(storage.all()), {
+            "User." + self.user.id, "Place." + self.places[0].id,
+            "Review." + review.id})
+        self.assertEqual(storage.get("User", self.user.id).first_name, "Betty")
+
+    def test_rollback(self):
+        """Test that rollback() restores objects, indexes and dirty keys."""
+        from models.place import Place
+        storage = FileStorage()
+        place = self.places[0]
+        self.assertEqual(len(storage.find(Place, city_id="c1")), 1)
+        self.user.email = "unsaved@hbnb.io"
+        dirty = storage.dirty()
+        storage.begin()
+        place.city_id = "c2"
+        place.max_guest = 8
+        storage.new(place)
+        storage.changing(self.user)
+        self.user.__dict__["email"] = "changed@hbnb.io"
+        storage.touch(self.user)
+        storage.delete(self.places[1])
+        created = Place()
+        self.assertEqual(len(storage.find(Place, max_guest__gt=4)), 1)
+        storage.rollback()
+        self.assertEqual((place.city_id, place.max_guest), ("c1", 2))
+        self.assertEqual(self.user.email, "unsaved@hbnb.io")
+        self.assertIs(storage.get(Place, self.places[1].id), self.places[1])
+        self.assertIsNone(storage.get(Place, created.id))
+        self.assertEqual(storage.count(Place), 2)
+        self.assertEqual(storage.find(Place, city_id="c1"),
+                         {"Place." + place.id: place})
+        self.assertEqual(storage.find(Place, max_guest__gt=4), {})
+        self.assertEqual(storage.dirty(), dirty)
+
+    def test_transaction(self):
+        """Test the context manager and the errors of misuse."""
+        from models.user import User
+        storage = FileStorage()
+        with storage.transaction():
+            created = User()
+            with self.assertRaises(RuntimeError):
+                storage.begin()
+        self.assertIn("User." + created.id, json.loads(self.saved()))
+        with self.assertRaises(ZeroDivisionError):
+            with storage.transaction():
+                self.user.first_name = "Lost"
+                1 / 0
+        self.assertNotIn("first_name", self.user.__dict__)
+        for method in (storage.commit, storage.rollback):
+            with self.assertRaises(RuntimeError):
+                method()
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""Unittest module for the storage file formats."""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from models.engine import formats
+from models.engine.file_storage import FileStorage
+
+
+class TestBinaryFormat(unittest.TestCase):
+    """Test Cases for BinaryFormat."""
+
+    place = {
+        "id": "0b6b8f5e-4c4e-4a8a-9d55-8f0d6f1f0f2a",
+        "created_at": "2024-01-01T12:00:00.000001",
+        "updated_at": "2024-01-01T12:00:00",
+        "__class__": "Place",
+        "city_id": "5f1c7d3e-9a2b-4c6d-8e0f-1a2b3c4d5e6f",
+        "name": "Café ✓",
+        "number_rooms": 3,
+        "latitude": 37.7749,
+        "amenity_ids": ["a", "", "b"],
+    }
+
+    def roundtrip(self, *values):
+        """Encodes and decodes (key, value) pairs."""
+        codec = formats.get("binary", FileStorage().attributes())
+        out = io.BytesIO()
+        codec.write(out, (codec.encode(k, v) for k, v in values))
+        return list(codec.read(io.BytesIO(out.getvalue()), chunk_size=7))
+
+    def test_roundtrip(self):
+        """Tests that to_dict() dictionaries come back unchanged."""
+        key = "Place." + self.place["id"]
+        self.assertEqual(self.roundtrip((key, self.place)),
+                         [(key, self.place)])
+
+    def test_fallbacks(self):
+        """Tests values that do not fit the schema."""
+        odd = dict(self.place, id="not-a-uuid", number_rooms="3",
+                   max_guest=True, created_at="2024-01-01 12:00:00",
+                   amenity_ids=[], extra={"nested": [1, None]})
+        unknown = {"__class__": "Ship", "id": "1"}
+        values = [("Place.not-a-uuid", odd), ("Ship.1", unknown),
+                  ("Place.other-key", self.place)]
+        self.assertEqual(self.roundtrip(*values), values)
+
+    def test_compact(self):
+        """Tests that the records are smaller than the JSON text."""
+        codec = formats.get("binary", FileStorage().attributes())
+        key = "Place." + self.place["id"]
+        self.assertLess(len(codec.encode(key, self.place)),
+                        len(json.dumps({key: self.place})) / 2)
+
+    def test_invalid(self):
+        """Tests that files in another format raise ValueError."""
+        codec = formats.get("binary", {})
+        with self.assertRaises(ValueError):
+            list(codec.read(io.BytesIO(b"{}")))
+        with self.assertRaises(ValueError):
+            formats.get("xml", {})
+
+
+class TestConvert(unittest.TestCase):
+    """Test Cases for detect() and convert()."""
+
+    def test_convert(self):
+        """Tests converting JSON to binary and back."""
+        data = {"Place." + TestBinaryFormat.place["id"]:
+                TestBinaryFormat.place}
+        tmp = tempfile.mkdtemp()
+        source, binary, back = (os.path.join(tmp, name) for name in
+                                ("file.json", "file.bin", "back.json"))
+        with open(source, "w") as f:
+            json.dump(data, f)
+        self.assertEqual(formats.detect(source), "json")
+        self.assertEqual(formats.convert(source, binary, "binary"), 1)
+        self.assertEqual(formats.detect(binary), "binary")
+        self.assertEqual(formats.convert(binary, back, "json"), 1)
+        with open(back) as f:
+            self.assertEqual(json.load(f), data)
+
+
+if __name__ == "__main__":
+    unittest.main()
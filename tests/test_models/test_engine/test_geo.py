@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""Unittest module for the GridIndex class."""
+
+import random
+import unittest
+from types import SimpleNamespace
+from models.engine.geo import GridIndex, distance
+
+
+class TestGridIndex(unittest.TestCase):
+    """Test Cases for the GridIndex class."""
+
+    def setUp(self):
+        """Indexes random points, some of them around the antimeridian."""
+        rand = random.Random(42)
+        self.points = {}
+        for i in range(2000):
+            lat = rand.uniform(-60, 60)
+            lon = rand.uniform(-180, 180) if i % 4 else rand.uniform(179, 180)
+            self.points["k{}".format(i)] = (lat, lon)
+        self.grid = GridIndex(cell=1.0)
+        for key, (lat, lon) in self.points.items():
+            self.grid.add(key, SimpleNamespace(latitude=lat, longitude=lon))
+
+    def brute_near(self, lat, lon, km):
+        """Returns the keys within km, by distance."""
+        return sorted((distance(lat, lon, plat, plon), key)
+                      for key, (plat, plon) in self.points.items()
+                      if distance(lat, lon, plat, plon) <= km)
+
+    def test_distance(self):
+        """Tests the great-circle distance."""
+        self.assertAlmostEqual(distance(0, 0, 0, 1), 111.195, places=2)
+        self.assertAlmostEqual(distance(0, 179.5, 0, -179.5), 111.195,
+                               places=2)
+
+    def test_near(self):
+        """Tests radius queries against a full scan."""
+        for lat, lon, km in ((0, 0, 500), (10, 179.9, 800), (-55, -20, 3000)):
+            self.assertEqual(self.grid.near(lat, lon, km),
+                             self.brute_near(lat, lon, km))
+
+    def test_within(self):
+        """Tests bounding boxes, including one across the antimeridian."""
+        for s, w, n, e in ((-10, -20, 10, 20), (0, 170, 30, -170)):
+            if w <= e:
+                expected = {k for k, (lat, lon) in self.points.items()
+                            if s <= lat <= n and w <= lon <= e}
+            else:
+                expected = {k for k, (lat, lon) in self.points.items()
+                            if s <= lat <= n and (lon >= w or lon <= e)}
+            self.assertEqual(set(self.grid.within(s, w, n, e)), expected)
+
+    def test_nearest(self):
+        """Tests k-nearest queries against a full scan."""
+        expected = self.brute_near(5, 5, 40000)[:7]
+        self.assertEqual(self.grid.nearest(5, 5, 7), expected)
+        self.assertEqual(self.grid.nearest(5, 5, 0), [])
+
+    def test_update_discard(self):
+        """Tests that moved, removed and invalid points are handled."""
+        self.grid.add("k1", SimpleNamespace(latitude=89.9, longitude=0))
+        self.grid.discard("k2")
+        self.grid.add("k3", SimpleNamespace(latitude="here", longitude=0))
+        self.assertEqual(len(self.grid), len(self.points) - 2)
+        self.assertEqual(self.grid.within(89, -180, 90, 180), ["k1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+"""Unittest module for the KeyOrder class."""
+
+import unittest
+from models.engine.order import KeyOrder
+
+
+class TestKeyOrder(unittest.TestCase):
+    """Test Cases for the KeyOrder class."""
+
+    def setUp(self):
+        """Builds an order of five keys."""
+        self.order = KeyOrder("k{}".format(i) for i in range(5))
+
+    def test_page(self):
+        """Tests offsets, limits and starting after a key."""
+        self.assertEqual(self.order.page(), ["k0", "k1", "k2", "k3", "k4"])
+        self.assertEqual(self.order.page(1, 2), ["k1", "k2"])
+        self.assertEqual(self.order.page(after="k2"), ["k3", "k4"])
+        self.assertEqual(self.order.page(1, 1, "k2"), ["k4"])
+        self.assertEqual(self.order.page(limit=0), [])
+        with self.assertRaises(KeyError):
+            self.order.page(after="k9")
+
+    def test_changes(self):
+        """Tests that added keys come last and removed ones are skipped."""
+        self.order.discard("k1")
+        self.order.discard("k9")
+        self.order.add("k1")
+        self.order.add("k3")
+        self.assertEqual(len(self.order), 5)
+        self.assertEqual(self.order.page(), ["k0", "k2", "k3", "k4", "k1"])
+        self.order.discard("k3")
+        self.assertEqual(self.order.page(after="k2"), ["k4", "k1"])
+        with self.assertRaises(KeyError):
+            self.order.page(after="k3")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+"""Unittest module for record files."""
+
+import os
+import tempfile
+import unittest
+from models.engine.records import RecordFile, is_record_file
+
+
+class TestRecordFile(unittest.TestCase):
+    """Test Cases for RecordFile."""
+
+    def setUp(self):
+        """Writes a record file of three objects."""
+        self.path = os.path.join(tempfile.mkdtemp(), "file.rec")
+        self.values = {"User.{}".format(i): {"id": str(i), "name": "n" * i}
+                       for i in range(3)}
+        self.records = RecordFile.write(self.path, self.values.items())
+
+    def tearDown(self):
+        """Closes the file."""
+        self.records.close()
+
+    def reopened(self):
+        """Returns the file opened again, committing pending changes."""
+        self.records.commit()
+        self.records.close()
+        self.records = RecordFile(self.path)
+        return self.records
+
+    def test_read(self):
+        """Tests that each key reads back its dictionary."""
+        self.assertTrue(is_record_file(self.path))
+        self.assertEqual(len(self.records), 3)
+        for key, value in self.values.items():
+            self.assertEqual(self.records.read(key), value)
+        with self.assertRaises(KeyError):
+            self.records.read("User.9")
+
+    def test_put_in_place(self):
+        """Tests that a value that fits is rewritten in its record."""
+        size = self.records.size
+        self.records.put("User.2", {"id": "2", "name": "m"})
+        self.assertEqual(self.records.size, size)
+        self.assertEqual(self.reopened().read("User.2"),
+                         {"id": "2", "name": "m"})
+        self.assertEqual(self.records.free, 0)
+
+    def test_put_relocates(self):
+        """Tests that a value that outgrows its record is appended."""
+        size = self.records.size
+        value = {"id": "1", "name": "x" * 100}
+        self.records.put("User.1", value)
+        self.records.put("User.3", {"id": "3"})
+        self.assertGreater(self.records.size, size)
+        records = self.reopened()
+        self.assertEqual(records.read("User.1"), value)
+        self.assertEqual(records.read("User.0"), self.values["User.0"])
+        self.assertEqual(len(records), 4)
+        self.assertGreater(records.free, 0)
+
+    def test_delete(self):
+        """Tests that deleted keys are gone once committed."""
+        self.records.delete("User.0")
+        self.records.delete("User.9")
+        records = self.reopened()
+        self.assertNotIn("User.0", records)
+        self.assertEqual(sorted(records), ["User.1", "User.2"])
+
+    def test_rebuilt_index(self):
+        """Tests that a missing or stale index is rebuilt from the file."""
+        self.records.put("User.1", {"id": "1", "name": "x" * 100})
+        self.records.close()  # The index still has the old size
+        records = self.records = RecordFile(self.path)
+        self.assertEqual(records.read("User.1")["name"], "x" * 100)
+        os.remove(self.path + ".index")
+        records = self.reopened()
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records.read("User.1")["name"], "x" * 100)
+
+    def test_invalid(self):
+        """Tests that other files raise ValueError."""
+        with open(self.path, "wb") as f:
+            f.write(b"{}")
+        self.assertFalse(is_record_file(self.path))
+        with self.assertRaises(ValueError):
+            RecordFile(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""Unittest module for the conversion of console values."""
+
+import unittest
+from datetime import datetime
+from models import storage
+from models.engine.schema import Schema, literal, to_datetime, to_list
+
+
+class TestSchema(unittest.TestCase):
+    """Test Cases for Schema and the literal parser."""
+
+    def setUp(self):
+        """Compiles the schema of the storage classes."""
+        self.schema = Schema(storage.classes(), storage.attributes())
+
+    def test_literal(self):
+        """Tests that literals are parsed and code is not run."""
+        self.assertEqual(literal("{'a': [1, 2.5]}"), {"a": [1, 2.5]})
+        for text in ("__import__('os')", "1 / 0", "Loft", "{"):
+            with self.assertRaises(ValueError):
+                literal(text)
+
+    def test_converters(self):
+        """Tests the converters compiled for each attribute type."""
+        converters = self.schema.converters("Place")
+        self.assertIs(converters["max_guest"], int)
+        self.assertIs(converters["latitude"], float)
+        self.assertIs(converters["amenity_ids"], to_list)
+        self.assertIs(converters["created_at"], to_datetime)
+        self.assertEqual(self.schema.converters("Nope"), {})
+
+    def test_convert(self):
+        """Tests the conversion of text and values to attribute types."""
+        convert = self.schema.convert
+        self.assertEqual(convert("Place", "max_guest", "4"), 4)
+        self.assertEqual(convert("Place", "amenity_ids", "['a']"), ["a"])
+        self.assertEqual(convert("Place", "amenity_ids", ("a",)), ["a"])
+        self.assertEqual(convert("User", "created_at", "2024-01-02"),
+                         datetime(2024, 1, 2))
+        self.assertEqual(convert("User", "nickname", [1]), [1])
+        for attr, value in (("max_guest", "4.5"), ("amenity_ids", "'a'"),
+                            ("created_at", 3)):
+            with self.assertRaises((TypeError, ValueError)):
+                convert("Place", attr, value)
+
+
+if __name__ == "__main__":
+    unittest.main()
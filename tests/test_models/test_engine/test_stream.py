@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""Unittest module for the incremental JSON helpers."""
+
+import io
+import json
+import unittest
+from models.engine.stream import iter_items, write_items
+
+
+class TestStream(unittest.TestCase):
+    """Test Cases for iter_items and write_items."""
+
+    data = {
+        "User.1": {"id": "1", "text": "a } tricky, \"string\": {"},
+        "Place.2": {"id": "2", "latitude": 12.345678, "amenity_ids": [1, 2]},
+        "State.3": {"nested": {"deep": [{"x": None}, True]}},
+        "Count.4": 1234567890,
+    }
+
+    def test_roundtrip(self):
+        """Tests that every chunk size yields the same pairs."""
+        text = json.dumps(self.data)
+        for size in (1, 2, 3, 7, 64, 1 << 16):
+            items = dict(iter_items(io.StringIO(text), chunk_size=size))
+            self.assertEqual(items, self.data)
+
+    def test_whitespace(self):
+        """Tests that indented documents are accepted."""
+        text = json.dumps(self.data, indent=4)
+        self.assertEqual(dict(iter_items(io.StringIO(text), chunk_size=5)),
+                         self.data)
+
+    def test_empty(self):
+        """Tests empty objects."""
+        self.assertEqual(list(iter_items(io.StringIO(" { } "))), [])
+
+    def test_invalid(self):
+        """Tests that malformed documents raise ValueError."""
+        for text in ("", "[]", '{"a": 1 "b": 2}', '{"a" 1}', '{"a": {'):
+            with self.assertRaises(ValueError):
+                list(iter_items(io.StringIO(text), chunk_size=2))
+
+    def test_progress(self):
+        """Tests that progress reports the characters read."""
+        text = json.dumps(self.data)
+        seen = []
+        list(iter_items(io.StringIO(text), chunk_size=10,
+                        progress=seen.append))
+        self.assertEqual(seen[-1], len(text))
+        self.assertEqual(seen, sorted(seen))
+
+    def test_write_items(self):
+        """Tests that write_items matches json.dump."""
+        out = io.StringIO()
+        write_items(out, self.data.items())
+        self.assertEqual(out.getvalue(), json.dumps(self.data))
+        out = io.StringIO()
+        write_items(out, [])
+        self.assertEqual(out.getvalue(), "{}")
+
+
+if __name__ == "__main__":
+    unittest.main()
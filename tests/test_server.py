@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""Unittest module for the command server."""
+
+import asyncio
+import unittest
+from server import Client, CommandServer
+from tests import reset_storage
+
+
+class TestCommandServer(unittest.IsolatedAsyncioTestCase):
+    """Test Cases for CommandServer and its Client."""
+
+    async def asyncSetUp(self):
+        """Starts a server on a free port."""
+        reset_storage()
+        self.server = await CommandServer().start(port=0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.clients = []
+
+    async def asyncTearDown(self):
+        """Closes the clients and the server."""
+        for client in self.clients:
+            await client.close()
+        self.server.close()
+        await self.server.wait_closed()
+        reset_storage()
+
+    async def connect(self):
+        """Returns a new client of the server."""
+        client = await Client.connect(port=self.port)
+        self.clients.append(client)
+        return client
+
+    async def test_pipelined(self):
+        """Tests that pipelined commands are answered in order."""
+        client = await self.connect()
+        lines = ["create Place", "create Place", "count Place", "",
+                 "show Nope 1", "Place.count()"]
+        for line in lines:
+            client.send(line)
+        answers = [await client.receive() for line in lines]
+        self.assertTrue(answers[0][0] and answers[1][0])
+        self.assertEqual(answers[2:], [
+            (True, "2\n"), (True, ""), (False, "** class doesn't exist **\n"),
+            (True, "2\n")])
+        other = await self.connect()
+        self.assertEqual(await other.call("count Place"), (True, "2\n"))
+        self.assertEqual(await other.call("quit"), (True, ""))
+        with self.assertRaises(ConnectionError):
+            await other.call("count Place")
+
+    async def test_transaction(self):
+        """Tests that a transaction holds the other clients back."""
+        first, second = await self.connect(), await self.connect()
+        await first.call("begin")
+        await first.call("create User")
+        second.send("count User")
+        answer = asyncio.ensure_future(second.receive())
+        done, waiting = await asyncio.wait({answer}, timeout=0.2)
+        self.assertFalse(done)
+        self.assertEqual(await first.call("rollback"), (True, ""))
+        self.assertEqual(await answer, (True, "0\n"))
+        await first.call("begin")
+        await first.call("create User")
+        self.clients.remove(first)
+        await first.close()
+        self.assertEqual(await second.call("count User"), (True, "0\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()